@@ -1,6 +1,7 @@
 # Tabela de Simbolos para Geracao de Assembly
-# Dicionario que representa a tabela de simbolos.
-symbolTable = []
+# Cada compilacao usa sua propria instancia de SymbolTable.
+from ScopedTable import ScopedTable
+
 INT = 'int'
 FLOAT = 'float'
 BOOL = 'bool'
@@ -16,99 +17,114 @@ CONSTANT = 'const'
 SCOPE = 'scope'
 SCOPE_GLOBAL = 'global'
 OFFSET = 'offset'
+REGISTER = 'register'
 SP = 'sp'
 # Se DEBUG = -1, imprime conteudo da tabela de simbolos apos cada mudanca
 DEBUG = 0
 Number = [INT, FLOAT]
 
 
-def printTable():
-    global DEBUG
-    if DEBUG == -1:
-        print('Tabela:', symbolTable)
-
-def beginScope(nameScope):
-    global symbolTable
-    symbolTable.append({})
-    symbolTable[-1][SCOPE] = nameScope
-    symbolTable[-1][SP] = 0
-    printTable()
-
-def endScope():
-    global symbolTable
-    symbolTable = symbolTable[0:-1]
-    printTable()
-
-def addVar(name, type):
-    global symbolTable
-    if name not in symbolTable[-1]:
-        symbolTable[-1][SP] -= 4
-        symbolTable[-1][name] = {BINDABLE: VARIABLE, TYPE: type, OFFSET: symbolTable[-1][SP]}
-    else:
-        symbolTable[-1][name] = {BINDABLE: VARIABLE, TYPE: type, OFFSET: symbolTable[-1][name][OFFSET]}
-    printTable()
-
-def addConst(name, type):
-    global symbolTable
-    if name not in symbolTable[-1]:
-        symbolTable[-1][SP] -= 4
-        symbolTable[-1][name] = {BINDABLE: CONSTANT, TYPE: type, OFFSET: symbolTable[-1][SP]}
-    else:
-        symbolTable[-1][name] = {BINDABLE: CONSTANT, TYPE: type, OFFSET: symbolTable[-1][name][OFFSET]}
-    printTable()
-
-def addFunction(name, params, returnType):
-    global symbolTable
-    symbolTable[-1][name] = {BINDABLE: FUNCTION, PARAMS: params, TYPE: returnType}
-    printTable()
-
-def addSP(value):
-    global symbolTable
-    symbolTable[-1][SP] += value
-
-def getSP():
-    return symbolTable[-1][SP]
-
-def getBindable(bindableName):
-    global symbolTable
-    for i in reversed(range(len(symbolTable))):
-        if bindableName in symbolTable[i].keys():
-            return symbolTable[i][bindableName]
-    return None
-
-def getScope(bindableName=None):
-    global symbolTable
-    if bindableName is None:
-        return symbolTable[-1][SCOPE]
-    for i in reversed(range(len(symbolTable))):
-        if bindableName in symbolTable[i].keys():
-            return symbolTable[i][SCOPE]
-    return symbolTable[-1][SCOPE]
-
-def getCurrentScope():
-    global symbolTable
-    if len(symbolTable) > 0:
-        return symbolTable[-1][SCOPE]
-    return None
+class SymbolTable(ScopedTable):
+    # Cada escopo guarda seu deslocamento (SP) para alocar variaveis locais
+
+    def __init__(self):
+        super().__init__()
+        self.debug = DEBUG
+        self.slots = {}         # nome -> cor do slot, na funcao atual
+        self.slot_offsets = {}  # cor -> deslocamento ja reservado
+        self.shared = 0         # declaracoes que reaproveitaram o slot de outro nome
+
+    def printTable(self):
+        if self.debug == -1:
+            tables = self.asDicts()
+            for table, scope in zip(tables, self.scopes):
+                table[SP] = scope.sp
+            print('Tabela:', tables)
+
+    def beginScope(self, nameScope):
+        super().beginScope(nameScope)
+        self.printTable()
+
+    def endScope(self):
+        super().endScope()
+        self.setSlots({})
+        self.printTable()
+
+    def setSlots(self, slots):
+        # Nomes com a mesma cor dividem um deslocamento no frame do escopo atual
+        self.slots = slots
+        self.slot_offsets = {}
+        self.shared = 0
+
+    def _offset(self, name):
+        # Reaproveita o deslocamento de um nome ja declarado neste escopo
+        bind = self.lookupCurrent(name)
+        if bind is not None and OFFSET in bind:
+            return bind[OFFSET]
+        cor = self.slots.get(name)
+        if cor in self.slot_offsets:
+            self.shared += 1
+            return self.slot_offsets[cor]
+        self.scopes[-1].sp -= 4
+        if cor is not None:
+            self.slot_offsets[cor] = self.scopes[-1].sp
+        return self.scopes[-1].sp
+
+    def addVar(self, name, type, register=None):
+        # Variavel alocada em registrador nao ocupa espaco no frame
+        if register is not None:
+            self.bind(name, {BINDABLE: VARIABLE, TYPE: type, OFFSET: None, REGISTER: register})
+        else:
+            self.bind(name, {BINDABLE: VARIABLE, TYPE: type, OFFSET: self._offset(name)})
+        self.printTable()
+
+    def addConst(self, name, type):
+        self.bind(name, {BINDABLE: CONSTANT, TYPE: type, OFFSET: self._offset(name)})
+        self.printTable()
+
+    def addParam(self, name, type, offset=None, register=None):
+        # Parametros ja estao na pilha (offset positivo) ou num registrador
+        # (ABI de registradores); nao consomem SP
+        self.bind(name, {BINDABLE: VARIABLE, TYPE: type, OFFSET: offset, REGISTER: register})
+        self.printTable()
+
+    def addFunction(self, name, params, returnType):
+        self.bind(name, {BINDABLE: FUNCTION, PARAMS: params, TYPE: returnType})
+        self.printTable()
+
+    def addSP(self, value):
+        self.scopes[-1].sp += value
+
+    def getSP(self):
+        return self.scopes[-1].sp
+
+    def getBindable(self, bindableName):
+        return self.lookup(bindableName)
+
+    def getScope(self, bindableName=None):
+        if bindableName is None:
+            return self.scopes[-1].name
+        scope = self.scopeOf(bindableName)
+        return scope if scope is not None else self.scopes[-1].name
 
 
 def main():
-    global DEBUG
-    DEBUG = -1
+    table = SymbolTable()
+    table.debug = -1
     print('\n# Criando escopo global')
-    beginScope('global')
+    table.beginScope('global')
     print('\n# Adicionando funcao add')
-    addFunction('add', ['a', INT, 'b', INT], INT)
+    table.addFunction('add', ['a', INT, 'b', INT], INT)
     print('\n# Criando escopo add')
-    beginScope('add')
+    table.beginScope('add')
     print('\n# Adicionando var a do tipo int')
-    addVar('a', INT)
+    table.addVar('a', INT)
     print('\n# Adicionando var b do tipo int')
-    addVar('b', INT)
+    table.addVar('b', INT)
     print('\n# Consultando SP')
-    print(getSP())
+    print(table.getSP())
     print('\n# Removendo escopo add')
-    endScope()
+    table.endScope()
 
 if __name__ == "__main__":
     main()
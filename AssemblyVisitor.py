@@ -1,6 +1,35 @@
 from AbstractVisitor import AbstractVisitor
-from ExpressionLanguageParser import parse
 import AssemblyST as st
+import SintaxeAbstrata as sa
+from Peephole import PeepholeOptimizer
+from Scheduler import InstructionScheduler
+from DelaySlots import DelaySlotFiller
+from StringPool import StringPool
+from ConstantFolding import evaluate
+import RegisterAllocation
+
+# Registradores para temporarios de expressao (modo register_temps)
+TEMP_REGS = ['$t0', '$t1', '$t2', '$t3', '$t4', '$t5', '$t6', '$t7', '$t8', '$t9']
+# Recebe o operando esquerdo desempilhado quando os temporarios acabam
+SPILL_REG = '$v1'
+# Rotulo de Sethi-Ullman de uma chamada: o callee usa todos os temporarios
+CALL_NEED = len(TEMP_REGS) + 1
+
+# Desvio tomado quando a comparacao e verdadeira (modo fuse_branches)
+BRANCH_IF = {'<': 'blt', '>': 'bgt', '<=': 'ble', '>=': 'bge', '==': 'beq', '!=': 'bne'}
+# O mesmo, comparando com zero
+BRANCH_IF_ZERO = {'<': 'bltz', '>': 'bgtz', '<=': 'blez', '>=': 'bgez'}
+NEGATE = {'<': '>=', '>': '<=', '<=': '>', '>=': '<', '==': '!=', '!=': '=='}
+
+# Convencoes de chamada: tudo na pilha (original) ou argumentos em $a0-$a3
+ABI_STACK = 'stack'
+ABI_REGISTERS = 'registers'
+ARG_REGS = ['$a0', '$a1', '$a2', '$a3']
+
+
+def called_functions(node):
+    # Nomes das funcoes chamadas dentro de node (inclui print)
+    return {n.name for n in sa.walk(node) if isinstance(n, sa.FunctionCall)}
 
 
 def getAssemblyType(type=None):
@@ -9,20 +38,66 @@ def getAssemblyType(type=None):
 
 class AssemblyVisitor(AbstractVisitor):
 
-    def __init__(self):
-        st.beginScope(st.SCOPE_GLOBAL)
+    def __init__(self, register_temps=False, peephole=None, fuse_branches=False,
+                 rotate_loops=False, abi=ABI_STACK, allocate_registers=False,
+                 color_slots=False, merge_strings=False, static_globals=False,
+                 schedule=False, delay_slots=False):
+        # register_temps: temporarios de expressao em $t0-$t9 em vez da pilha
+        # peephole: True (todas as regras), lista de regras ou PeepholeOptimizer
+        # fuse_branches: condicoes de if/while viram um unico desvio comparativo
+        self.register_temps = register_temps
+        self.fuse_branches = fuse_branches
+        # rotate_loops: while vira teste de guarda + corpo + desvio condicional para tras
+        self.rotate_loops = rotate_loops
+        # abi: ABI_STACK ou ABI_REGISTERS (argumentos em $a0-$a3, $ra/$fp salvos
+        # pelo callee e so quando a funcao precisa)
+        if abi not in (ABI_STACK, ABI_REGISTERS):
+            raise ValueError(f"ABI desconhecida: {abi}")
+        self.abi = abi
+        self.frame = None   # (salva $ra, bytes salvos) da funcao atual no ABI_REGISTERS
+        # allocate_registers: locais e parametros em $s0-$s7 (e $t1-$t9 em
+        # folhas com temporarios na pilha), por linear scan
+        self.allocate_registers = allocate_registers
+        self.registers = {}     # nome -> registrador, na funcao atual
+        self.saved_regs = []    # (registrador, offset) salvos no prologo
+        # color_slots: locais com tempos de vida disjuntos dividem slots do frame
+        self.color_slots = color_slots
+        self.frame_sizes = {}   # funcao -> (bytes sem e com coloracao de slots)
+        if peephole is True:
+            peephole = PeepholeOptimizer()
+        elif peephole and not isinstance(peephole, PeepholeOptimizer):
+            peephole = PeepholeOptimizer(peephole)
+        self.peephole = peephole or None
+        # schedule: reordena cada bloco basico (depois do peephole) para
+        # esconder as bolhas de load-use e de mflo/mfhi do pipeline
+        self.scheduler = InstructionScheduler() if schedule else None
+        # delay_slots: True ou DelaySlotFiller; codigo para desvios atrasados
+        # (MIPS real), com uma instrucao anterior independente ou nop em cada slot
+        if delay_slots is True:
+            delay_slots = DelaySlotFiller()
+        self.delay_slots = delay_slots or None
+        self.live_temps = []
+        self.symbolTable = st.SymbolTable()
+        self.symbolTable.beginScope(st.SCOPE_GLOBAL)
         self.funcs = []
         self.text = []
         self.text.append(".text")
         self.text.append("    move $fp, $sp")
         self.data = set()
-        self.string_data = {}
-        self.str_count = 0
+        # Literais string internados por conteudo; merge_strings tambem
+        # reaproveita sufixos de textos maiores
+        self.strings = StringPool(merge_strings)
+        # static_globals: globais com inicializador constante vao prontos para o
+        # .data; os que nunca sao reatribuidos viram imediatos nos usos
+        self.static_globals = static_globals
+        self.initial = {}       # global -> valor inicial no .data (numero ou rotulo)
+        self.constants = {}     # global imutavel -> valor (int, bool ou texto)
+        self.reassigned = set()
         self.rotulos = {}
         self.var_types = {}
         self.func_ret_types = {}
         # Registrar funcoes nativas
-        st.addFunction('print', ['value', '.word'], st.VOID)
+        self.symbolTable.addFunction('print', ['value', '.word'], st.VOID)
 
     def novo_rotulo(self, string):
         if string not in self.rotulos:
@@ -33,26 +108,45 @@ class AssemblyVisitor(AbstractVisitor):
 
     # Devolve a lista de instrucoes de acordo com o escopo
     def getList(self):
-        return self.text if st.getScope() == st.SCOPE_GLOBAL else self.funcs
+        return self.text if self.symbolTable.getScope() == st.SCOPE_GLOBAL else self.funcs
 
     def visitProgram(self, program):
+        if self.static_globals:
+            self.reassigned = {n.name for n in sa.walk(program) if isinstance(n, sa.AssignStmt)}
         for item in program.items:
             item.accept(self)
 
     def visitConstDecl(self, constDecl):
         name = constDecl.name
-        import SintaxeAbstrata as sa
         if isinstance(constDecl.value, sa.Literal) and isinstance(constDecl.value.str_value if hasattr(constDecl.value, 'str_value') else constDecl.value.value, str) and not isinstance(constDecl.value.value, bool):
             self.var_types[name] = 'string'
-        constDecl.value.accept(self)
         self.data.add(name)
-        st.addConst(name, getAssemblyType())
+        if self.static_global(name, constDecl.value):
+            self.symbolTable.addConst(name, getAssemblyType())
+            return
+        constDecl.value.accept(self)
+        self.symbolTable.addConst(name, getAssemblyType())
         self.text.append(f"    sw $v0, {name}")
 
+    def static_global(self, name, value):
+        # static_globals: inicializa o global no .data se value for constante;
+        # devolve False se ainda precisa de codigo de inicializacao
+        if not self.static_globals or self.symbolTable.getScope() != st.SCOPE_GLOBAL:
+            return False
+        valor = evaluate(value, self.constants)
+        if valor is None:
+            return False
+        if isinstance(valor, str):
+            self.initial[name] = self.strings.intern(valor)
+        else:
+            self.initial[name] = int(valor)
+        if name not in self.reassigned:
+            self.constants[name] = valor
+        return True
+
     def visitVarDecl(self, varDecl):
         code = self.getList()
         name = varDecl.name
-        import SintaxeAbstrata as sa
         # Detectar tipo string (literal ou chamada de funcao que retorna string)
         if isinstance(varDecl.value, sa.Literal) and isinstance(varDecl.value.value, str) and not isinstance(varDecl.value.value, bool):
             self.var_types[name] = 'string'
@@ -60,15 +154,24 @@ class AssemblyVisitor(AbstractVisitor):
             # Marcar como string somente se a funcao retorna string
             if self.func_ret_types.get(varDecl.value.name) == 'string':
                 self.var_types[name] = 'string'
+        register = self.registers.get(name)
+        if register is not None and self.register_temps:
+            # Avalia direto no registrador da variavel
+            self.gen_expr(varDecl.value, 0, register)
+            self.symbolTable.addVar(name, getAssemblyType(), register)
+            return
+        if self.static_global(name, varDecl.value):
+            self.data.add(name)
+            self.symbolTable.addVar(name, getAssemblyType())
+            return
         varDecl.value.accept(self)
-        if st.getScope() == st.SCOPE_GLOBAL:
+        if self.symbolTable.getScope() == st.SCOPE_GLOBAL:
             self.data.add(name)
-            st.addVar(name, getAssemblyType())
+            self.symbolTable.addVar(name, getAssemblyType())
             code.append(f"    sw $v0, {name}")
         else:
-            st.addVar(name, getAssemblyType())
-            bind = st.getBindable(name)
-            code.append(f"    sw $v0, {bind[st.OFFSET]}($fp)")
+            self.symbolTable.addVar(name, getAssemblyType(), register)
+            self.store_var(code, name, '$v0')
 
     def visitFunction(self, function):
         params = []
@@ -80,11 +183,15 @@ class AssemblyVisitor(AbstractVisitor):
         # Registrar tipo de retorno da funcao (para detectar string)
         if function.return_type == 'string':
             self.func_ret_types[function.name] = 'string'
-        st.addFunction(function.name, params, returnType)
-        st.beginScope(function.name)
+        self.symbolTable.addFunction(function.name, params, returnType)
+        self.symbolTable.beginScope(function.name)
 
         code = self.getList()
         code.append(f"{function.name}:")
+        if self.abi == ABI_REGISTERS:
+            self.register_abi_function(function, params)
+            self.symbolTable.endScope()
+            return
         code.append("    move $fp, $sp")
 
         # Parametros ficam em offsets POSITIVOS a partir de $fp
@@ -93,22 +200,201 @@ class AssemblyVisitor(AbstractVisitor):
         #   4($fp) = saved $ra
         #   8($fp) = ultimo argumento empilhado
         #   12($fp) = penultimo argumento
+        self.registers = self.allocate(function, not called_functions(function.body) - {'print'})
+        self.slot_colors(function)
+        sp_placeholder_index = len(code)
+        code.append("    addi $sp, $sp, 0")
+        self.save_registers(code)
+
         n_params = len(params) // 2
         for k in range(0, len(params), 2):
             param_index = k // 2
             offset = 8 + 4 * (n_params - 1 - param_index)
-            st.symbolTable[-1][params[k]] = {
-                st.BINDABLE: st.VARIABLE,
-                st.TYPE: params[k + 1],
-                st.OFFSET: offset
-            }
+            register = self.registers.get(params[k])
+            self.symbolTable.addParam(params[k], params[k + 1], offset, register)
+            if register is not None:
+                code.append(f"    lw {register}, {offset}($fp)")
 
+        function.body.accept(self)
+        code[sp_placeholder_index] = f"    addi $sp, $sp, {self.symbolTable.getSP()}"
+        self.record_frame(function)
+
+        self.registers = {}
+        self.saved_regs = []
+        self.symbolTable.endScope()
+
+    def allocate(self, function, folha, params=True):
+        # Registradores para os locais de function (vazio sem allocate_registers)
+        if not self.allocate_registers:
+            return {}
+        pool = RegisterAllocation.SAVED_REGS
+        if folha and not self.register_temps:
+            # Sem chamadas e com temporarios na pilha (so $t0), $t1-$t9 sao livres
+            pool = TEMP_REGS[1:] + pool
+        return RegisterAllocation.allocate(function, pool, params)
+
+    def slot_colors(self, function, params=()):
+        # Coloracao dos slots do frame (nada sem color_slots). params: parametros
+        # que a funcao guarda no frame, alem dos locais
+        if not self.color_slots:
+            return
+        names = {n.name for n in sa.walk(function.body) if isinstance(n, sa.VarDecl)}
+        names = (names | set(params)) - set(self.registers)
+        self.symbolTable.setSlots(RegisterAllocation.color_slots(function, names))
+
+    def record_frame(self, function):
+        # Bytes reservados pelo prologo (locais e registradores salvos), sem e
+        # com o compartilhamento de slots
+        depois = -self.symbolTable.getSP()
+        self.frame_sizes[function.name] = (depois + 4 * self.symbolTable.shared, depois)
+
+    def save_registers(self, code):
+        # Callee-saved usados pela funcao vao para o frame (restaurados no epilogo)
+        self.saved_regs = []
+        for register in RegisterAllocation.SAVED_REGS:
+            if register in self.registers.values():
+                self.symbolTable.addSP(-4)
+                offset = self.symbolTable.getSP()
+                self.saved_regs.append((register, offset))
+                code.append(f"    sw {register}, {offset}($fp)")
+
+    def register_abi_function(self, function, params):
+        # ABI_REGISTERS. Pilha ao entrar: ultimo argumento de pilha em 0($sp).
+        # Com frame, o callee salva $fp (e $ra, se chama outras funcoes):
+        #   0($fp) = saved $fp, 4($fp) = saved $ra,
+        #   salvos + 4 * (n - 1 - k)($fp) = argumento k >= 4
+        # Folha sem chamadas (nem print), sem locais e com ate 4 parametros
+        # nao tem frame: os parametros ficam em $a0-$a3.
+        code = self.getList()
+        chamadas = called_functions(function.body)
+        folha = not (chamadas - {'print'})
+        n_params = len(params) // 2
+        # Numa folha sem chamadas os parametros ja estao em $a0-$a3
+        self.registers = self.allocate(function, folha, params=bool(chamadas))
+        locais = any(isinstance(n, sa.VarDecl) and n.name not in self.registers
+                     for n in sa.walk(function.body))
+        callee_saved = any(r in RegisterAllocation.SAVED_REGS for r in self.registers.values())
+        com_frame = bool(chamadas) or n_params > len(ARG_REGS) or locais or callee_saved
+        salvos = (4 if folha else 8) if com_frame else 0
+        self.frame = (not folha, salvos)
+        if com_frame:
+            self.slot_colors(function, [p.name for p in function.params[:len(ARG_REGS)]])
+
+        if com_frame:
+            code.append(f"    addi $sp, $sp, {-salvos}")
+            if not folha:
+                code.append("    sw $ra, 4($sp)")
+            code.append("    sw $fp, 0($sp)")
+            code.append("    move $fp, $sp")
         sp_placeholder_index = len(code)
         code.append("    addi $sp, $sp, 0")
+        self.save_registers(code)
+
+        for k in range(0, len(params), 2):
+            index = k // 2
+            name = params[k]
+            register = self.registers.get(name)
+            if index >= len(ARG_REGS):
+                offset = salvos + 4 * (n_params - 1 - index)
+                self.symbolTable.addParam(name, params[k + 1], offset, register)
+                if register is not None:
+                    code.append(f"    lw {register}, {offset}($fp)")
+            elif register is not None:
+                self.symbolTable.addParam(name, params[k + 1], register=register)
+                code.append(f"    move {register}, {ARG_REGS[index]}")
+            elif com_frame:
+                # Chamadas e print sobrescrevem $a0-$a3: o parametro vai para o frame
+                self.symbolTable.addVar(name, params[k + 1])
+                self.store_var(code, name, ARG_REGS[index])
+            else:
+                self.symbolTable.addParam(name, params[k + 1], register=ARG_REGS[index])
+
         function.body.accept(self)
-        code[sp_placeholder_index] = f"    addi $sp, $sp, {st.getSP()}"
+        statements = function.body.statements
+        if not statements or not isinstance(statements[-1], sa.ReturnStmt):
+            # Sem return no fim: sai da funcao em vez de cair na seguinte
+            self.epilogue(code)
+        if self.symbolTable.getSP():
+            code[sp_placeholder_index] = f"    addi $sp, $sp, {self.symbolTable.getSP()}"
+        else:
+            del code[sp_placeholder_index]
+        self.record_frame(function)
+        self.frame = None
+        self.registers = {}
+        self.saved_regs = []
+
+    def epilogue(self, code):
+        for register, offset in self.saved_regs:
+            code.append(f"    lw {register}, {offset}($fp)")
+        if self.abi != ABI_REGISTERS:
+            code.append("    move $sp, $fp")
+            code.append("    jr $ra")
+            return
+        salva_ra, salvos = self.frame
+        if salvos:
+            code.append("    move $sp, $fp")
+            code.append("    lw $fp, 0($sp)")
+            if salva_ra:
+                code.append("    lw $ra, 4($sp)")
+            code.append(f"    addi $sp, $sp, {salvos}")
+        code.append("    jr $ra")
+
+    # Acesso a variaveis: global (rotulo), registrador ou frame ($fp)
 
-        st.endScope()
+    def var_register(self, expr):
+        # Registrador de uma variavel local alocada; None se estiver na memoria
+        if not isinstance(expr, sa.Identifier):
+            return None
+        bind = self.symbolTable.getBindable(expr.name)
+        if bind is None or self.symbolTable.getScope(expr.name) == st.SCOPE_GLOBAL:
+            return None
+        return bind.get(st.REGISTER)
+
+    def load_var(self, code, name, target):
+        bind = self.symbolTable.getBindable(name)
+        if bind is None:
+            return
+        if self.symbolTable.getScope(name) == st.SCOPE_GLOBAL:
+            valor = self.global_constant(name)
+            if valor is None:
+                code.append(f"    lw {target}, {name}")
+            elif isinstance(valor, str):
+                code.append(f"    la {target}, {self.strings.labels[valor]}")
+            else:
+                code.append(f"    li {target}, {int(valor)}")
+        elif bind.get(st.REGISTER) is not None:
+            if bind[st.REGISTER] != target:
+                code.append(f"    move {target}, {bind[st.REGISTER]}")
+        else:
+            code.append(f"    lw {target}, {bind[st.OFFSET]}($fp)")
+
+    def global_constant(self, name):
+        # Valor de um global imutavel com inicializador constante, ou None
+        if name not in self.constants or self.symbolTable.getScope(name) != st.SCOPE_GLOBAL:
+            return None
+        return self.constants[name]
+
+    def int_constant(self, expr):
+        # Inteiro conhecido em tempo de compilacao: literal ou global imutavel
+        if isinstance(expr, sa.Literal):
+            value = expr.value
+        elif isinstance(expr, sa.Identifier):
+            value = self.global_constant(expr.name)
+        else:
+            return None
+        if not isinstance(value, int) or isinstance(value, bool):
+            return None
+        return value
+
+    def store_var(self, code, name, source):
+        bind = self.symbolTable.getBindable(name)
+        if self.symbolTable.getScope(name) == st.SCOPE_GLOBAL:
+            code.append(f"    sw {source}, {name}")
+        elif bind.get(st.REGISTER) is not None:
+            if bind[st.REGISTER] != source:
+                code.append(f"    move {bind[st.REGISTER]}, {source}")
+        else:
+            code.append(f"    sw {source}, {bind[st.OFFSET]}($fp)")
 
     def visitParam(self, param):
         return [param.name, getAssemblyType()]
@@ -122,38 +408,39 @@ class AssemblyVisitor(AbstractVisitor):
 
     def visitAssignStmt(self, assignStmt):
         code = self.getList()
+        bind = self.symbolTable.getBindable(assignStmt.name)
+        if self.register_temps and bind is not None and bind.get(st.REGISTER) is not None \
+                and assignStmt.name in self.registers:
+            # Avalia direto no registrador da variavel
+            self.gen_expr(assignStmt.value, 0, bind[st.REGISTER])
+            return
         assignStmt.value.accept(self)
-        bind = st.getBindable(assignStmt.name)
+        bind = self.symbolTable.getBindable(assignStmt.name)
         if bind is None:
-            st.addVar(assignStmt.name, getAssemblyType())
-            bind = st.getBindable(assignStmt.name)
-        if st.getScope(assignStmt.name) == st.SCOPE_GLOBAL:
-            code.append(f"    sw $v0, {assignStmt.name}")
-        else:
-            code.append(f"    sw $v0, {bind[st.OFFSET]}($fp)")
+            self.symbolTable.addVar(assignStmt.name, getAssemblyType())
+            bind = self.symbolTable.getBindable(assignStmt.name)
+        self.store_var(code, assignStmt.name, '$v0')
 
     def visitReturnStmt(self, returnStmt):
         code = self.getList()
         if returnStmt.value is not None:
             returnStmt.value.accept(self)
-        code.append("    move $sp, $fp")
-        code.append("    jr $ra")
+        self.epilogue(code)
 
     def visitIfStmt(self, ifStmt):
         code = self.getList()
         rotulo_else = self.novo_rotulo("else")
         rotulo_fim = self.novo_rotulo("fim_if")
 
-        ifStmt.condition.accept(self)
         if ifStmt.else_block is not None:
-            code.append(f"    beq $v0, $zero, {rotulo_else}")
+            self.branch(ifStmt.condition, rotulo_else)
             ifStmt.then_block.accept(self)
             code.append(f"    j {rotulo_fim}")
             code.append(f"{rotulo_else}:")
             ifStmt.else_block.accept(self)
             code.append(f"{rotulo_fim}:")
         else:
-            code.append(f"    beq $v0, $zero, {rotulo_fim}")
+            self.branch(ifStmt.condition, rotulo_fim)
             ifStmt.then_block.accept(self)
             code.append(f"{rotulo_fim}:")
 
@@ -161,60 +448,292 @@ class AssemblyVisitor(AbstractVisitor):
         code = self.getList()
         rotulo_inicial = self.novo_rotulo("while")
         rotulo_final = self.novo_rotulo("fim_while")
+        if self.rotate_loops:
+            # Guarda na entrada; a cada iteracao so o desvio de volta e tomado
+            self.branch(whileStmt.condition, rotulo_final)
+            code.append(f"{rotulo_inicial}:")
+            whileStmt.body.accept(self)
+            self.branch(whileStmt.condition, rotulo_inicial, when=True)
+            code.append(f"{rotulo_final}:")
+            return
         code.append(f"{rotulo_inicial}:")
-        whileStmt.condition.accept(self)
-        code.append(f"    beq $v0, $zero, {rotulo_final}")
+        self.branch(whileStmt.condition, rotulo_final)
         whileStmt.body.accept(self)
         code.append(f"    j {rotulo_inicial}")
         code.append(f"{rotulo_final}:")
 
-    def visitBinaryExpr(self, binaryExpr):
+    def branch(self, condition, label, when=False):
+        # Desvia para label quando condition == when
+        code = self.getList()
+        if not self.fuse_branches:
+            condition.accept(self)
+            code.append(f"    {'bne' if when else 'beq'} $v0, $zero, {label}")
+            return
+        if isinstance(condition, sa.UnaryExpr) and condition.op == '!':
+            self.branch(condition.expr, label, not when)
+            return
+        if isinstance(condition, sa.Literal) and isinstance(condition.value, bool):
+            if condition.value == when:
+                code.append(f"    j {label}")
+            return
+        if not isinstance(condition, sa.BinaryExpr) or condition.op not in BRANCH_IF:
+            condition.accept(self)
+            code.append(f"    {'bne' if when else 'beq'} $v0, $zero, {label}")
+            return
+
+        op = condition.op if when else NEGATE[condition.op]
+        right = self.int_constant(condition.right)
+        if right is not None and -32768 <= right <= 32767:
+            # Constante a direita: so o operando esquerdo e avaliado
+            if self.register_temps:
+                left = self.gen_expr(condition.left, 0)
+            else:
+                left = self.var_register(condition.left)
+                if left is None:
+                    condition.left.accept(self)
+                    left = '$v0'
+            if right != 0:
+                code.append(f"    {BRANCH_IF[op]} {left}, {right}, {label}")
+            elif op in BRANCH_IF_ZERO:
+                code.append(f"    {BRANCH_IF_ZERO[op]} {left}, {label}")
+            else:
+                code.append(f"    {BRANCH_IF[op]} {left}, $zero, {label}")
+            return
+        if self.register_temps:
+            needs = {}
+            self.need(condition.left, needs)
+            self.need(condition.right, needs)
+            left, right = self.gen_operands(condition, 0, needs)
+        else:
+            left, right = self.stack_operands(condition)
+        code.append(f"    {BRANCH_IF[op]} {left}, {right}, {label}")
+
+    def stack_operands(self, binaryExpr):
+        # Avalia os dois lados pela pilha; esquerdo fica em $t0 e direito em $v0.
+        # Variaveis em registrador sao usadas no lugar, sem empilhar.
         code = self.getList()
+        left = self.var_register(binaryExpr.left)
+        right = self.var_register(binaryExpr.right)
+        if left is not None or right is not None:
+            if left is None:
+                binaryExpr.left.accept(self)
+                left = '$v0'
+            elif right is None:
+                binaryExpr.right.accept(self)
+                right = '$v0'
+            return left, right
         # Avalia a expressao esquerda
         binaryExpr.left.accept(self)
         code.append("    addi $sp, $sp, -4")
-        st.addSP(-4)
+        self.symbolTable.addSP(-4)
         code.append("    sw $v0, 0($sp)")
         # Avalia a expressao direita
         binaryExpr.right.accept(self)
         # Recupera o operando esquerdo
         code.append("    lw $t0, 0($sp)")
         code.append("    addi $sp, $sp, 4")
-        st.addSP(4)
+        self.symbolTable.addSP(4)
+        return '$t0', '$v0'
 
-        op = binaryExpr.op
+    def visitBinaryExpr(self, binaryExpr):
+        if self.register_temps:
+            self.gen_expr(binaryExpr, 0, '$v0')
+            return
+        left, right = self.stack_operands(binaryExpr)
+        self.emit_binary(self.getList(), binaryExpr.op, '$v0', left, right)
+
+    def emit_binary(self, code, op, dest, left, right):
         if op == '+':
-            code.append("    add $v0, $t0, $v0")
+            code.append(f"    add {dest}, {left}, {right}")
         elif op == '-':
-            code.append("    sub $v0, $t0, $v0")
+            code.append(f"    sub {dest}, {left}, {right}")
         elif op == '*':
-            code.append("    mul $v0, $t0, $v0")
+            code.append(f"    mul {dest}, {left}, {right}")
         elif op == '/':
-            code.append("    div $t0, $v0")
-            code.append("    mflo $v0")
+            code.append(f"    div {left}, {right}")
+            code.append(f"    mflo {dest}")
         elif op == '%':
-            code.append("    div $t0, $v0")
-            code.append("    mfhi $v0")
+            code.append(f"    div {left}, {right}")
+            code.append(f"    mfhi {dest}")
         elif op == '<':
-            code.append("    slt $v0, $t0, $v0")
+            code.append(f"    slt {dest}, {left}, {right}")
         elif op == '>':
-            code.append("    slt $v0, $v0, $t0")
+            code.append(f"    slt {dest}, {right}, {left}")
         elif op == '<=':
             # a <= b  equivale a  !(a > b)  equivale a  !(b < a)
-            code.append("    slt $v0, $v0, $t0")
-            code.append("    xori $v0, $v0, 1")
+            code.append(f"    slt {dest}, {right}, {left}")
+            code.append(f"    xori {dest}, {dest}, 1")
         elif op == '>=':
             # a >= b  equivale a  !(a < b)
-            code.append("    slt $v0, $t0, $v0")
-            code.append("    xori $v0, $v0, 1")
+            code.append(f"    slt {dest}, {left}, {right}")
+            code.append(f"    xori {dest}, {dest}, 1")
         elif op == '==':
-            code.append("    sub $v0, $t0, $v0")
-            code.append("    sltiu $v0, $v0, 1")
+            code.append(f"    sub {dest}, {left}, {right}")
+            code.append(f"    sltiu {dest}, {dest}, 1")
         elif op == '!=':
-            code.append("    sub $v0, $t0, $v0")
-            code.append("    sltu $v0, $zero, $v0")
+            code.append(f"    sub {dest}, {left}, {right}")
+            code.append(f"    sltu {dest}, $zero, {dest}")
+
+    # Modo register_temps: avaliacao de expressoes em registradores
+
+    def need(self, expr, needs):
+        # Rotulo de Sethi-Ullman (registradores necessarios), calculado em
+        # pos-ordem uma unica vez por expressao e guardado em needs[id(no)]
+        pilha = [(expr, False)]
+        while pilha:
+            node, pronto = pilha.pop()
+            if isinstance(node, sa.BinaryExpr):
+                if not pronto:
+                    pilha.append((node, True))
+                    pilha.append((node.right, False))
+                    pilha.append((node.left, False))
+                    continue
+                esquerda = needs[id(node.left)]
+                if self.immediate(node) is not None:
+                    needs[id(node)] = max(esquerda, 1)
+                    continue
+                direita = needs[id(node.right)]
+                needs[id(node)] = esquerda + 1 if esquerda == direita else max(esquerda, direita)
+            elif isinstance(node, sa.UnaryExpr):
+                if not pronto:
+                    pilha.append((node, True))
+                    pilha.append((node.expr, False))
+                    continue
+                needs[id(node)] = max(needs[id(node.expr)], 1)
+            elif isinstance(node, sa.FunctionCall) and node.name != 'print':
+                needs[id(node)] = CALL_NEED
+            elif self.var_register(node) is not None:
+                needs[id(node)] = 0
+            else:
+                needs[id(node)] = 1
+        return needs[id(expr)]
+
+    def immediate(self, binaryExpr):
+        # Constante de 16 bits a direita de + - <: cabe no campo imediato
+        right = self.int_constant(binaryExpr.right)
+        if right is None:
+            return None
+        value = right if binaryExpr.op != '-' else -right
+        if binaryExpr.op in ('+', '-', '<') and -32768 <= value <= 32767:
+            return value
+        return None
+
+    def gen_expr(self, expr, base, dest=None, needs=None):
+        # Avalia expr usando TEMP_REGS[base:]; devolve o registrador do resultado
+        code = self.getList()
+        target = dest or TEMP_REGS[base]
+        if needs is None:
+            needs = {}
+            self.need(expr, needs)
+
+        if isinstance(expr, sa.Literal):
+            value = expr.value
+            if isinstance(value, str):
+                expr.accept(self)
+                if target != '$v0':
+                    code.append(f"    move {target}, $v0")
+            else:
+                code.append(f"    li {target}, {int(value)}")
+        elif isinstance(expr, sa.Identifier):
+            register = self.var_register(expr)
+            if register is not None and dest is None:
+                # Variavel em registrador: usada no lugar, sem copia
+                return register
+            self.load_var(code, expr.name, target)
+        elif isinstance(expr, sa.FunctionCall):
+            self.gen_call(expr)
+            if target != '$v0':
+                code.append(f"    move {target}, $v0")
+        elif isinstance(expr, sa.UnaryExpr):
+            operand = self.gen_expr(expr.expr, base, None, needs)
+            if expr.op == '-':
+                code.append(f"    sub {target}, $zero, {operand}")
+            elif expr.op == '!':
+                code.append(f"    xori {target}, {operand}, 1")
+            elif dest is None:
+                # '+' nao muda o valor: o resultado e o proprio operando
+                return operand
+            elif operand != target:
+                code.append(f"    move {target}, {operand}")
+        elif isinstance(expr, sa.BinaryExpr):
+            self.gen_binary(expr, base, target, needs)
+        return target
+
+    def gen_binary(self, expr, base, target, needs):
+        code = self.getList()
+        value = self.immediate(expr)
+        if value is not None:
+            left = self.gen_expr(expr.left, base, None, needs)
+            if expr.op == '<':
+                code.append(f"    slti {target}, {left}, {value}")
+            else:
+                code.append(f"    addi {target}, {left}, {value}")
+            return
+
+        left, right = self.gen_operands(expr, base, needs)
+        self.emit_binary(code, expr.op, target, left, right)
+
+    def gen_operands(self, expr, base, needs):
+        # Avalia os dois lados de expr; devolve (registrador esquerdo, direito)
+        code = self.getList()
+        available = len(TEMP_REGS) - base
+        need_left = needs[id(expr.left)]
+        need_right = needs[id(expr.right)]
+        if min(need_left, need_right) >= available:
+            # Registradores insuficientes: o operando esquerdo vai para a pilha
+            left = self.gen_expr(expr.left, base, None, needs)
+            code.append("    addi $sp, $sp, -4")
+            self.symbolTable.addSP(-4)
+            code.append(f"    sw {left}, 0($sp)")
+            right = self.gen_expr(expr.right, base, None, needs)
+            code.append(f"    lw {SPILL_REG}, 0($sp)")
+            code.append("    addi $sp, $sp, 4")
+            self.symbolTable.addSP(4)
+            return SPILL_REG, right
+
+        # O lado mais exigente primeiro; o resultado fica vivo enquanto o outro
+        # lado usa os registradores seguintes (variaveis em registrador nao
+        # ocupam temporario)
+        # Um lado direito com chamada pode escrever um global lido a esquerda:
+        # entao a esquerda vem antes e fica viva (salva em volta da chamada)
+        if need_left >= need_right or need_right >= CALL_NEED:
+            left = self.gen_expr(expr.left, base, None, needs)
+            ocupado = left in TEMP_REGS
+            if ocupado:
+                self.live_temps.append(left)
+            right = self.gen_expr(expr.right, base + ocupado, None, needs)
+        else:
+            right = self.gen_expr(expr.right, base, None, needs)
+            ocupado = right in TEMP_REGS
+            if ocupado:
+                self.live_temps.append(right)
+            left = self.gen_expr(expr.left, base + ocupado, None, needs)
+        if ocupado:
+            self.live_temps.pop()
+        return left, right
+
+    def gen_call(self, functionCall):
+        # Temporarios vivos sao caller-saved: salvos em volta da chamada
+        code = self.getList()
+        live = self.live_temps
+        if live:
+            code.append(f"    addi $sp, $sp, {-4 * len(live)}")
+            self.symbolTable.addSP(-4 * len(live))
+            for k, reg in enumerate(live):
+                code.append(f"    sw {reg}, {4 * k}($sp)")
+        self.live_temps = []
+        functionCall.accept(self)
+        self.live_temps = live
+        if live:
+            for k, reg in enumerate(live):
+                code.append(f"    lw {reg}, {4 * k}($sp)")
+            code.append(f"    addi $sp, $sp, {4 * len(live)}")
+            self.symbolTable.addSP(4 * len(live))
 
     def visitUnaryExpr(self, unaryExpr):
+        if self.register_temps:
+            self.gen_expr(unaryExpr, 0, '$v0')
+            return
         code = self.getList()
         unaryExpr.expr.accept(self)
         if unaryExpr.op == '-':
@@ -231,28 +750,13 @@ class AssemblyVisitor(AbstractVisitor):
             code.append(f"    li $v0, {int(value)}")
         elif isinstance(value, str):
             # Armazenar string no .data e carregar endereco
-            str_label = f"str_{self.str_count}"
-            self.str_count += 1
-            self.string_data[str_label] = value
-            code.append(f"    la $v0, {str_label}")
+            code.append(f"    la $v0, {self.strings.intern(value)}")
 
     def visitIdExp(self, idExp):
-        code = self.getList()
-        bind = st.getBindable(idExp.name)
-        if bind is not None:
-            if st.getScope(idExp.name) == st.SCOPE_GLOBAL:
-                code.append(f"    lw $v0, {idExp.name}")
-            else:
-                code.append(f"    lw $v0, {bind[st.OFFSET]}($fp)")
+        self.load_var(self.getList(), idExp.name, '$v0')
 
     def visitIdentifier(self, identifier):
-        code = self.getList()
-        bind = st.getBindable(identifier.name)
-        if bind is not None:
-            if st.getScope(identifier.name) == st.SCOPE_GLOBAL:
-                code.append(f"    lw $v0, {identifier.name}")
-            else:
-                code.append(f"    lw $v0, {bind[st.OFFSET]}($fp)")
+        self.load_var(self.getList(), identifier.name, '$v0')
 
     def visitFunctionCall(self, functionCall):
         code = self.getList()
@@ -261,14 +765,9 @@ class AssemblyVisitor(AbstractVisitor):
             if len(functionCall.args) > 0:
                 arg = functionCall.args[0]
                 # Verificar se o argumento e uma string literal
-                import SintaxeAbstrata as sa
                 if isinstance(arg, sa.Literal) and isinstance(arg.value, str):
-                    # Armazenar string no .data como .asciiz
-                    str_label = f"str_{self.str_count}"
-                    self.str_count += 1
-                    self.string_data[str_label] = arg.value
-                    # Carregar endereco da string
-                    code.append(f"    la $a0, {str_label}")
+                    # Armazenar string no .data como .asciiz e carregar endereco
+                    code.append(f"    la $a0, {self.strings.intern(arg.value)}")
                     # Syscall 4 = print_string
                     code.append("    li $v0, 4")
                     code.append("    syscall")
@@ -290,6 +789,9 @@ class AssemblyVisitor(AbstractVisitor):
             code.append("    li $a0, 10")
             code.append("    syscall")
             return
+        if self.abi == ABI_REGISTERS:
+            self.register_abi_call(functionCall)
+            return
         # Empilhar argumentos no $sp
         n_args = len(functionCall.args)
         for arg in functionCall.args:
@@ -310,29 +812,76 @@ class AssemblyVisitor(AbstractVisitor):
         if n_args > 0:
             code.append(f"    addi $sp, $sp, {4 * n_args}")
 
+    def register_abi_call(self, functionCall):
+        # ABI_REGISTERS: argumentos 0-3 em $a0-$a3, os demais na pilha (o
+        # ultimo em 0($sp)); $ra e $fp sao salvos pelo callee
+        code = self.getList()
+        args = functionCall.args
+        n_args = len(args)
+        if any(called_functions(arg) for arg in args):
+            # Uma chamada num argumento sobrescreveria $a0-$a3: avalia tudo na
+            # ordem, empilhando, e depois carrega os quatro primeiros
+            for arg in args:
+                arg.accept(self)
+                code.append("    addi $sp, $sp, -4")
+                code.append("    sw $v0, 0($sp)")
+            for k in range(min(n_args, len(ARG_REGS))):
+                code.append(f"    lw {ARG_REGS[k]}, {4 * (n_args - 1 - k)}($sp)")
+            empilhados = n_args
+        else:
+            for arg in args[len(ARG_REGS):]:
+                arg.accept(self)
+                code.append("    addi $sp, $sp, -4")
+                code.append("    sw $v0, 0($sp)")
+            for k, arg in enumerate(args[:len(ARG_REGS)]):
+                if self.register_temps:
+                    self.gen_expr(arg, 0, ARG_REGS[k])
+                else:
+                    arg.accept(self)
+                    code.append(f"    move {ARG_REGS[k]}, $v0")
+            empilhados = max(0, n_args - len(ARG_REGS))
+        code.append(f"    jal {functionCall.name}")
+        if empilhados:
+            code.append(f"    addi $sp, $sp, {4 * empilhados}")
+
     # Gera codigo assembly final
     def get_code(self):
+        if self.peephole is not None:
+            self.peephole.optimize(self.text, self.funcs)
+        if self.scheduler is not None:
+            self.scheduler.schedule(self.text, self.funcs)
+        inicio = self.text + ["    jal main", "    j end"]
+        if self.delay_slots is not None:
+            self.delay_slots.fill(inicio, self.funcs)
         finalcode = []
-        if self.data or self.string_data:
+        if self.data or self.strings:
             finalcode.append(".data")
             for globalVar in sorted(self.data):
-                finalcode.append(f"    {globalVar}: .word 0")
-            for label, value in self.string_data.items():
-                escaped = value.replace('\n', '\\n').replace('\t', '\\t')
-                finalcode.append(f'    {label}: .asciiz "{escaped}"')
-        finalcode = finalcode + self.text
-        finalcode.append("    jal main")
-        finalcode.append("    j end")
+                finalcode.append(f"    {globalVar}: .word {self.initial.get(globalVar, 0)}")
+            finalcode.extend(self.strings.directives())
+        finalcode = finalcode + inicio
         finalcode = finalcode + self.funcs
         finalcode.append("\nend:\n    li $v0, 10\n    syscall")
         return "\n".join(finalcode)
 
 
 def main():
-    f = open("input1.zig", "r")
-    result = parse(f.read())
+    import sys
+    from ExpressionLanguageParser import parse, INPUT_PADRAO
+    with open(INPUT_PADRAO, "r") as f:
+        result = parse(f.read())
     if result is not None:
-        assemblyvisitor = AssemblyVisitor()
+        assemblyvisitor = AssemblyVisitor(register_temps='--registers' in sys.argv,
+                                          peephole='--peephole' in sys.argv,
+                                          fuse_branches='--fuse-branches' in sys.argv,
+                                          rotate_loops='--rotate-loops' in sys.argv,
+                                          abi=ABI_REGISTERS if '--register-abi' in sys.argv else ABI_STACK,
+                                          allocate_registers='--allocate-registers' in sys.argv,
+                                          color_slots='--color-slots' in sys.argv,
+                                          merge_strings='--merge-strings' in sys.argv,
+                                          static_globals='--static-globals' in sys.argv,
+                                          schedule='--schedule' in sys.argv,
+                                          delay_slots='--delay-slots' in sys.argv)
         result.accept(assemblyvisitor)
         print(assemblyvisitor.get_code())
     else:
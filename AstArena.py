@@ -0,0 +1,205 @@
+from array import array
+
+import SintaxeAbstrata as sa
+
+# Representacao opcional da AST em arena: cada no e uma linha (indice inteiro)
+# em arrays tipados. Os filhos de um no ficam contiguos em `children`, e os nos
+# sao gravados em pos-ordem (filhos antes do pai; a raiz e o ultimo no).
+# Nomes, operadores e literais string ficam numa tabela de strings internadas.
+
+(PROGRAM, CONST_DECL, VAR_DECL, FUNCTION, PARAM, BLOCK, EXPR_STMT, ASSIGN_STMT,
+ RETURN_STMT, IF_STMT, WHILE_STMT, BINARY_EXPR, UNARY_EXPR, LITERAL, IDENTIFIER,
+ FUNCTION_CALL) = range(16)
+
+KIND_NAMES = ['Program', 'ConstDecl', 'VarDecl', 'Function', 'Param', 'Block',
+              'ExprStmt', 'AssignStmt', 'ReturnStmt', 'IfStmt', 'WhileStmt',
+              'BinaryExpr', 'UnaryExpr', 'Literal', 'Identifier', 'FunctionCall']
+
+# Como o valor de um LITERAL esta codificado em `values`
+LIT_INT, LIT_BOOL, LIT_STR, LIT_CONST = range(4)
+
+NONE = -1
+
+
+class AstArena:
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.names = array('i')     # nome/operador (id na tabela de strings)
+        self.aux = array('i')       # tipo declarado, tipo de retorno ou tag do literal
+        self.values = array('q')    # literal, visibilidade (id) ou indice em constants
+        self.first = array('I')     # inicio dos filhos em children
+        self.counts = array('I')    # quantidade de filhos
+        self.children = array('I')
+        self.strings = []
+        self.string_ids = {}
+        self.constants = []         # floats e inteiros fora de 64 bits
+        self.root = NONE
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def intern(self, text):
+        if text is None:
+            return NONE
+        i = self.string_ids.get(text)
+        if i is None:
+            i = len(self.strings)
+            self.strings.append(text)
+            self.string_ids[text] = i
+        return i
+
+    def string(self, i):
+        return None if i == NONE else self.strings[i]
+
+    def add(self, kind, children=(), name=None, aux=NONE, value=0):
+        self.kinds.append(kind)
+        self.names.append(self.intern(name))
+        self.aux.append(aux)
+        self.values.append(value)
+        self.first.append(len(self.children))
+        self.counts.append(len(children))
+        self.children.extend(children)
+        return len(self.kinds) - 1
+
+    def child(self, i, k):
+        return self.children[self.first[i] + k]
+
+    def child_list(self, i):
+        inicio = self.first[i]
+        return self.children[inicio:inicio + self.counts[i]]
+
+    def literal(self, i):
+        tag = self.aux[i]
+        if tag == LIT_INT:
+            return self.values[i]
+        if tag == LIT_BOOL:
+            return bool(self.values[i])
+        if tag == LIT_STR:
+            return self.strings[self.values[i]]
+        return self.constants[self.values[i]]
+
+    # Conversao a partir da AST de objetos
+
+    @classmethod
+    def from_ast(cls, program):
+        arena = cls()
+        arena.root = arena.store(program)
+        return arena
+
+    def store(self, node):
+        # Iterativo: a AST pode ser profunda (expressoes longas)
+        pilha = [(node, False)]
+        resultados = []
+        while pilha:
+            atual, pronto = pilha.pop()
+            filhos = sa.children(atual)
+            if not pronto:
+                pilha.append((atual, True))
+                for filho in reversed(filhos):
+                    pilha.append((filho, False))
+                continue
+            n = len(filhos)
+            indices = resultados[len(resultados) - n:] if n else []
+            if n:
+                del resultados[len(resultados) - n:]
+            resultados.append(self._add_node(atual, indices))
+        return resultados[0]
+
+    def _add_node(self, node, children):
+        if isinstance(node, sa.BinaryExpr):
+            return self.add(BINARY_EXPR, children, node.op)
+        if isinstance(node, sa.Identifier):
+            return self.add(IDENTIFIER, children, node.name)
+        if isinstance(node, sa.Literal):
+            return self._add_literal(node.value)
+        if isinstance(node, sa.FunctionCall):
+            return self.add(FUNCTION_CALL, children, node.name)
+        if isinstance(node, sa.UnaryExpr):
+            return self.add(UNARY_EXPR, children, node.op)
+        if isinstance(node, sa.ExprStmt):
+            return self.add(EXPR_STMT, children)
+        if isinstance(node, sa.AssignStmt):
+            return self.add(ASSIGN_STMT, children, node.name)
+        if isinstance(node, sa.ReturnStmt):
+            return self.add(RETURN_STMT, children)
+        if isinstance(node, sa.IfStmt):
+            return self.add(IF_STMT, children)
+        if isinstance(node, sa.WhileStmt):
+            return self.add(WHILE_STMT, children)
+        if isinstance(node, sa.Block):
+            return self.add(BLOCK, children)
+        if isinstance(node, sa.VarDecl):
+            return self.add(VAR_DECL, children, node.name, self.intern(node.type_spec))
+        if isinstance(node, sa.ConstDecl):
+            return self.add(CONST_DECL, children, node.name, self.intern(node.type_spec))
+        if isinstance(node, sa.Param):
+            return self.add(PARAM, children, node.name, self.intern(node.type_spec))
+        if isinstance(node, sa.Function):
+            return self.add(FUNCTION, children, node.name, self.intern(node.return_type),
+                            self.intern(node.visibility))
+        if isinstance(node, sa.Program):
+            return self.add(PROGRAM, children)
+        raise TypeError(f"No desconhecido: {type(node).__name__}")
+
+    def _add_literal(self, value):
+        if isinstance(value, bool):
+            return self.add(LITERAL, aux=LIT_BOOL, value=int(value))
+        if isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+            return self.add(LITERAL, aux=LIT_INT, value=value)
+        if isinstance(value, str):
+            return self.add(LITERAL, aux=LIT_STR, value=self.intern(value))
+        self.constants.append(value)
+        return self.add(LITERAL, aux=LIT_CONST, value=len(self.constants) - 1)
+
+    # Conversao de volta para objetos
+
+    def to_ast(self, i=None):
+        i = self.root if i is None else i
+        kind = self.kinds[i]
+        filhos = [self.to_ast(c) for c in self.child_list(i)]
+        name = self.string(self.names[i])
+        if kind == PROGRAM:
+            return sa.Program(filhos)
+        if kind == CONST_DECL:
+            return sa.ConstDecl(name, self.string(self.aux[i]), filhos[0])
+        if kind == VAR_DECL:
+            return sa.VarDecl(name, self.string(self.aux[i]), filhos[0])
+        if kind == FUNCTION:
+            return sa.Function(name, filhos[:-1], self.string(self.aux[i]), filhos[-1],
+                               self.string(self.values[i]))
+        if kind == PARAM:
+            return sa.Param(name, self.string(self.aux[i]))
+        if kind == BLOCK:
+            return sa.Block(filhos)
+        if kind == EXPR_STMT:
+            return sa.ExprStmt(filhos[0])
+        if kind == ASSIGN_STMT:
+            return sa.AssignStmt(name, filhos[0])
+        if kind == RETURN_STMT:
+            return sa.ReturnStmt(filhos[0] if filhos else None)
+        if kind == IF_STMT:
+            return sa.IfStmt(filhos[0], filhos[1], filhos[2] if len(filhos) > 2 else None)
+        if kind == WHILE_STMT:
+            return sa.WhileStmt(filhos[0], filhos[1])
+        if kind == BINARY_EXPR:
+            return sa.BinaryExpr(name, filhos[0], filhos[1])
+        if kind == UNARY_EXPR:
+            return sa.UnaryExpr(name, filhos[0])
+        if kind == LITERAL:
+            return sa.Literal(self.literal(i))
+        if kind == IDENTIFIER:
+            return sa.Identifier(name)
+        return sa.FunctionCall(name, filhos)
+
+    # Percurso sem criar objetos
+
+    def accept(self, visitor, i=None):
+        # Despacha para visitor.visit<Kind>(arena, i), como AbstractVisitor
+        i = self.root if i is None else i
+        return getattr(visitor, 'visit' + KIND_NAMES[self.kinds[i]])(self, i)
+
+    def postorder(self):
+        # Os nos ja estao em pos-ordem: basta percorrer os indices
+        return range(len(self.kinds))
+
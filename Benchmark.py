@@ -0,0 +1,1193 @@
+import copy
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import ExpressionLanguageLex as lex_module
+import ExpressionLanguageParser as parser_module
+import ExpressionLanguageScanner as scanner_module
+import AstArena
+import Bytecode
+import Interpreter
+import MipsSimulator
+import ParallelLex
+import SymbolTable
+import TokenBuffer
+import SintaxeAbstrata as sa
+from Compiler import Compiler
+from ConstantFolding import wrap32, ARITMETICOS, COMPARACOES
+
+
+def medir(func, repeticoes=1):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        result = func()
+    return (time.perf_counter() - inicio) / repeticoes, result
+
+
+# Fonte Zig sintetica (valida para o parser) com aproximadamente `tamanho` bytes
+def gerar_fonte(tamanho):
+    partes = ["const limite: int = 5;\nvar total: int = 0;\n"]
+    atual = len(partes[0])
+    n = 0
+    while atual < tamanho:
+        parte = (
+            f"/* funcao auxiliar {n} */\n"
+            f"fn aux{n}(a: int, b: int) int {{\n"
+            f"    var c: int = a * {n % 97} + b - 0x{n:X};\n"
+            f"    if (c >= limite) {{\n"
+            f"        print(\"valor\\t{n}\\n\");  // comentario\n"
+            f"        print(\"C:\\\\dir\\\\n{n}\");\n"
+            f"    }} else {{\n"
+            f"        c = (c + 1) % 7;\n"
+            f"    }}\n"
+            f"    return c;\n"
+            f"}}\n"
+        )
+        partes.append(parte)
+        atual += len(parte)
+        n += 1
+    partes.append("fn main() void {\n    total = aux0(1, 2);\n    print(total);\n    return;\n}\n")
+    return "".join(partes)
+
+
+def tokens_ply(codigo):
+    lexer = lex_module.build_lexer('ply')
+    lexer.input(codigo)
+    return [(tok.type, tok.value, tok.lineno) for tok in lexer]
+
+
+# Analisador lexico: PLY x ExpressionLanguageScanner em fontes de varios MB
+def bench_lexer(tamanhos=(1_000_000, 4_000_000)):
+    print("Analisador lexico (tokens/s)")
+    ok = True
+    for tamanho in tamanhos:
+        codigo = gerar_fonte(tamanho)
+        t_ply, esperado = medir(lambda: tokens_ply(codigo))
+        t_scanner, obtido = medir(lambda: scanner_module.tokenize(codigo))
+        n = len(esperado)
+        ok = ok and esperado == obtido
+        print(f"    {len(codigo) / 1e6:5.1f} MB, {n} tokens, identicos: {esperado == obtido}")
+        print(f"        ply:     {n / t_ply:14,.0f} tokens/s")
+        print(f"        scanner: {n / t_scanner:14,.0f} tokens/s ({t_ply / t_scanner:.1f}x)")
+    return ok
+
+
+# Programas com N itens, comandos, parametros ou argumentos
+FORMAS_LISTA = {
+    'items': lambda n: "".join(f"var v{i}: int = {i};\n" for i in range(n)) + "fn main() void {\n    return;\n}\n",
+    'stmts': lambda n: "fn main() void {\n" + "".join(f"    print({i});\n" for i in range(n)) + "    return;\n}\n",
+    'params': lambda n: "fn f(" + ", ".join(f"p{i}: int" for i in range(n)) + ") void {\n    return;\n}\n",
+    'args': lambda n: "fn main() void {\n    f(" + ", ".join(str(i) for i in range(n)) + ");\n    return;\n}\n",
+}
+
+# Expoente maximo aceito para tempo ~ N^k entre os dois maiores tamanhos
+EXPOENTE_MAXIMO = 1.3
+
+
+# Escalabilidade das producoes de lista (1k -> 100k); falha se crescer superlinearmente
+def bench_list_scaling(tamanhos=(1_000, 10_000, 100_000)):
+    parser = parser_module.get_parser()
+    lexer = lex_module.build_lexer('scanner')
+    ok = True
+    print("Producoes de lista (tempo de parse)")
+    for forma, gerar in FORMAS_LISTA.items():
+        tempos = []
+        for n in tamanhos:
+            codigo = gerar(n)
+            tempo, _ = medir(lambda: parser.parse(codigo, lexer=lexer))
+            tempos.append(tempo)
+        expoente = math.log(tempos[-1] / tempos[-2]) / math.log(tamanhos[-1] / tamanhos[-2])
+        linear = expoente <= EXPOENTE_MAXIMO
+        ok = ok and linear
+        detalhes = "  ".join(f"{n}: {t * 1000:9.1f} ms" for n, t in zip(tamanhos, tempos))
+        print(f"    {forma:<7} {detalhes}  expoente {expoente:4.2f} {'ok' if linear else 'SUPERLINEAR'}")
+    return ok
+
+
+class ContadorObjetos:
+    # Percurso da AST de objetos: conta nos e soma literais inteiros
+    def __init__(self):
+        self.nos = 0
+        self.soma = 0
+
+    def visitar(self, no):
+        self.nos += 1
+        if isinstance(no, sa.Literal):
+            if type(no.value) is int:
+                self.soma += no.value
+            return
+        for filho in sa.children(no):
+            self.visitar(filho)
+
+
+def percorrer_arena(arena):
+    # Percurso linear da arena: so inteiros, nenhum objeto de no e criado
+    soma = 0
+    kinds, aux, values = arena.kinds, arena.aux, arena.values
+    for i in arena.postorder():
+        if kinds[i] == AstArena.LITERAL and aux[i] == AstArena.LIT_INT:
+            soma += values[i]
+    return len(kinds), soma
+
+
+def memoria_retida(func):
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    result = func()
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return depois - antes, result
+
+
+# AST: objetos com __slots__ x arena em arrays tipados (memoria por no e percurso)
+def bench_ast_arena(tamanho=1_000_000):
+    sys.setrecursionlimit(10_000)
+    ast = parser_module.get_parser().parse(gerar_fonte(tamanho), lexer=lex_module.new_lexer('scanner'))
+    mem_objetos, copia = memoria_retida(lambda: copy.deepcopy(ast))
+    mem_arena, arena = memoria_retida(lambda: AstArena.AstArena.from_ast(ast))
+    n = len(arena)
+
+    def percorrer_objetos():
+        contador = ContadorObjetos()
+        contador.visitar(copia)
+        return contador.nos, contador.soma
+
+    t_objetos, r_objetos = medir(percorrer_objetos, 3)
+    t_arena, r_arena = medir(lambda: percorrer_arena(arena), 3)
+    print(f"AST com {n} nos (resultados iguais: {r_objetos == r_arena})")
+    print(f"    objetos (__slots__): {mem_objetos / n:7.1f} bytes/no  percurso {t_objetos * 1000:8.1f} ms")
+    print(f"    arena:               {mem_arena / n:7.1f} bytes/no  percurso {t_arena * 1000:8.1f} ms")
+
+
+class ListaDeDicionarios:
+    # Referencia: a tabela antiga (lista de dicionarios, busca do topo para a base)
+    def __init__(self):
+        self.symbolTable = []
+
+    def beginScope(self, nameScope):
+        self.symbolTable.append({'scope': nameScope})
+
+    def endScope(self):
+        self.symbolTable = self.symbolTable[0:-1]
+
+    def addVar(self, name, type, offset=None):
+        self.symbolTable[-1][name] = {'bindable': 'var', 'type': type, 'offset': offset}
+
+    def getBindable(self, bindableName):
+        for i in reversed(range(len(self.symbolTable))):
+            if bindableName in self.symbolTable[i].keys():
+                return self.symbolTable[i][bindableName]
+        return None
+
+
+def exercitar_tabela(tabela, profundidade, locais, consultas):
+    tabela.beginScope('global')
+    for k in range(locais):
+        tabela.addVar(f'g{k}', 'int')
+    for nivel in range(profundidade):
+        tabela.beginScope(f'bloco{nivel}')
+        for k in range(locais):
+            tabela.addVar(f'v{nivel}_{k}', 'int')
+        for k in range(consultas):
+            tabela.getBindable(f'g{k % locais}')
+            tabela.getBindable(f'v{nivel}_{k % locais}')
+    for nivel in range(profundidade):
+        tabela.endScope()
+
+
+# Tabela de simbolos: lista de dicionarios x ScopedTable (pilhas por nome + log de desfazer)
+def bench_symbol_table(casos=((50, 100, 2_000), (200, 500, 1_000), (1_000, 20, 200))):
+    print("Tabela de simbolos (profundidade, locais/escopo, consultas/escopo)")
+    for profundidade, locais, consultas in casos:
+        t_antiga, _ = medir(lambda: exercitar_tabela(ListaDeDicionarios(), profundidade, locais, consultas))
+        t_nova, _ = medir(lambda: exercitar_tabela(SymbolTable.SymbolTable(), profundidade, locais, consultas))
+        print(f"    ({profundidade:5}, {locais:5}, {consultas:5})  lista: {t_antiga * 1000:9.1f} ms"
+              f"  ScopedTable: {t_nova * 1000:9.1f} ms  ({t_antiga / t_nova:5.1f}x)")
+
+
+# Escalabilidade da analise lexica em pedacos (1/2/4/8 processos)
+def bench_parallel_lexer(tamanho=4_000_000, workers=(1, 2, 4, 8), backend='scanner'):
+    codigo = gerar_fonte(tamanho)
+    t_serial, serial = medir(lambda: tokens_ply(codigo))
+    print(f"Analise lexica paralela ({len(codigo) / 1e6:.1f} MB, {len(serial)} tokens)")
+    print(f"    ply serial:  {t_serial:8.3f} s")
+    ok = True
+    for n in workers:
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            list(pool.map(ParallelLex.lex_chunk, [(backend, '', 1, 0)] * n))
+            tempo, tokens = medir(lambda: ParallelLex.tokenize_parallel(codigo, n, backend, pool))
+        identicos = [tok[:3] for tok in tokens] == serial
+        ok = ok and identicos
+        print(f"    {n} worker(s): {tempo:8.3f} s  ({t_serial / tempo:5.1f}x sobre ply)  identicos: {identicos}")
+    return ok
+
+
+MEMORIA_RSS = '''
+import resource, sys
+import ExpressionLanguageLex as lx, TokenBuffer
+
+
+def pico_rss():
+    # VmHWM (Linux) e do proprio processo; ru_maxrss herda o pico do processo pai
+    try:
+        with open('/proc/self/status') as f:
+            for linha in f:
+                if linha.startswith('VmHWM:'):
+                    return int(linha.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+modo, caminho = sys.argv[1:]
+base = pico_rss()
+if modo == 'ply':
+    with open(caminho, 'r') as f:
+        code = f.read()
+    lexer = lx.build_lexer('ply')
+    lexer.input(code)
+    tokens = list(lexer)
+else:
+    tokens = TokenBuffer.TokenBuffer.from_file(caminho)
+print(len(tokens), pico_rss() - base)
+'''
+
+
+def tokens_ply_arquivo(caminho):
+    with open(caminho, 'r') as f:
+        code = f.read()
+    lexer = lex_module.build_lexer('ply')
+    lexer.input(code)
+    return code, list(lexer)
+
+
+def pico_alocado(func):
+    tracemalloc.start()
+    result = func()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico, result
+
+
+# Memoria dos tokens: f.read() + lexer.input(code) x TokenBuffer sobre mmap
+def bench_token_memory(tamanho=8_000_000):
+    print("Memoria dos tokens (ply x TokenBuffer/mmap)")
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'grande.zig')
+        with open(caminho, 'w') as f:
+            f.write(gerar_fonte(tamanho))
+        print(f"    fonte: {os.path.getsize(caminho) / 1e6:.1f} MB")
+        for modo in ('ply', 'buffer'):
+            proc = executar_python(['-c', MEMORIA_RSS, modo, caminho], diretorio)
+            n, rss = proc.stdout.split()
+            print(f"    {modo:<8} pico de RSS: {int(rss) / 1024:8.1f} MB ({int(rss) * 1024 / int(n):6.1f} bytes/token)")
+
+        pequeno = os.path.join(diretorio, 'pequeno.zig')
+        with open(pequeno, 'w') as f:
+            f.write(gerar_fonte(tamanho // 8))
+        pico_ply, (_, tokens) = pico_alocado(lambda: tokens_ply_arquivo(pequeno))
+        pico_buffer, buffer = pico_alocado(lambda: TokenBuffer.TokenBuffer.from_file(pequeno))
+        n = len(tokens)
+        buffer.close()
+        print(f"    alocado (tracemalloc, {n} tokens):")
+        print(f"        ply:    {pico_ply / n:8.1f} bytes/token")
+        print(f"        buffer: {pico_buffer / n:8.1f} bytes/token")
+
+
+# Tabelas LALR: geracao (frio) x leitura do cache em disco (quente) x parser do processo
+def bench_parser_cache(repeticoes=20):
+    with tempfile.TemporaryDirectory() as diretorio:
+        frio, _ = medir(lambda: parser_module.build_parser(diretorio))
+        quente, _ = medir(lambda: parser_module.build_parser(diretorio), repeticoes)
+    parser_module.get_parser()
+    processo, _ = medir(parser_module.get_parser, repeticoes)
+
+    print("Tabelas LALR (build_parser)")
+    print(f"    frio (gera tabelas):       {frio * 1000:10.3f} ms")
+    print(f"    quente (cache em disco):   {quente * 1000:10.3f} ms")
+    print(f"    get_parser (por processo): {processo * 1000:10.3f} ms")
+    print(f"    ganho frio/quente:         {frio / quente:10.1f}x")
+
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+PRIMEIRO_TOKEN = (
+    "import time; t0 = time.perf_counter(); import ExpressionLanguageLex as lx; "
+    "lexer = lx.get_lexer(); lexer.input('const x = 1;'); lexer.token(); "
+    "print(time.perf_counter() - t0)"
+)
+
+
+def executar_python(args, diretorio):
+    env = dict(os.environ, PYTHONPATH=RAIZ)
+    return subprocess.run([sys.executable] + args, cwd=diretorio, env=env,
+                          capture_output=True, text=True, check=True)
+
+
+# Partida: custo de import (python -X importtime) e tempo ate o primeiro token,
+# sempre em processo novo e fora do diretorio do projeto
+def bench_startup(repeticoes=5):
+    modulos = ['ExpressionLanguageLex', 'ExpressionLanguageParser', 'Visitor',
+               'SemanticVisitor', 'AssemblyVisitor']
+    print("Partida (processo novo, diretorio temporario)")
+    with tempfile.TemporaryDirectory() as diretorio:
+        for modulo in modulos:
+            tempos = []
+            for _ in range(repeticoes):
+                proc = executar_python(['-X', 'importtime', '-c', f'import {modulo}'], diretorio)
+                for linha in proc.stderr.splitlines():
+                    partes = linha.split('|')
+                    if len(partes) == 3 and partes[2].strip() == modulo:
+                        tempos.append(int(partes[1]))
+            print(f"    import {modulo:<26} {min(tempos) / 1000:10.3f} ms")
+
+        tempos = [float(executar_python(['-c', PRIMEIRO_TOKEN], diretorio).stdout)
+                  for _ in range(repeticoes)]
+        print(f"    {'ate o primeiro token':<33} {min(tempos) * 1000:10.3f} ms")
+
+
+def expressao_balanceada(profundidade, folhas):
+    # Arvore binaria completa: exige profundidade + 1 registradores (Sethi-Ullman)
+    if profundidade == 0:
+        return next(folhas)
+    op = '+-'[profundidade % 2]
+    esquerda = expressao_balanceada(profundidade - 1, folhas)
+    direita = expressao_balanceada(profundidade - 1, folhas)
+    return f"({esquerda} {op} {direita})"
+
+
+def programas_codegen():
+    with open(lex_module.INPUT_PADRAO, 'r', encoding='utf-8') as f:
+        programas = {'input1.zig': f.read()}
+    programas['expressoes'] = (
+        "fn poly(x: int) int {\n"
+        "    return x * x * x + 3 * x * x - 2 * x + 7;\n"
+        "}\n"
+        "fn main() void {\n"
+        "    var i: int = 0;\n"
+        "    var soma: int = 0;\n"
+        "    while (i < 2000) {\n"
+        "        soma = soma + (i * 3 + 1) % 7 - (i / 5) * 2 + poly(i % 10);\n"
+        "        i = i + 1;\n"
+        "    }\n"
+        "    print(soma);\n"
+        "    return;\n"
+        "}\n")
+    folhas = iter(f"(i + {k})" for k in range(2 ** 12))
+    programas['spill'] = (
+        "fn main() void {\n"
+        "    var i: int = 0;\n"
+        "    var soma: int = 0;\n"
+        "    while (i < 20) {\n"
+        f"        soma = soma + {expressao_balanceada(12, folhas)};\n"
+        "        i = i + 1;\n"
+        "    }\n"
+        "    print(soma);\n"
+        "    return;\n"
+        "}\n")
+    programas['constantes'] = (
+        "const largura: int = 64;\n"
+        "const altura: int = 48;\n"
+        "const escala: int = 4;\n"
+        "const area: int = largura * altura;\n"
+        "fn main() void {\n"
+        "    var i: int = 0;\n"
+        "    var soma: int = 0;\n"
+        "    while (i < area / escala / escala) {\n"
+        "        soma = soma + i * 1 + 0 + (largura - 1) * escala % 7 - (altura / 6) * (escala - 4) * i;\n"
+        "        if (escala > 8) {\n"
+        "            print(-1);\n"
+        "        }\n"
+        "        i = i + 1;\n"
+        "    }\n"
+        "    print(soma);\n"
+        "    return;\n"
+        "}\n")
+    programas['lacos'] = (
+        "fn contar(n: int) int {\n"
+        "    var total: int = 0;\n"
+        "    var i: int = n;\n"
+        "    while (i > 0) {\n"
+        "        if (i % 3 == 0) {\n"
+        "            total = total + i;\n"
+        "        }\n"
+        "        if (i % 5 != 0) {\n"
+        "            total = total - 1;\n"
+        "        } else {\n"
+        "            total = total + 2;\n"
+        "        }\n"
+        "        if (!(i <= n / 2)) {\n"
+        "            total = total + 1;\n"
+        "        }\n"
+        "        if (i == 7) {\n"
+        "            total = total * 2;\n"
+        "        }\n"
+        "        if (total >= i) {\n"
+        "            total = total - 3;\n"
+        "        }\n"
+        "        i = i - 1;\n"
+        "    }\n"
+        "    return total;\n"
+        "}\n"
+        "fn main() void {\n"
+        "    var k: int = 0;\n"
+        "    var soma: int = 0;\n"
+        "    while (k < 30) {\n"
+        "        soma = soma + contar(k * 10);\n"
+        "        k = k + 1;\n"
+        "    }\n"
+        "    print(soma);\n"
+        "    return;\n"
+        "}\n")
+    programas['recursao'] = (
+        "fn fib(n: int) int {\n"
+        "    if (n < 2) {\n"
+        "        return n;\n"
+        "    }\n"
+        "    return fib(n - 1) + fib(n - 2);\n"
+        "}\n"
+        "fn main() void {\n"
+        "    print(fib(16));\n"
+        "    return;\n"
+        "}\n")
+    return programas
+
+
+# Casos de ordem de avaliacao: '+' unario e chamada que escreve um global lido
+# no outro operando (a saida deve ser a do modo pilha, esquerda para direita)
+def programas_avaliacao():
+    return {
+        'unario': (
+            "fn main() void {\n"
+            "    var q: int = 7;\n"
+            "    var r: int = 3;\n"
+            "    print(+q);\n"
+            "    print(+(q - r) * +r);\n"
+            "    return;\n"
+            "}\n"),
+        'efeitos': (
+            "var g: int = 1;\n"
+            "fn bump(x: int) int {\n"
+            "    g = 10;\n"
+            "    return x;\n"
+            "}\n"
+            "fn main() void {\n"
+            "    print(g + bump(0));\n"
+            "    g = 1;\n"
+            "    print(g * 2 - (g + bump(3)));\n"
+            "    return;\n"
+            "}\n"),
+    }
+
+
+def compilar(codigo, **opcoes):
+    _, diagnostics, asm = Compiler(**opcoes).compile(codigo)
+    if asm is None:
+        raise RuntimeError("; ".join(diagnostics))
+    return asm
+
+
+def executar_mips(codigo, **opcoes):
+    return MipsSimulator.run(compilar(codigo, **opcoes))
+
+
+def instrucoes_emitidas(asm):
+    # Linhas de instrucao da secao .text (sem rotulos e diretivas)
+    texto = asm[asm.index('.text'):]
+    return sum(1 for linha in texto.splitlines()
+               if linha.strip() and not linha.strip().endswith(':') and not linha.startswith('.'))
+
+
+# Codegen: temporarios na pilha x em registradores (instrucoes executadas)
+def bench_register_temps():
+    sys.setrecursionlimit(10_000)
+    ok = True
+    print(f"    {'programa':<12} {'pilha':>10} {'registradores':>14} {'reducao':>8}")
+    programas = {**programas_codegen(), **programas_avaliacao()}
+    for nome, codigo in programas.items():
+        saida_pilha, passos_pilha = executar_mips(codigo)
+        saida_regs, passos_regs = executar_mips(codigo, register_temps=True)
+        iguais = saida_pilha == saida_regs
+        ok = ok and iguais
+        print(f"    {nome:<12} {passos_pilha:>10} {passos_regs:>14} "
+              f"{1 - passos_regs / passos_pilha:>7.1%}{'' if iguais else '  SAIDAS DIFERENTES'}")
+    return ok
+
+
+# Dobramento de constantes: instrucoes emitidas e executadas, sem e com o passo
+def bench_constant_folding():
+    ok = True
+    print(f"    {'programa':<12} {'emitidas':>17} {'executadas':>21}")
+    for nome, codigo in programas_codegen().items():
+        if nome == 'spill':
+            continue
+        asm_antes = compilar(codigo)
+        asm_depois = compilar(codigo, fold_constants=True)
+        saida_antes, passos_antes = MipsSimulator.run(asm_antes)
+        saida_depois, passos_depois = MipsSimulator.run(asm_depois)
+        iguais = saida_antes == saida_depois
+        ok = ok and iguais
+        print(f"    {nome:<12} {instrucoes_emitidas(asm_antes):>7} -> {instrucoes_emitidas(asm_depois):<7}"
+              f" {passos_antes:>9} -> {passos_depois:<9}{'' if iguais else '  SAIDAS DIFERENTES'}")
+    return ok
+
+
+# Peephole: instrucoes emitidas/executadas e reescritas por regra
+def bench_peephole():
+    import Peephole
+    ok = True
+    for registradores in (False, True):
+        print(f"  temporarios em {'registradores' if registradores else 'pilha'}:")
+        for nome, codigo in programas_codegen().items():
+            asm_antes = compilar(codigo, register_temps=registradores)
+            compiler = Compiler(register_temps=registradores, peephole=True)
+            asm_depois = compiler.compile(codigo)[2]
+            saida_antes, passos_antes = MipsSimulator.run(asm_antes)
+            saida_depois, passos_depois = MipsSimulator.run(asm_depois)
+            iguais = saida_antes == saida_depois
+            ok = ok and iguais
+            regras = ' '.join(f"{regra}={compiler.peephole_report[regra]}" for regra in Peephole.RULES)
+            print(f"    {nome:<12} emitidas {instrucoes_emitidas(asm_antes):>5} -> {instrucoes_emitidas(asm_depois):<5}"
+                  f" executadas {passos_antes:>7} -> {passos_depois:<7}{'' if iguais else '  SAIDAS DIFERENTES'}")
+            print(f"    {'':<12} {regras}")
+    return ok
+
+
+# Fusao de comparacao e desvio nas condicoes de if/while (instrucoes executadas)
+def bench_fuse_branches():
+    ok = True
+    print(f"    {'programa':<12} {'pilha':>21} {'registradores':>21}")
+    for nome, codigo in programas_codegen().items():
+        colunas = []
+        for registradores in (False, True):
+            saida_antes, passos_antes = executar_mips(codigo, register_temps=registradores)
+            saida_depois, passos_depois = executar_mips(codigo, register_temps=registradores,
+                                                        fuse_branches=True)
+            ok = ok and saida_antes == saida_depois
+            colunas.append(f"{passos_antes:>9} -> {passos_depois:<9}"
+                           + ('' if saida_antes == saida_depois else ' SAIDAS DIFERENTES'))
+        print(f"    {nome:<12} {colunas[0]} {colunas[1]}")
+    return ok
+
+
+PROGRAMAS_LACOS = {
+    'contagem': (
+        "fn main() void {\n"
+        "    var i: int = 0;\n"
+        "    var total: int = 0;\n"
+        "    while (i < 200) {\n"
+        "        var j: int = 0;\n"
+        "        while (j < 100) {\n"
+        "            total = total + 1;\n"
+        "            j = j + 1;\n"
+        "        }\n"
+        "        i = i + 1;\n"
+        "    }\n"
+        "    print(total);\n"
+        "    return;\n"
+        "}\n"),
+    'vazio': (
+        "fn main() void {\n"
+        "    var i: int = 0;\n"
+        "    while (i < 0) {\n"
+        "        i = i + 1;\n"
+        "    }\n"
+        "    print(i);\n"
+        "    return;\n"
+        "}\n"),
+}
+
+
+PROGRAMA_CHAMADAS = (
+    "fn soma(a: int, b: int) int {\n"
+    "    return a + b;\n"
+    "}\n"
+    "fn mistura(a: int, b: int, c: int, d: int, e: int, f: int) int {\n"
+    "    var t: int = a + b * 2 + c * 3;\n"
+    "    return t + d * 4 + e * 5 + f * 6;\n"
+    "}\n"
+    "fn main() void {\n"
+    "    var i: int = 0;\n"
+    "    var total: int = 0;\n"
+    "    while (i < 3000) {\n"
+    "        total = soma(total, i) % 100000;\n"
+    "        total = total + mistura(i, 1, 2, 3, soma(i, 1), 5) % 7;\n"
+    "        i = i + 1;\n"
+    "    }\n"
+    "    print(total);\n"
+    "    return;\n"
+    "}\n")
+
+
+# Rotacao de lacos: desvios executados por configuracao de codegen
+def bench_loop_rotation():
+    ok = True
+    programas = {'input1.zig': programas_codegen()['input1.zig'], **PROGRAMAS_LACOS}
+    configuracoes = {
+        'base': {},
+        'rotacao': {'rotate_loops': True},
+        'fusao': {'fuse_branches': True},
+        'fusao+rotacao': {'fuse_branches': True, 'rotate_loops': True},
+    }
+    for nome, codigo in programas.items():
+        print(f"  {nome}:")
+        esperado = None
+        for rotulo, opcoes in configuracoes.items():
+            simulador = MipsSimulator.Simulator(compilar(codigo, **opcoes))
+            saida = simulador.run()
+            esperado = saida if esperado is None else esperado
+            ok = ok and saida == esperado
+            print(f"    {rotulo:<14} desvios {simulador.branches:>7}  saltos {simulador.jumps:>7}"
+                  f"  instrucoes {simulador.steps:>8}{'' if saida == esperado else '  SAIDA DIFERENTE'}")
+    return ok
+
+
+# Convencao de chamada: pilha x registradores ($a0-$a3, folhas sem frame)
+def bench_abi():
+    from AssemblyVisitor import ABI_STACK, ABI_REGISTERS
+    ok = True
+    programas = {**programas_codegen(), 'chamadas': PROGRAMA_CHAMADAS}
+    for registradores in (False, True):
+        print(f"  temporarios em {'registradores' if registradores else 'pilha'}:")
+        print(f"    {'programa':<12} {'ABI pilha':>10} {'ABI registradores':>18} {'reducao':>8}")
+        for nome, codigo in programas.items():
+            saida_pilha, passos_pilha = executar_mips(codigo, register_temps=registradores, abi=ABI_STACK)
+            saida_regs, passos_regs = executar_mips(codigo, register_temps=registradores, abi=ABI_REGISTERS)
+            iguais = saida_pilha == saida_regs
+            ok = ok and iguais
+            print(f"    {nome:<12} {passos_pilha:>10} {passos_regs:>18} "
+                  f"{1 - passos_regs / passos_pilha:>7.1%}{'' if iguais else '  SAIDAS DIFERENTES'}")
+    return ok
+
+
+# Codegen: locais no frame x em registradores (linear scan por funcao)
+def acessos_memoria(asm):
+    # lw/sw emitidos na secao .text
+    texto = asm[asm.index('.text'):]
+    return sum(1 for linha in texto.splitlines() if linha.split()[:1] in (['lw'], ['sw']))
+
+
+def bench_register_allocation():
+    from AssemblyVisitor import ABI_STACK, ABI_REGISTERS
+    ok = True
+    programas = {**programas_codegen(), 'chamadas': PROGRAMA_CHAMADAS, **PROGRAMAS_LACOS}
+    configuracoes = {
+        'padrao': {},
+        'otimizado': {'register_temps': True, 'abi': ABI_REGISTERS, 'peephole': True,
+                      'fuse_branches': True, 'rotate_loops': True},
+    }
+    for rotulo, opcoes in configuracoes.items():
+        print(f"  {rotulo}:")
+        print(f"    {'programa':<12} {'frame':>10} {'registradores':>14} {'reducao':>8} {'lw/sw':>12}")
+        for nome, codigo in programas.items():
+            asm_frame = compilar(codigo, **opcoes)
+            asm_regs = compilar(codigo, allocate_registers=True, **opcoes)
+            saida_frame, passos_frame = MipsSimulator.run(asm_frame)
+            saida_regs, passos_regs = MipsSimulator.run(asm_regs)
+            iguais = saida_frame == saida_regs
+            ok = ok and iguais
+            memoria = f"{acessos_memoria(asm_frame)}->{acessos_memoria(asm_regs)}"
+            print(f"    {nome:<12} {passos_frame:>10} {passos_regs:>14} "
+                  f"{1 - passos_regs / passos_frame:>7.1%} {memoria:>12}"
+                  f"{'' if iguais else '  SAIDAS DIFERENTES'}")
+    return ok
+
+
+# Coloracao de slots: bytes do frame por funcao, sem e com compartilhamento
+PROGRAMA_BLOCOS = (
+    "fn passo(n: int) int {\n"
+    "    if (n == 0) {\n"
+    "        return 0;\n"
+    "    }\n"
+    "    if (n % 2 == 0) {\n"
+    "        var metade: int = n / 2;\n"
+    "        var par: int = metade + metade;\n"
+    "        return passo(n - 1) + par - n + 1;\n"
+    "    } else {\n"
+    "        var triplo: int = n * 3;\n"
+    "        var impar: int = triplo - n - n;\n"
+    "        return passo(n - 1) + impar - n + 2;\n"
+    "    }\n"
+    "}\n"
+    "fn main() void {\n"
+    "    var i: int = 0;\n"
+    "    while (i < 3) {\n"
+    "        var x: int = passo(1000);\n"
+    "        print(x);\n"
+    "        i = i + 1;\n"
+    "    }\n"
+    "    var fim: int = passo(10);\n"
+    "    print(fim);\n"
+    "    return;\n"
+    "}\n")
+
+
+def bench_slot_coloring():
+    from AssemblyVisitor import ABI_REGISTERS
+    ok = True
+    programas = {**programas_codegen(), 'chamadas': PROGRAMA_CHAMADAS, 'blocos': PROGRAMA_BLOCOS}
+    configuracoes = {
+        'padrao': {},
+        'ABI registradores': {'abi': ABI_REGISTERS},
+        'locais em registradores': {'allocate_registers': True},
+    }
+    for rotulo, opcoes in configuracoes.items():
+        print(f"  {rotulo}:")
+        print(f"    {'programa':<12} {'funcao':<14} {'frame':>6} {'colorido':>9}")
+        for nome, codigo in programas.items():
+            compiler = Compiler(color_slots=True, **opcoes)
+            _, _, asm = compiler.compile(codigo)
+            iguais = MipsSimulator.run(asm)[0] == executar_mips(codigo, **opcoes)[0]
+            ok = ok and iguais
+            for funcao, (antes, depois) in compiler.frame_report.items():
+                print(f"    {nome:<12} {funcao:<14} {antes:>6} {depois:>9}"
+                      f"{'' if iguais else '  SAIDAS DIFERENTES'}")
+    return ok
+
+
+# Pool de strings: bytes de .data sem pool, internando e juntando sufixos
+PROGRAMA_MENSAGENS = (
+    "fn relatorio(x: int) void {\n"
+    "    print(\"Resultado da soma:\");\n"
+    "    print(x);\n"
+    "    print(\"soma:\");\n"
+    "    print(x + x);\n"
+    "    print(\"Resultado da soma:\");\n"
+    "    return;\n"
+    "}\n"
+    "fn main() void {\n"
+    "    var i: int = 0;\n"
+    "    while (i < 3) {\n"
+    "        print(\"Erro: valor invalido\");\n"
+    "        print(\"valor invalido\");\n"
+    "        relatorio(i);\n"
+    "        i = i + 1;\n"
+    "    }\n"
+    "    var aviso: string = \"Erro: valor invalido\";\n"
+    "    print(aviso);\n"
+    "    print(\"Resultado da soma:\");\n"
+    "    return;\n"
+    "}\n")
+
+
+def bench_string_pool():
+    ok = True
+    programas = {'input1.zig': programas_codegen()['input1.zig'], 'mensagens': PROGRAMA_MENSAGENS}
+    print(f"  {'programa':<12} {'literais':>8} {'distintos':>9} {'sufixos':>8} "
+          f"{'sem pool':>9} {'internado':>10} {'sufixos':>8}")
+    for nome, codigo in programas.items():
+        relatorios = []
+        saidas = []
+        for merge in (False, True):
+            compiler = Compiler(merge_strings=merge)
+            _, _, asm = compiler.compile(codigo)
+            relatorios.append(compiler.string_report)
+            saidas.append(MipsSimulator.run(asm)[0])
+        iguais = saidas[0] == saidas[1]
+        ok = ok and iguais
+        internado, juntado = relatorios
+        sem_pool = internado['bytes'] + internado['saved']
+        print(f"  {nome:<12} {internado['literals']:>8} {internado['strings']:>9} "
+              f"{juntado['merged']:>8} {sem_pool:>9} {internado['bytes']:>10} {juntado['bytes']:>8}"
+              f"{'' if iguais else '  SAIDAS DIFERENTES'}")
+    return ok
+
+
+# Globais estaticos: codigo de inicializacao antes de `jal main` e instrucoes executadas
+PROGRAMA_GLOBAIS = (
+    "const base: int = 40;\n"
+    "const dobro: int = base * 2 + 1;\n"
+    "const titulo: string = \"Tabela\";\n"
+    "const ligado: bool = base > 10;\n"
+    "var contador: int = dobro - base;\n"
+    "var lido: int = 0;\n"
+    "\n"
+    "fn leitura() int {\n"
+    "    return base + 2;\n"
+    "}\n"
+    "\n"
+    "fn main() void {\n"
+    "    lido = leitura();\n"
+    "    print(titulo);\n"
+    "    var k: int = 0;\n"
+    "    while (k < base) {\n"
+    "        contador = contador + dobro % 7;\n"
+    "        k = k + 1;\n"
+    "    }\n"
+    "    if (ligado) {\n"
+    "        print(contador);\n"
+    "    }\n"
+    "    print(lido + dobro - base);\n"
+    "    print(-base);\n"
+    "    return;\n"
+    "}\n")
+
+
+def instrucoes_inicializacao(asm):
+    texto = asm[asm.index('.text'):asm.index('    jal main')]
+    return sum(1 for linha in texto.splitlines()[1:] if linha.strip())
+
+
+def bench_static_globals():
+    ok = True
+    programas = {'input1.zig': programas_codegen()['input1.zig'], 'globais': PROGRAMA_GLOBAIS}
+    configuracoes = {
+        'padrao': {},
+        'registradores': {'register_temps': True, 'fuse_branches': True},
+    }
+    for rotulo, opcoes in configuracoes.items():
+        print(f"  {rotulo}:")
+        print(f"    {'programa':<12} {'inicializacao':>13} {'estatico':>9} {'executadas':>11} {'estatico':>9}")
+        for nome, codigo in programas.items():
+            asm = compilar(codigo, **opcoes)
+            asm_estatico = compilar(codigo, static_globals=True, **opcoes)
+            saida, passos = MipsSimulator.run(asm)
+            saida_estatico, passos_estatico = MipsSimulator.run(asm_estatico)
+            iguais = saida == saida_estatico
+            ok = ok and iguais
+            print(f"    {nome:<12} {instrucoes_inicializacao(asm):>13} "
+                  f"{instrucoes_inicializacao(asm_estatico):>9} {passos:>11} {passos_estatico:>9}"
+                  f"{'' if iguais else '  SAIDAS DIFERENTES'}")
+    return ok
+
+
+# Codigo morto: biblioteca de auxiliares em que main usa so algumas funcoes
+def programa_biblioteca(auxiliares=40):
+    linhas = ["const escala: int = 3;", "const sem_uso: int = 99;",
+              "var contador: int = 0;", "var rascunho: int = 7;",
+              "fn semente() int {", "    return escala * 2;", "}",
+              "var inicial: int = semente();"]
+    for k in range(auxiliares):
+        linhas += [f"fn aux{k}(x: int) int {{",
+                   f"    print(\"auxiliar {k}\");",
+                   f"    return x * {k + 1} + aux{k - 1}(x) % 5;" if k else "    return x + escala;",
+                   "}"]
+    linhas += ["fn main() void {",
+               "    var i: int = 0;",
+               "    while (i < 5) {",
+               "        contador = contador + aux2(i);",
+               "        i = i + 1;",
+               "    }",
+               "    print(contador + inicial);",
+               "    return;",
+               "}"]
+    return "\n".join(linhas) + "\n"
+
+
+def tamanho_dados(asm):
+    # Bytes da secao .data (pelo montador do simulador)
+    return len(MipsSimulator.Program(asm).data)
+
+
+def bench_dead_code():
+    ok = True
+    programas = {**programas_codegen(), 'biblioteca': programa_biblioteca()}
+    print(f"  {'programa':<12} {'funcoes':>8} {'globais':>8} {'strings':>8} "
+          f"{'instrucoes':>14} {'.data':>12}")
+    for nome, codigo in programas.items():
+        asm = compilar(codigo)
+        compiler = Compiler(dead_code=True)
+        _, _, asm_vivo = compiler.compile(codigo)
+        iguais = MipsSimulator.run(asm)[0] == MipsSimulator.run(asm_vivo)[0]
+        ok = ok and iguais
+        removidos = compiler.dead_code_report
+        instrucoes = f"{instrucoes_emitidas(asm)}->{instrucoes_emitidas(asm_vivo)}"
+        dados = f"{tamanho_dados(asm)}->{tamanho_dados(asm_vivo)}"
+        print(f"  {nome:<12} {len(removidos['functions']):>8} {len(removidos['globals']):>8} "
+              f"{removidos['strings']:>8} {instrucoes:>14} {dados:>12}"
+              f"{'' if iguais else '  SAIDAS DIFERENTES'}")
+    return ok
+
+
+# Simulador: vazao (instrucoes por segundo) e estatisticas dinamicas
+PROGRAMA_MILHOES = (
+    "fn main() void {\n"
+    "    var i: int = 0;\n"
+    "    var total: int = 0;\n"
+    "    while (i < 1000) {\n"
+    "        var j: int = 0;\n"
+    "        while (j < 250) {\n"
+    "            total = (total + i * j) % 1000003;\n"
+    "            j = j + 1;\n"
+    "        }\n"
+    "        i = i + 1;\n"
+    "    }\n"
+    "    print(total);\n"
+    "    return;\n"
+    "}\n")
+
+
+def bench_simulator():
+    programas = {**programas_codegen(), 'chamadas': PROGRAMA_CHAMADAS, 'milhoes': PROGRAMA_MILHOES}
+    print(f"  {'programa':<12} {'instrucoes':>11} {'segundos':>9} {'instr/s':>10} {'loads':>9} "
+          f"{'stores':>9} {'tomados':>9} {'nao tomados':>11}")
+    for nome, codigo in programas.items():
+        programa = MipsSimulator.Program(compilar(codigo))
+        inicio = time.perf_counter()
+        simulador = MipsSimulator.Simulator(programa)
+        simulador.run()
+        tempo = time.perf_counter() - inicio
+        stats = simulador.statistics()
+        print(f"  {nome:<12} {stats['steps']:>11} {tempo:>9.3f} {stats['steps'] / tempo:>10.0f} "
+              f"{stats['loads']:>9} {stats['stores']:>9} {stats['branches_taken']:>9} "
+              f"{stats['branches_not_taken']:>11}")
+    print("  por classe (milhoes):")
+    for classe, n in sorted(stats['classes'].items(), key=lambda item: -item[1]):
+        print(f"    {classe:<8} {n:>10} {n / stats['steps']:>7.1%}")
+
+
+# Escalonamento: bolhas do pipeline de 5 estagios sem e com o escalonador
+def executar_pipeline(asm):
+    from Scheduler import pipeline_cycles
+    simulador = MipsSimulator.Simulator(asm)
+    saida = simulador.run()
+    return saida, pipeline_cycles(simulador)
+
+
+def bench_scheduler():
+    from AssemblyVisitor import ABI_REGISTERS
+    sys.setrecursionlimit(10_000)
+    ok = True
+    programas = {**programas_codegen(), **PROGRAMAS_LACOS}
+    configuracoes = {
+        'padrao': {},
+        'otimizado': {'register_temps': True, 'abi': ABI_REGISTERS, 'peephole': True,
+                      'allocate_registers': True, 'fuse_branches': True},
+    }
+    for rotulo, opcoes in configuracoes.items():
+        print(f"  {rotulo}:")
+        print(f"    {'programa':<12} {'estaticas':>9} {'depois':>7} {'bolhas':>9} {'depois':>9}"
+              f" {'ciclos':>10} {'depois':>10}")
+        for nome, codigo in programas.items():
+            compiler = Compiler(schedule=True, **opcoes)
+            _, diagnostics, asm_escalonado = compiler.compile(codigo)
+            if asm_escalonado is None:
+                raise RuntimeError("; ".join(diagnostics))
+            saida, antes = executar_pipeline(compilar(codigo, **opcoes))
+            saida_escalonada, depois = executar_pipeline(asm_escalonado)
+            iguais = saida == saida_escalonada
+            ok = ok and iguais and depois['stalls'] <= antes['stalls']
+            relatorio = compiler.schedule_report
+            print(f"    {nome:<12} {relatorio['stalls_before']:>9} {relatorio['stalls_after']:>7}"
+                  f" {antes['stalls']:>9} {depois['stalls']:>9}"
+                  f" {antes['cycles']:>10} {depois['cycles']:>10}"
+                  f"{'' if iguais else '  SAIDAS DIFERENTES'}")
+    return ok
+
+
+# Delay slots: nop em todo slot x slots preenchidos (desvios atrasados)
+def bench_delay_slots():
+    from AssemblyVisitor import ABI_REGISTERS
+    from DelaySlots import DelaySlotFiller
+    sys.setrecursionlimit(10_000)
+    ok = True
+    programas = {**programas_codegen(), 'chamadas': PROGRAMA_CHAMADAS, **PROGRAMAS_LACOS}
+    configuracoes = {
+        'padrao': {},
+        'otimizado': {'register_temps': True, 'abi': ABI_REGISTERS, 'peephole': True,
+                      'allocate_registers': True, 'fuse_branches': True, 'schedule': True},
+    }
+    for rotulo, opcoes in configuracoes.items():
+        print(f"  {rotulo}:")
+        print(f"    {'programa':<12} {'slots':>6} {'preench.':>9} {'taxa':>6} {'so nops':>10}"
+              f" {'preenchido':>11} {'reducao':>8}")
+        for nome, codigo in programas.items():
+            saida = executar_mips(codigo, **opcoes)[0]
+            compiler = Compiler(delay_slots=True, **opcoes)
+            _, diagnostics, asm = compiler.compile(codigo)
+            if asm is None:
+                raise RuntimeError("; ".join(diagnostics))
+            asm_nops = compilar(codigo, delay_slots=DelaySlotFiller(fill=False), **opcoes)
+            saida_nops, passos_nops = MipsSimulator.run(asm_nops, delayed_branches=True)
+            saida_slots, passos_slots = MipsSimulator.run(asm, delayed_branches=True)
+            iguais = saida == saida_nops == saida_slots
+            ok = ok and iguais and passos_slots <= passos_nops
+            relatorio = compiler.delay_slot_report
+            print(f"    {nome:<12} {relatorio['slots']:>6} {relatorio['filled']:>9}"
+                  f" {relatorio['fill_rate']:>6.0%} {passos_nops:>10} {passos_slots:>11}"
+                  f" {1 - passos_slots / passos_nops:>8.1%}"
+                  f"{'' if iguais else '  SAIDAS DIFERENTES'}")
+    return ok
+
+
+# Interpretador: closures com slots x avaliador ingenuo (dicionarios por nome)
+class AvaliadorIngenuo:
+    # Referencia para comparacao: percorre a AST a cada execucao, com
+    # isinstance, e guarda variaveis em dicionarios (um novo por chamada)
+
+    class Retorno(Exception):
+        def __init__(self, valor):
+            self.valor = valor
+
+    def __init__(self, program):
+        self.program = program
+        self.funcoes = {item.name: item for item in program.items if isinstance(item, sa.Function)}
+        self.globais = {}
+        self.saida = []
+
+    def run(self):
+        for item in self.program.items:
+            if not isinstance(item, sa.Function):
+                self.globais[item.name] = self.avaliar(item.value, {})
+        self.chamar(self.funcoes['main'], {})
+        return ''.join(self.saida)
+
+    def chamar(self, funcao, env):
+        try:
+            self.executar(funcao.body, env)
+        except self.Retorno as retorno:
+            return retorno.valor
+        return None
+
+    def executar(self, node, env):
+        if isinstance(node, sa.Block):
+            for stmt in node.statements:
+                self.executar(stmt, env)
+        elif isinstance(node, (sa.VarDecl, sa.ConstDecl)):
+            env[node.name] = self.avaliar(node.value, env)
+        elif isinstance(node, sa.AssignStmt):
+            (env if node.name in env else self.globais)[node.name] = self.avaliar(node.value, env)
+        elif isinstance(node, sa.ExprStmt):
+            self.avaliar(node.expr, env)
+        elif isinstance(node, sa.ReturnStmt):
+            raise self.Retorno(None if node.value is None else self.avaliar(node.value, env))
+        elif isinstance(node, sa.IfStmt):
+            if self.avaliar(node.condition, env):
+                self.executar(node.then_block, env)
+            elif node.else_block is not None:
+                self.executar(node.else_block, env)
+        elif isinstance(node, sa.WhileStmt):
+            while self.avaliar(node.condition, env):
+                self.executar(node.body, env)
+
+    def avaliar(self, node, env):
+        if isinstance(node, sa.Literal):
+            return node.value if isinstance(node.value, str) else int(node.value)
+        if isinstance(node, sa.Identifier):
+            return env[node.name] if node.name in env else self.globais[node.name]
+        if isinstance(node, sa.UnaryExpr):
+            valor = self.avaliar(node.expr, env)
+            return wrap32(-valor) if node.op == '-' else valor ^ 1 if node.op == '!' else valor
+        if isinstance(node, sa.BinaryExpr):
+            a, b = self.avaliar(node.left, env), self.avaliar(node.right, env)
+            if node.op in COMPARACOES:
+                return int(COMPARACOES[node.op](a, b))
+            return wrap32(ARITMETICOS[node.op](a, b))
+        if node.name == 'print':
+            if node.args:
+                self.saida.append(Interpreter.show(self.avaliar(node.args[0], env)))
+            self.saida.append('\n')
+            return None
+        funcao = self.funcoes[node.name]
+        return self.chamar(funcao, {param.name: self.avaliar(arg, env)
+                                    for param, arg in zip(funcao.params, node.args)})
+
+
+# Recursao bem mais funda que o limite padrao do Python
+PROGRAMA_PROFUNDO = (
+    "fn down(n: int) int {\n"
+    "    if (n == 0) {\n"
+    "        return 0;\n"
+    "    }\n"
+    "    return down(n - 1) + 1;\n"
+    "}\n"
+    "fn main() void {\n"
+    "    print(down(5000));\n"
+    "    return;\n"
+    "}\n")
+
+
+def bench_interpreter(repeticoes=3):
+    # O avaliador ingenuo usa varios frames do Python por chamada do programa
+    sys.setrecursionlimit(100_000)
+    ok = True
+    programas = {**programas_codegen(), 'chamadas': PROGRAMA_CHAMADAS, **PROGRAMAS_LACOS,
+                 'milhoes': PROGRAMA_MILHOES, 'profundo': PROGRAMA_PROFUNDO}
+    print(f"  {'programa':<12} {'ingenuo (s)':>11} {'slots (s)':>10} {'aceleracao':>10} {'saida':>6}")
+    for nome, codigo in programas.items():
+        ast = Compiler().compile(codigo)[0]
+        referencia = MipsSimulator.run(compilar(codigo))[0] if nome != 'milhoes' else None
+        ingenuo, saida_ingenua = medir(lambda: AvaliadorIngenuo(ast).run(), repeticoes)
+        rapido, saida = medir(Interpreter.Interpreter(ast).run, repeticoes)
+        iguais = saida == saida_ingenua and referencia in (None, saida)
+        ok = ok and iguais
+        print(f"  {nome:<12} {ingenuo:>11.4f} {rapido:>10.4f} {ingenuo / rapido:>9.1f}x"
+              f" {'ok' if iguais else 'DIFERENTE':>6}")
+    return ok
+
+
+# Bytecode: VM de registradores x interpretador da AST x simulador MIPS
+def bench_bytecode(repeticoes=3):
+    sys.setrecursionlimit(10_000)
+    ok = True
+    programas = {**programas_codegen(), 'chamadas': PROGRAMA_CHAMADAS, **PROGRAMAS_LACOS,
+                 'milhoes': PROGRAMA_MILHOES}
+    print(f"  {'programa':<12} {'instrucoes':>10} {'bytes':>7} {'carga (ms)':>10} {'vm (s)':>8}"
+          f" {'ast (s)':>8} {'mips (s)':>9} {'saida':>6}")
+    for nome, codigo in programas.items():
+        ast = Compiler().compile(codigo)[0]
+        dados = Bytecode.compile_program(ast).to_bytes()
+        carga, modulo = medir(lambda: Bytecode.BytecodeModule.from_bytes(dados), repeticoes)
+        vm, saida = medir(Bytecode.VM(modulo).run, repeticoes)
+        interpretador, saida_ast = medir(Interpreter.Interpreter(ast).run, repeticoes)
+        programa = MipsSimulator.Program(compilar(codigo))
+        mips, (saida_mips, _) = medir(lambda: MipsSimulator.run(programa), 1)
+        iguais = saida == saida_ast == saida_mips
+        ok = ok and iguais
+        print(f"  {nome:<12} {modulo.instructions():>10} {len(dados):>7} {carga * 1000:>10.2f}"
+              f" {vm:>8.4f} {interpretador:>8.4f} {mips:>9.4f} {'ok' if iguais else 'DIFERENTE':>6}")
+    return ok
+
+
+BENCHMARKS = {
+    'parser_cache': bench_parser_cache,
+    'startup': bench_startup,
+    'lexer': bench_lexer,
+    'token_memory': bench_token_memory,
+    'parallel_lexer': bench_parallel_lexer,
+    'list_scaling': bench_list_scaling,
+    'symbol_table': bench_symbol_table,
+    'ast_arena': bench_ast_arena,
+    'register_temps': bench_register_temps,
+    'constant_folding': bench_constant_folding,
+    'peephole': bench_peephole,
+    'fuse_branches': bench_fuse_branches,
+    'loop_rotation': bench_loop_rotation,
+    'abi': bench_abi,
+    'register_allocation': bench_register_allocation,
+    'slot_coloring': bench_slot_coloring,
+    'string_pool': bench_string_pool,
+    'static_globals': bench_static_globals,
+    'dead_code': bench_dead_code,
+    'simulator': bench_simulator,
+    'scheduler': bench_scheduler,
+    'delay_slots': bench_delay_slots,
+    'interpreter': bench_interpreter,
+    'bytecode': bench_bytecode,
+}
+
+
+def main():
+    # Benchmarks que retornam False (ex.: crescimento superlinear) falham a execucao
+    falhas = []
+    nomes = sys.argv[1:] or list(BENCHMARKS)
+    for nome in nomes:
+        if nome not in BENCHMARKS:
+            print(f"Benchmark desconhecido: {nome}. Opcoes: {', '.join(BENCHMARKS)}")
+            continue
+        if BENCHMARKS[nome]() is False:
+            falhas.append(nome)
+        print()
+    if falhas:
+        print(f"Falharam: {', '.join(falhas)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
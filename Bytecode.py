@@ -0,0 +1,572 @@
+import struct
+import sys
+from array import array
+
+import SintaxeAbstrata as sa
+from ConstantFolding import wrap32
+from Interpreter import divide, remainder, show
+
+# Backend de bytecode: a AST vira instrucoes de tres operandos sobre
+# registradores (op, a, b, c), com opcodes inteiros densos, e uma VM as executa
+# num unico laco de despacho. Os registradores de uma funcao sao os slots do
+# frame: parametros, depois locais (na ordem de declaracao, como no
+# Interpreter) e por fim temporarios. Chamadas usam uma pilha explicita, entao
+# a recursao do programa nao depende da recursao do Python.
+#
+# Formas das instrucoes (r = registradores do frame, k = imediato):
+#   ADD a b c      r[a] = r[b] + r[c]        (o mesmo para SUB ... NE)
+#   ADDI a b k     r[a] = r[b] + k           (o mesmo para SUBI ... NEI)
+#   BLT b c t      se r[b] < r[c], vai para t (BLTI: r[b] < k)
+#   CALL a f b     r[a] = funcao f com argumentos em r[b], r[b+1], ...
+# A semantica segue o Interpreter (inteiros de 32 bits, divisao truncada).
+
+(ADD, SUB, MUL, DIV, REM, LT, GT, LE, GE, EQ, NE,
+ ADDI, SUBI, MULI, DIVI, REMI, LTI, GTI, LEI, GEI, EQI, NEI,
+ BLT, BGT, BLE, BGE, BEQ, BNE,
+ BLTI, BGTI, BLEI, BGEI, BEQI, BNEI,
+ NEG, NOT, MOVE, LOADI, LOADK, GETG, SETG,
+ JMP, JZ, CALL, RET, RETZ, PRINT, PRINTNL) = range(48)
+
+OPCODE_NAMES = ['ADD', 'SUB', 'MUL', 'DIV', 'REM', 'LT', 'GT', 'LE', 'GE', 'EQ', 'NE',
+                'ADDI', 'SUBI', 'MULI', 'DIVI', 'REMI', 'LTI', 'GTI', 'LEI', 'GEI', 'EQI', 'NEI',
+                'BLT', 'BGT', 'BLE', 'BGE', 'BEQ', 'BNE',
+                'BLTI', 'BGTI', 'BLEI', 'BGEI', 'BEQI', 'BNEI',
+                'NEG', 'NOT', 'MOVE', 'LOADI', 'LOADK', 'GETG', 'SETG',
+                'JMP', 'JZ', 'CALL', 'RET', 'RETZ', 'PRINT', 'PRINTNL']
+
+ARITHMETIC = {'+': ADD, '-': SUB, '*': MUL, '/': DIV, '%': REM,
+              '<': LT, '>': GT, '<=': LE, '>=': GE, '==': EQ, '!=': NE}
+IMMEDIATE = ADDI - ADD      # distancia de cada operacao para a forma com imediato
+BRANCH = {'<': BLT, '>': BGT, '<=': BLE, '>=': BGE, '==': BEQ, '!=': BNE}
+BRANCH_IMMEDIATE = BLTI - BLT
+NEGATE = {'<': '>=', '>': '<=', '<=': '>', '>=': '<', '==': '!=', '!=': '=='}
+SWAP = {'<': '>', '>': '<', '<=': '>=', '>=': '<=', '==': '==', '!=': '!='}
+
+MAGIC = b'ZBC1'
+ENTRY = '<init>'    # funcao que inicializa os globais e chama main
+
+class BytecodeError(Exception):
+    pass
+
+
+class BytecodeFunction:
+
+    __slots__ = ('name', 'params', 'registers', 'code')
+
+    def __init__(self, name, params, registers=0, code=None):
+        self.name = name
+        self.params = params
+        self.registers = registers
+        self.code = code if code is not None else []   # lista de (op, a, b, c)
+
+
+class BytecodeModule:
+    # Funcoes (indice 0 e ENTRY), constantes string e numero de globais
+
+    def __init__(self, functions, constants, globals_count):
+        self.functions = functions
+        self.constants = constants
+        self.globals_count = globals_count
+
+    def instructions(self):
+        return sum(len(function.code) for function in self.functions)
+
+    def disassemble(self):
+        linhas = []
+        for function in self.functions:
+            linhas.append(f"{function.name}: params={function.params} registers={function.registers}")
+            for pc, (op, a, b, c) in enumerate(function.code):
+                linhas.append(f"    {pc:4} {OPCODE_NAMES[op]:<8} {a} {b} {c}")
+        return "\n".join(linhas)
+
+    # Serializacao: cabecalho, constantes e funcoes; o codigo de cada funcao
+    # vai como um array de inteiros de 32 bits little-endian (4 por instrucao)
+
+    def to_bytes(self):
+        partes = [struct.pack('<4sIII', MAGIC, len(self.functions), len(self.constants),
+                              self.globals_count)]
+        for texto in self.constants:
+            dados = texto.encode('utf-8')
+            partes.append(struct.pack('<I', len(dados)) + dados)
+        for function in self.functions:
+            nome = function.name.encode('utf-8')
+            codigo = array('i', [x for instr in function.code for x in instr])
+            if sys.byteorder == 'big':
+                codigo.byteswap()
+            partes.append(struct.pack('<IIII', len(nome), function.params, function.registers,
+                                      len(function.code)) + nome + codigo.tobytes())
+        return b''.join(partes)
+
+    @classmethod
+    def from_bytes(cls, dados):
+        if dados[:4] != MAGIC:
+            raise BytecodeError("Arquivo de bytecode invalido")
+        _, n_funcoes, n_constantes, n_globais = struct.unpack_from('<4sIII', dados, 0)
+        posicao = struct.calcsize('<4sIII')
+        constantes = []
+        for _ in range(n_constantes):
+            tamanho, = struct.unpack_from('<I', dados, posicao)
+            posicao += 4
+            constantes.append(dados[posicao:posicao + tamanho].decode('utf-8'))
+            posicao += tamanho
+        funcoes = []
+        for _ in range(n_funcoes):
+            tamanho, params, registradores, n = struct.unpack_from('<IIII', dados, posicao)
+            posicao += 16
+            nome = dados[posicao:posicao + tamanho].decode('utf-8')
+            posicao += tamanho
+            codigo = array('i')
+            codigo.frombytes(dados[posicao:posicao + 16 * n])
+            if sys.byteorder == 'big':
+                codigo.byteswap()
+            posicao += 16 * n
+            instrucoes = [tuple(codigo[i:i + 4]) for i in range(0, len(codigo), 4)]
+            funcoes.append(BytecodeFunction(nome, params, registradores, instrucoes))
+        return cls(funcoes, constantes, n_globais)
+
+    def dump(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+
+class BytecodeCompiler:
+
+    def __init__(self):
+        self.functions = [BytecodeFunction(ENTRY, 0)]
+        self.function_index = {}        # nome -> indice em self.functions
+        self.constants = []
+        self.constant_index = {}
+        self.global_slots = {}
+        self.locals = {}                # nome -> registrador, na funcao atual
+        self.code = None
+        self.next = 0                   # primeiro registrador temporario livre
+        self.registers = 0
+
+    def compile(self, program):
+        for item in program.items:
+            if isinstance(item, sa.Function):
+                self.function_index[item.name] = len(self.functions)
+                self.functions.append(BytecodeFunction(item.name, len(item.params)))
+            else:
+                self.global_slots[item.name] = len(self.global_slots)
+        if 'main' not in self.function_index:
+            raise BytecodeError("Funcao 'main' nao encontrada")
+        for item in program.items:
+            if isinstance(item, sa.Function):
+                self.function(item)
+        # ENTRY: inicializadores dos globais, na ordem do programa, e main
+        self.begin({})
+        for item in program.items:
+            if not isinstance(item, sa.Function):
+                reg = self.expression(item.value)
+                self.emit(SETG, self.global_slots[item.name], reg, 0)
+                self.release(0)
+        self.emit(CALL, self.temp(), self.function_index['main'], 0)
+        self.emit(RETZ, 0, 0, 0)
+        self.end(self.functions[0])
+        return BytecodeModule(self.functions, self.constants, len(self.global_slots))
+
+    def begin(self, params):
+        self.code = []
+        self.locals = dict(params)
+        self.next = len(params)
+        self.registers = self.next
+
+    def end(self, function):
+        function.code = [tuple(instr) for instr in self.code]
+        function.registers = max(self.registers, 1)
+
+    def function(self, function):
+        bytecode = self.functions[self.function_index[function.name]]
+        self.begin({param.name: i for i, param in enumerate(function.params)})
+        self.block(function.body)
+        self.emit(RETZ, 0, 0, 0)
+        self.end(bytecode)
+
+    # Registradores
+
+    def temp(self):
+        reg = self.next
+        self.next += 1
+        self.registers = max(self.registers, self.next)
+        return reg
+
+    def release(self, mark):
+        # Libera os temporarios a partir de mark (nunca os locais)
+        self.next = max(mark, len(self.locals))
+
+    def local(self, name):
+        # Registrador de um local novo (ou o do mesmo nome, se redeclarado).
+        # Locais ficam abaixo dos temporarios, que sao todos livres entre comandos.
+        if name not in self.locals:
+            self.locals[name] = len(self.locals)
+            self.next = max(self.next, len(self.locals))
+            self.registers = max(self.registers, self.next)
+        return self.locals[name]
+
+    def emit(self, op, a, b, c):
+        self.code.append([op, a, b, c])
+        return len(self.code) - 1
+
+    def constant(self, texto):
+        if texto not in self.constant_index:
+            self.constant_index[texto] = len(self.constants)
+            self.constants.append(texto)
+        return self.constant_index[texto]
+
+    def global_index(self, name):
+        if name not in self.global_slots:
+            raise BytecodeError(f"Variavel '{name}' nao declarada")
+        return self.global_slots[name]
+
+    # Comandos
+
+    def block(self, block):
+        for stmt in block.statements:
+            self.statement(stmt)
+            self.release(0)
+
+    def statement(self, node):
+        if isinstance(node, sa.Block):
+            self.block(node)
+        elif isinstance(node, (sa.VarDecl, sa.ConstDecl)):
+            if node.name in self.locals:
+                self.expression(node.value, self.locals[node.name])
+            else:
+                # O valor pode usar um global de mesmo nome: avalia antes de criar o local
+                reg = self.expression(node.value)
+                self.release(0)
+                novo = self.local(node.name)
+                if novo != reg:
+                    self.emit(MOVE, novo, reg, 0)
+        elif isinstance(node, sa.AssignStmt):
+            if node.name in self.locals:
+                self.expression(node.value, self.locals[node.name])
+            else:
+                self.emit(SETG, self.global_index(node.name), self.expression(node.value), 0)
+        elif isinstance(node, sa.ExprStmt):
+            if isinstance(node.expr, sa.FunctionCall) and node.expr.name == 'print':
+                self.call(node.expr, None)
+            else:
+                self.expression(node.expr)
+        elif isinstance(node, sa.ReturnStmt):
+            if node.value is None:
+                self.emit(RETZ, 0, 0, 0)
+            else:
+                self.emit(RET, 0, self.expression(node.value), 0)
+        elif isinstance(node, sa.IfStmt):
+            salto = self.branch(node.condition, False)
+            self.block(node.then_block)
+            if node.else_block is None:
+                self.patch(salto, len(self.code))
+            else:
+                fim = self.emit(JMP, 0, 0, 0)
+                self.patch(salto, len(self.code))
+                self.block(node.else_block)
+                self.patch(fim, len(self.code))
+        elif isinstance(node, sa.WhileStmt):
+            # Laco rotacionado: um so desvio (condicional) por iteracao
+            teste = self.emit(JMP, 0, 0, 0)
+            corpo = len(self.code)
+            self.block(node.body)
+            self.patch(teste, len(self.code))
+            self.patch(self.branch(node.condition, True), corpo)
+        else:
+            raise BytecodeError(f"Comando desconhecido: {type(node).__name__}")
+
+    def patch(self, indice, destino):
+        # O alvo fica em c (desvios) ou em a (JMP)
+        instr = self.code[indice]
+        instr[1 if instr[0] == JMP else 3] = destino
+
+    def branch(self, condition, quando):
+        # Desvio (alvo a preencher) tomado quando condition for igual a quando
+        if isinstance(condition, sa.BinaryExpr) and condition.op in BRANCH:
+            op = condition.op if quando else NEGATE[condition.op]
+            esquerda, direita = condition.left, condition.right
+            if self.immediate(esquerda) is not None and self.immediate(direita) is None:
+                esquerda, direita, op = direita, esquerda, SWAP[op]
+            b = self.expression(esquerda)
+            k = self.immediate(direita)
+            if k is not None:
+                return self.emit(BRANCH[op] + BRANCH_IMMEDIATE, b, k, 0)
+            return self.emit(BRANCH[op], b, self.expression(direita), 0)
+        if isinstance(condition, sa.UnaryExpr) and condition.op == '!':
+            return self.branch(condition.expr, not quando)
+        reg = self.expression(condition)
+        if quando:
+            # Desvio se diferente de zero
+            return self.emit(BNEI, reg, 0, 0)
+        return self.emit(JZ, reg, 0, 0)
+
+    # Expressoes: devolvem o registrador com o valor (dest, se pedido)
+
+    def immediate(self, node):
+        if isinstance(node, sa.Literal) and isinstance(node.value, int):
+            return wrap32(int(node.value))
+        return None
+
+    def expression(self, node, dest=None):
+        if isinstance(node, sa.Identifier) and node.name in self.locals:
+            reg = self.locals[node.name]
+            if dest is not None and dest != reg:
+                self.emit(MOVE, dest, reg, 0)
+                return dest
+            return reg
+        mark = self.next
+        alvo = dest if dest is not None else self.temp()
+        if isinstance(node, sa.Literal):
+            if isinstance(node.value, str):
+                self.emit(LOADK, alvo, self.constant(node.value), 0)
+            else:
+                self.emit(LOADI, alvo, wrap32(int(node.value)), 0)
+        elif isinstance(node, sa.Identifier):
+            self.emit(GETG, alvo, self.global_index(node.name), 0)
+        elif isinstance(node, sa.BinaryExpr):
+            if node.op not in ARITHMETIC:
+                raise BytecodeError(f"Operador desconhecido: {node.op}")
+            b = self.expression(node.left)
+            k = self.immediate(node.right)
+            if k is not None:
+                self.emit(ARITHMETIC[node.op] + IMMEDIATE, alvo, b, k)
+            else:
+                self.emit(ARITHMETIC[node.op], alvo, b, self.expression(node.right))
+        elif isinstance(node, sa.UnaryExpr):
+            b = self.expression(node.expr)
+            if node.op == '-':
+                self.emit(NEG, alvo, b, 0)
+            elif node.op == '!':
+                self.emit(NOT, alvo, b, 0)
+            elif b != alvo:
+                self.emit(MOVE, alvo, b, 0)
+        elif isinstance(node, sa.FunctionCall):
+            self.call(node, alvo)
+        else:
+            raise BytecodeError(f"Expressao desconhecida: {type(node).__name__}")
+        # Temporarios das subexpressoes ja foram lidos; so alvo continua vivo
+        self.next = max(mark, alvo + 1) if dest is None else mark
+        return alvo
+
+    def call(self, node, alvo):
+        if node.name == 'print':
+            if node.args:
+                self.emit(PRINT, 0, self.expression(node.args[0]), 0)
+            else:
+                self.emit(PRINTNL, 0, 0, 0)
+            return
+        if node.name not in self.function_index:
+            raise BytecodeError(f"Funcao '{node.name}' nao declarada")
+        indice = self.function_index[node.name]
+        if len(node.args) != self.functions[indice].params:
+            raise BytecodeError(f"Funcao '{node.name}' espera {self.functions[indice].params} argumento(s)")
+        # Argumentos em registradores consecutivos a partir de base
+        base = self.next
+        for arg in node.args:
+            self.expression(arg, self.temp())
+        self.emit(CALL, alvo, indice, base)
+
+
+def compile_program(program):
+    return BytecodeCompiler().compile(program)
+
+
+class VM:
+
+    def __init__(self, module):
+        self.module = module
+        self.output = []
+        self.globals = [0] * module.globals_count
+        self.pools = [[] for _ in module.functions]     # frames livres por funcao
+
+    def run(self):
+        # Executa ENTRY (globais e main) e devolve a saida
+        del self.output[:]
+        self.execute(0)
+        return ''.join(self.output)
+
+    def execute(self, indice):
+        functions = self.module.functions
+        constants = self.module.constants
+        g = self.globals
+        saida = self.output
+        pools = self.pools
+        pilha = []      # (codigo, pc, registradores, destino, funcao) de quem chamou
+        # Opcodes como locais: o laco compara com variaveis locais, nao globais
+        (ADD, SUB, MUL, DIV, REM, LT, GT, LE, GE, EQ, NE,
+         ADDI, SUBI, MULI, DIVI, REMI, LTI, GTI, LEI, GEI, EQI, NEI,
+         BLT, BGT, BLE, BGE, BEQ, BNE,
+         BLTI, BGTI, BLEI, BGEI, BEQI, BNEI,
+         NEG, NOT, MOVE, LOADI, LOADK, GETG, SETG,
+         JMP, JZ, CALL, RET, RETZ, PRINT, PRINTNL) = range(len(OPCODE_NAMES))
+        dividir, resto, mostrar = divide, remainder, show
+        code = functions[indice].code
+        r = [0] * functions[indice].registers
+        pc = 0
+        while True:
+            op, a, b, c = code[pc]
+            pc += 1
+            # Ordem de frequencia medida nos programas do Benchmark
+            if op == ADDI:
+                r[a] = ((r[b] + c + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op == ADD:
+                r[a] = ((r[b] + r[c] + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op == BLTI:
+                if r[a] < b:
+                    pc = c
+            elif op == REMI:
+                x = r[b]
+                r[a] = x % c if x >= 0 and c > 0 else resto(x, c)
+            elif op == MUL:
+                r[a] = ((r[b] * r[c] + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op == SUB:
+                r[a] = ((r[b] - r[c] + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op == LOADI:
+                r[a] = b
+            elif op == MULI:
+                r[a] = ((r[b] * c + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op == SUBI:
+                r[a] = ((r[b] - c + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+            elif op == CALL:
+                funcao = functions[b]
+                pool = pools[b]
+                novo = pool.pop() if pool else [0] * funcao.registers
+                n = funcao.params
+                novo[:n] = r[c:c + n]
+                pilha.append((code, pc, r, a, indice))
+                code, pc, r, indice = funcao.code, 0, novo, b
+            elif op == RET or op == RETZ:
+                valor = r[b] if op == RET else 0
+                pools[indice].append(r)
+                if not pilha:
+                    return valor
+                code, pc, r, destino, indice = pilha.pop()
+                r[destino] = valor
+            elif op == MOVE:
+                r[a] = r[b]
+            elif op == BNEI:
+                if r[a] != b:
+                    pc = c
+            elif op == DIVI:
+                r[a] = dividir(r[b], c)
+            elif op == JMP:
+                pc = a
+            elif op == BLT:
+                if r[a] < r[b]:
+                    pc = c
+            elif op == BGTI:
+                if r[a] > b:
+                    pc = c
+            elif op == BEQI:
+                if r[a] == b:
+                    pc = c
+            elif op == BLE:
+                if r[a] <= r[b]:
+                    pc = c
+            elif op == BGEI:
+                if r[a] >= b:
+                    pc = c
+            elif op == GETG:
+                r[a] = g[b]
+            elif op < ADDI:
+                # Demais operacoes entre registradores
+                if op == DIV:
+                    r[a] = dividir(r[b], r[c])
+                elif op == REM:
+                    r[a] = resto(r[b], r[c])
+                elif op == LT:
+                    r[a] = r[b] < r[c]
+                elif op == GT:
+                    r[a] = r[b] > r[c]
+                elif op == LE:
+                    r[a] = r[b] <= r[c]
+                elif op == GE:
+                    r[a] = r[b] >= r[c]
+                elif op == EQ:
+                    r[a] = r[b] == r[c]
+                else:
+                    r[a] = r[b] != r[c]
+            elif op < BLT:
+                # Demais comparacoes com imediato
+                if op == LTI:
+                    r[a] = r[b] < c
+                elif op == GTI:
+                    r[a] = r[b] > c
+                elif op == LEI:
+                    r[a] = r[b] <= c
+                elif op == GEI:
+                    r[a] = r[b] >= c
+                elif op == EQI:
+                    r[a] = r[b] == c
+                else:
+                    r[a] = r[b] != c
+            elif op < NEG:
+                # Demais desvios
+                if op == BGT:
+                    if r[a] > r[b]:
+                        pc = c
+                elif op == BGE:
+                    if r[a] >= r[b]:
+                        pc = c
+                elif op == BEQ:
+                    if r[a] == r[b]:
+                        pc = c
+                elif op == BNE:
+                    if r[a] != r[b]:
+                        pc = c
+                elif r[a] <= b:     # BLEI
+                    pc = c
+            elif op == JZ:
+                if not r[a]:
+                    pc = c
+            elif op == SETG:
+                g[a] = r[b]
+            elif op == PRINT:
+                saida.append(mostrar(r[b]))
+                saida.append('\n')
+            elif op == PRINTNL:
+                saida.append('\n')
+            elif op == LOADK:
+                r[a] = constants[b]
+            elif op == NEG:
+                r[a] = ((0x80000000 - r[b]) & 0xFFFFFFFF) - 0x80000000
+            elif op == NOT:
+                r[a] = r[b] ^ 1
+            else:
+                raise BytecodeError(f"Opcode invalido: {op}")
+
+
+def run(program):
+    # Compila a AST para bytecode, executa e devolve a saida
+    return VM(compile_program(program)).run()
+
+
+def main():
+    from ExpressionLanguageParser import parse, INPUT_PADRAO
+    argumentos = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    entrada = argumentos[0] if argumentos else INPUT_PADRAO
+    if entrada.endswith('.zbc'):
+        module = BytecodeModule.load(entrada)
+    else:
+        with open(entrada, "r", encoding="utf-8") as f:
+            result = parse(f.read())
+        if result is None:
+            print("Erro no parsing do codigo")
+            return
+        module = compile_program(result)
+    if '--dis' in sys.argv:
+        print(module.disassemble())
+    if '--dump' in sys.argv:
+        destino = argumentos[1] if len(argumentos) > 1 else 'programa.zbc'
+        module.dump(destino)
+        print(f"# {module.instructions()} instrucoes gravadas em {destino}")
+        return
+    print(VM(module).run(), end='')
+
+
+if __name__ == "__main__":
+    main()
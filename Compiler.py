@@ -0,0 +1,145 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ExpressionLanguageLex import new_lexer
+from ExpressionLanguageParser import new_parser, syntax_error_message
+from SemanticVisitor import SemanticVisitor
+from ConstantFolding import fold_constants
+from DeadCode import eliminate_dead_code
+from AssemblyVisitor import AssemblyVisitor, ABI_STACK, ABI_REGISTERS
+
+
+class Compiler:
+    # Sessao de compilacao: lexer, parser e tabelas de simbolos sao da instancia.
+    # Uma instancia atende uma compilacao por vez; use uma por thread.
+
+    def __init__(self, lexer_backend=None, verbose=False, register_temps=False,
+                 fold_constants=False, peephole=None, fuse_branches=False,
+                 rotate_loops=False, abi=ABI_STACK, allocate_registers=False,
+                 color_slots=False, merge_strings=False, static_globals=False,
+                 dead_code=False, schedule=False, delay_slots=False):
+        self.verbose = verbose
+        self.register_temps = register_temps
+        self.fold_constants = fold_constants
+        self.folding = None
+        # True, lista de regras (Peephole.RULES) ou None
+        self.peephole = peephole
+        self.peephole_report = None
+        self.fuse_branches = fuse_branches
+        self.rotate_loops = rotate_loops
+        self.abi = abi
+        self.allocate_registers = allocate_registers
+        self.color_slots = color_slots
+        # funcao -> (bytes do frame sem e com coloracao de slots)
+        self.frame_report = None
+        self.merge_strings = merge_strings
+        # literais, textos distintos, sufixos aproveitados e bytes de .data
+        self.string_report = None
+        self.static_globals = static_globals
+        # dead_code: remove funcoes e globais inalcancaveis a partir de main
+        self.dead_code = dead_code
+        self.dead_code_report = None
+        # schedule: escalonamento por bloco basico; bolhas antes e depois
+        self.schedule = schedule
+        self.schedule_report = None
+        # delay_slots: saida para desvios atrasados; slots, preenchidos e taxa
+        self.delay_slots = delay_slots
+        self.delay_slot_report = None
+        self.lexer = new_lexer(lexer_backend)
+        self.parser = new_parser(self.syntax_error)
+        self.diagnostics = []
+
+    def syntax_error(self, p):
+        message = syntax_error_message(p)
+        self.diagnostics.append(message)
+        if self.verbose:
+            print(message)
+
+    def compile(self, source):
+        # Devolve (ast, diagnostics, asm); asm e None se houver erros
+        self.diagnostics = []
+        self.lexer.lineno = 1
+        ast = self.parser.parse(source, lexer=self.lexer)
+        if ast is None or self.diagnostics:
+            if ast is None and not self.diagnostics:
+                self.diagnostics.append("Erro: programa nao foi reconhecido pelo parser.")
+            return ast, self.diagnostics, None
+
+        semantic = SemanticVisitor(verbose=self.verbose)
+        ast.accept(semantic)
+        self.diagnostics.extend(semantic.diagnostics)
+        if semantic.getnerros() > 0:
+            return ast, self.diagnostics, None
+
+        if self.fold_constants:
+            # Reescreve a AST no lugar; contagens ficam em self.folding
+            self.folding = fold_constants(ast)
+
+        if self.dead_code:
+            # Depois do dobramento: consts propagados podem ter ficado sem uso
+            self.dead_code_report = eliminate_dead_code(ast).report()
+
+        assembly = AssemblyVisitor(register_temps=self.register_temps, peephole=self.peephole,
+                                   fuse_branches=self.fuse_branches,
+                                   rotate_loops=self.rotate_loops, abi=self.abi,
+                                   allocate_registers=self.allocate_registers,
+                                   color_slots=self.color_slots,
+                                   merge_strings=self.merge_strings,
+                                   static_globals=self.static_globals,
+                                   schedule=self.schedule,
+                                   delay_slots=self.delay_slots)
+        ast.accept(assembly)
+        asm = assembly.get_code()
+        self.frame_report = assembly.frame_sizes
+        self.string_report = assembly.strings.report()
+        if assembly.peephole is not None:
+            self.peephole_report = assembly.peephole.report()
+        if assembly.scheduler is not None:
+            self.schedule_report = assembly.scheduler.report()
+        if assembly.delay_slots is not None:
+            self.delay_slot_report = assembly.delay_slots.report()
+        return ast, self.diagnostics, asm
+
+
+def compile_many(sources, workers=4, lexer_backend=None):
+    # Compila varias fontes num pool de threads, com um Compiler por thread
+    local = threading.local()
+
+    def compile_one(source):
+        if not hasattr(local, 'compiler'):
+            local.compiler = Compiler(lexer_backend)
+        ast, diagnostics, asm = local.compiler.compile(source)
+        return ast, list(diagnostics), asm
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(compile_one, sources))
+
+
+def main():
+    import sys
+    from ExpressionLanguageLex import INPUT_PADRAO
+    arquivos = [arg for arg in sys.argv[1:] if not arg.startswith('--')] or [INPUT_PADRAO]
+    compiler = Compiler(verbose=True, register_temps='--registers' in sys.argv,
+                        fold_constants='--fold' in sys.argv,
+                        peephole='--peephole' in sys.argv or None,
+                        fuse_branches='--fuse-branches' in sys.argv,
+                        rotate_loops='--rotate-loops' in sys.argv,
+                        abi=ABI_REGISTERS if '--register-abi' in sys.argv else ABI_STACK,
+                        allocate_registers='--allocate-registers' in sys.argv,
+                        color_slots='--color-slots' in sys.argv,
+                        merge_strings='--merge-strings' in sys.argv,
+                        static_globals='--static-globals' in sys.argv,
+                        dead_code='--dead-code' in sys.argv,
+                        schedule='--schedule' in sys.argv,
+                        delay_slots='--delay-slots' in sys.argv)
+    for arquivo in arquivos:
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            _, diagnostics, asm = compiler.compile(f.read())
+        if asm is None:
+            print(f"Foram encontrados {len(diagnostics)} erro(s) em {arquivo}")
+        else:
+            print(asm)
+
+
+if __name__ == "__main__":
+    main()
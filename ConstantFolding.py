@@ -0,0 +1,284 @@
+from AbstractVisitor import AbstractVisitor
+from ScopedTable import ScopedTable
+import SintaxeAbstrata as sa
+
+# Passo de otimizacao entre SemanticVisitor e AssemblyVisitor: dobra
+# subexpressoes constantes, propaga valores de `const` e aplica identidades
+# algebricas. Os visit* de expressao devolvem o no (possivelmente novo); os de
+# comando reescrevem os filhos no lugar.
+
+# Aritmetica inteira de 32 bits, como no codigo MIPS gerado
+INT_MIN = -2 ** 31
+
+
+def wrap32(value):
+    return (value - INT_MIN) % 2 ** 32 + INT_MIN
+
+
+def div_trunc(a, b):
+    # Divisao de Zig (@divTrunc) e do MIPS: trunca em direcao a zero
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+def rem_trunc(a, b):
+    # Resto de Zig (@rem): tem o sinal do dividendo
+    return a - b * div_trunc(a, b)
+
+
+ARITMETICOS = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': div_trunc,
+    '%': rem_trunc,
+}
+
+COMPARACOES = {
+    '<': lambda a, b: a < b,
+    '>': lambda a, b: a > b,
+    '<=': lambda a, b: a <= b,
+    '>=': lambda a, b: a >= b,
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+}
+
+
+def is_int(node):
+    return isinstance(node, sa.Literal) and isinstance(node.value, int) \
+        and not isinstance(node.value, bool)
+
+
+def is_const(node):
+    # Literais que o passo sabe avaliar (inteiros e booleanos)
+    return isinstance(node, sa.Literal) and isinstance(node.value, int)
+
+
+def is_pure(node):
+    # Sem chamadas: pode ser descartada (x * 0) sem mudar o programa
+    if isinstance(node, sa.BinaryExpr):
+        return is_pure(node.left) and is_pure(node.right)
+    if isinstance(node, sa.UnaryExpr):
+        return is_pure(node.expr)
+    return not isinstance(node, sa.FunctionCall)
+
+
+def declares(block):
+    # Blocos nao abrem escopo: uma declaracao num ramo e visivel depois dele
+    for stmt in block.statements:
+        if isinstance(stmt, sa.VarDecl):
+            return True
+        if isinstance(stmt, sa.IfStmt):
+            if declares(stmt.then_block) or (stmt.else_block is not None and declares(stmt.else_block)):
+                return True
+        elif isinstance(stmt, sa.WhileStmt) and declares(stmt.body):
+            return True
+    return False
+
+
+def evaluate(node, constants):
+    # Valor de node em tempo de compilacao (int, bool ou str), ou None se
+    # depender da execucao. constants: nome -> valor dos globais imutaveis
+    if isinstance(node, sa.Literal):
+        return node.value if isinstance(node.value, (int, str)) else None
+    if isinstance(node, sa.Identifier):
+        return constants.get(node.name)
+    if isinstance(node, sa.UnaryExpr):
+        value = evaluate(node.expr, constants)
+        inteiro = isinstance(value, int) and not isinstance(value, bool)
+        if node.op == '+' and inteiro:
+            return value
+        if node.op == '-' and inteiro:
+            return wrap32(-value)
+        if node.op == '!' and isinstance(value, bool):
+            return not value
+        return None
+    if isinstance(node, sa.BinaryExpr):
+        a = evaluate(node.left, constants)
+        b = evaluate(node.right, constants)
+        if not isinstance(a, int) or not isinstance(b, int):
+            return None
+        if node.op in COMPARACOES:
+            return COMPARACOES[node.op](a, b)
+        if node.op in ARITMETICOS and not isinstance(a, bool) and not isinstance(b, bool) \
+                and not (node.op in ('/', '%') and b == 0):
+            return wrap32(ARITMETICOS[node.op](a, b))
+    return None
+
+
+class ConstantFolder(AbstractVisitor):
+
+    def __init__(self):
+        # nome -> Literal do const, ou None para variaveis/parametros que o sombreiam
+        self.constants = ScopedTable()
+        self.constants.beginScope('global')
+        self.folded = 0         # operacoes avaliadas em tempo de compilacao
+        self.propagated = 0     # usos de const substituidos pelo valor
+        self.simplified = 0     # identidades algebricas aplicadas
+        self.branches = 0       # if/while com condicao constante eliminados
+
+    def report(self):
+        return {'folded': self.folded, 'propagated': self.propagated,
+                'simplified': self.simplified, 'branches': self.branches}
+
+    def visitProgram(self, program):
+        for item in program.items:
+            item.accept(self)
+        return program
+
+    def visitConstDecl(self, constDecl):
+        constDecl.value = constDecl.value.accept(self)
+        value = constDecl.value
+        self.constants.bind(constDecl.name, value if is_const(value) else None)
+
+    def visitVarDecl(self, varDecl):
+        varDecl.value = varDecl.value.accept(self)
+        self.constants.bind(varDecl.name, None)
+
+    def visitFunction(self, function):
+        self.constants.bind(function.name, None)
+        self.constants.beginScope(function.name)
+        for param in function.params:
+            param.accept(self)
+        function.body.accept(self)
+        self.constants.endScope()
+
+    def visitParam(self, param):
+        self.constants.bind(param.name, None)
+
+    def visitBlock(self, block):
+        statements = []
+        for stmt in block.statements:
+            result = stmt.accept(self)
+            if result is None:
+                statements.append(stmt)
+            else:
+                # if/while com condicao constante: o ramo vivo entra no lugar
+                statements.extend(result)
+        block.statements = statements
+
+    def visitExprStmt(self, exprStmt):
+        exprStmt.expr = exprStmt.expr.accept(self)
+
+    def visitAssignStmt(self, assignStmt):
+        assignStmt.value = assignStmt.value.accept(self)
+
+    def visitReturnStmt(self, returnStmt):
+        if returnStmt.value is not None:
+            returnStmt.value = returnStmt.value.accept(self)
+
+    def visitIfStmt(self, ifStmt):
+        ifStmt.condition = ifStmt.condition.accept(self)
+        ifStmt.then_block.accept(self)
+        if ifStmt.else_block is not None:
+            ifStmt.else_block.accept(self)
+
+        condition = ifStmt.condition
+        if not isinstance(condition, sa.Literal) or not isinstance(condition.value, bool):
+            return None
+        vivo, morto = ifStmt.then_block, ifStmt.else_block
+        if not condition.value:
+            vivo, morto = morto, vivo
+        if morto is not None and declares(morto):
+            return None
+        self.branches += 1
+        return vivo.statements if vivo is not None else []
+
+    def visitWhileStmt(self, whileStmt):
+        whileStmt.condition = whileStmt.condition.accept(self)
+        whileStmt.body.accept(self)
+        condition = whileStmt.condition
+        if isinstance(condition, sa.Literal) and condition.value is False \
+                and not declares(whileStmt.body):
+            self.branches += 1
+            return []
+        return None
+
+    def visitBinaryExpr(self, binaryExpr):
+        left = binaryExpr.left = binaryExpr.left.accept(self)
+        right = binaryExpr.right = binaryExpr.right.accept(self)
+        op = binaryExpr.op
+
+        if is_const(left) and is_const(right):
+            a, b = left.value, right.value
+            if op in COMPARACOES:
+                self.folded += 1
+                return sa.Literal(COMPARACOES[op](a, b))
+            if op in ARITMETICOS and is_int(left) and is_int(right) \
+                    and not (op in ('/', '%') and b == 0):
+                self.folded += 1
+                return sa.Literal(wrap32(ARITMETICOS[op](a, b)))
+            return binaryExpr
+
+        # Identidades: x+0, 0+x, x-0, x*1, 1*x, x/1 -> x;  x*0, 0*x -> 0
+        if is_int(right):
+            if (right.value == 0 and op in ('+', '-')) or (right.value == 1 and op in ('*', '/')):
+                self.simplified += 1
+                return left
+            if right.value == 0 and op == '*' and is_pure(left):
+                self.simplified += 1
+                return right
+        if is_int(left):
+            if (left.value == 0 and op == '+') or (left.value == 1 and op == '*'):
+                self.simplified += 1
+                return right
+            if left.value == 0 and op == '*' and is_pure(right):
+                self.simplified += 1
+                return left
+        return binaryExpr
+
+    def visitUnaryExpr(self, unaryExpr):
+        operand = unaryExpr.expr = unaryExpr.expr.accept(self)
+        op = unaryExpr.op
+        if op == '+':
+            self.simplified += 1
+            return operand
+        if op == '-' and is_int(operand):
+            self.folded += 1
+            return sa.Literal(wrap32(-operand.value))
+        if op == '!' and isinstance(operand, sa.Literal) and isinstance(operand.value, bool):
+            self.folded += 1
+            return sa.Literal(not operand.value)
+        if isinstance(operand, sa.UnaryExpr) and operand.op == op and op in ('-', '!'):
+            # -(-x) e !!x
+            self.simplified += 1
+            return operand.expr
+        return unaryExpr
+
+    def visitLiteral(self, literal):
+        return literal
+
+    def visitIdentifier(self, identifier):
+        value = self.constants.lookup(identifier.name)
+        if value is None:
+            return identifier
+        self.propagated += 1
+        return sa.Literal(value.value)
+
+    def visitFunctionCall(self, functionCall):
+        functionCall.args = [arg.accept(self) for arg in functionCall.args]
+        return functionCall
+
+
+def fold_constants(program):
+    # Otimiza program no lugar e devolve o ConstantFolder com as contagens
+    folder = ConstantFolder()
+    program.accept(folder)
+    return folder
+
+
+def main():
+    from ExpressionLanguageParser import parse, INPUT_PADRAO
+    with open(INPUT_PADRAO, "r") as f:
+        result = parse(f.read())
+    if result is not None:
+        folder = fold_constants(result)
+        result.print()
+        print()
+        print(folder.report())
+    else:
+        print("Erro no parsing do codigo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import SintaxeAbstrata as sa
+
+# Eliminacao de funcoes e globais mortos, entre SemanticVisitor e
+# AssemblyVisitor. O grafo liga cada item do programa (funcao ou global) aos
+# nomes que ele chama ou referencia; sobrevive o que e alcancavel a partir de
+# main e dos inicializadores de globais com chamadas (que executam antes de
+# main). Literais string dos itens removidos deixam de ir para o .data porque
+# o codegen nunca os visita.
+
+
+def references(node):
+    # Nomes de funcoes e variaveis usados dentro de node. Um local com o mesmo
+    # nome de um global conta como uso do global (conservador).
+    nomes = set()
+    for n in sa.walk(node):
+        if isinstance(n, (sa.Identifier, sa.FunctionCall, sa.AssignStmt)):
+            nomes.add(n.name)
+    return nomes
+
+
+def has_call(node):
+    return any(isinstance(n, sa.FunctionCall) for n in sa.walk(node))
+
+
+class DeadCodeReport:
+
+    def __init__(self):
+        self.functions = []     # nomes das funcoes removidas
+        self.globals = []       # nomes das constantes e variaveis globais removidas
+        self.strings = 0        # literais string que sumiram com elas
+        self.nodes = 0          # nos da AST removidos
+
+    def report(self):
+        return {'functions': list(self.functions), 'globals': list(self.globals),
+                'strings': self.strings, 'nodes': self.nodes}
+
+
+def eliminate_dead_code(program, root='main'):
+    # Remove de program.items o que nao e alcancavel; devolve o DeadCodeReport
+    resultado = DeadCodeReport()
+    itens = {item.name: item for item in program.items}
+    if root not in itens:
+        return resultado
+
+    raizes = [root] + [item.name for item in program.items
+                       if not isinstance(item, sa.Function) and has_call(item.value)]
+    vivos = set()
+    pendentes = list(raizes)
+    while pendentes:
+        nome = pendentes.pop()
+        if nome in vivos or nome not in itens:
+            continue
+        vivos.add(nome)
+        pendentes.extend(references(itens[nome]) - vivos)
+
+    mantidos = []
+    for item in program.items:
+        if item.name in vivos:
+            mantidos.append(item)
+            continue
+        if isinstance(item, sa.Function):
+            resultado.functions.append(item.name)
+        else:
+            resultado.globals.append(item.name)
+        for n in sa.walk(item):
+            resultado.nodes += 1
+            if isinstance(n, sa.Literal) and isinstance(n.value, str):
+                resultado.strings += 1
+    program.items = mantidos
+    return resultado
+
+
+def main():
+    from ExpressionLanguageParser import parse, INPUT_PADRAO
+    with open(INPUT_PADRAO, "r") as f:
+        result = parse(f.read())
+    if result is not None:
+        removidos = eliminate_dead_code(result)
+        result.print()
+        print()
+        print(removidos.report())
+    else:
+        print("Erro no parsing do codigo")
+
+
+if __name__ == "__main__":
+    main()
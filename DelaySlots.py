@@ -0,0 +1,103 @@
+from Peephole import parse, BRANCHES, JUMPS
+from Scheduler import effects, independent, stall_cycles, IMMEDIATE, THREE_REG, WINDOW
+
+# Modo com delay slots (MIPS real ou MARS com "delayed branching"): a
+# instrucao logo depois de j, b, jal, jr e dos desvios condicionais executa
+# antes do desvio acontecer. Roda por ultimo em get_code(), sobre as listas de
+# instrucoes, e poe em cada slot uma instrucao anterior do mesmo bloco que nao
+# interfere no desvio nem nas instrucoes que ela pula; sem candidata, nop.
+
+TRANSFERS = BRANCHES | JUMPS | {'jal', 'jr'}
+RA = '$ra'
+
+
+def fits_16_bits(texto):
+    try:
+        return -32768 <= int(texto, 0) <= 65535
+    except ValueError:
+        return False
+
+
+def single_instruction(instr):
+    # Pseudo-instrucoes que o montador expande em duas nao cabem num slot
+    op, args = instr
+    if op in THREE_REG:
+        return all(a.startswith('$') for a in args)
+    if op in ('move', 'mflo', 'mfhi', 'lui'):
+        return True
+    if op in IMMEDIATE:
+        return fits_16_bits(args[2])
+    if op == 'li':
+        return fits_16_bits(args[1])
+    if op in ('lw', 'sw'):
+        deslocamento, _, base = args[1].partition('(')
+        return bool(base) and fits_16_bits(deslocamento or '0')
+    if op in ('div', 'mult'):
+        return len(args) == 2
+    return False
+
+
+class DelaySlotFiller:
+
+    def __init__(self, fill=True):
+        # fill=False: so nops (a traducao ingenua, para comparacao)
+        self.fill_slots = fill
+        self.stats = {'slots': 0, 'filled': 0, 'nops': 0}
+
+    def fill(self, *listas):
+        for lista in listas:
+            self.fill_list(lista)
+        return self.stats
+
+    def fill_list(self, code):
+        saida = []
+        inicio = 0      # primeira posicao de saida que ainda pode ir para um slot
+        for line in code:
+            instr = parse(line)
+            if instr is None or instr[0] not in TRANSFERS:
+                saida.append(line)
+                if instr is None or effects(instr) is None or instr[0] == 'syscall':
+                    inicio = len(saida)
+                continue
+            k = self.candidate(saida, inicio, instr) if self.fill_slots else None
+            self.stats['slots'] += 1
+            if k is None:
+                slot = '    nop'
+                self.stats['nops'] += 1
+            else:
+                slot = saida.pop(k)
+                self.stats['filled'] += 1
+            saida.append(line)
+            saida.append(slot)
+            inicio = len(saida)
+        code[:] = saida
+
+    def candidate(self, saida, inicio, desvio):
+        # Indice da instrucao mais proxima do desvio que pode ir para o slot
+        # (procura ate WINDOW instrucoes para tras). Tirar uma instrucao do meio
+        # pode deixar um lw colado no seu uso; essa bolha custaria o mesmo que
+        # o nop, entao a candidata tambem nao pode aumentar as bolhas do bloco.
+        lidos = effects(desvio)[0]
+        base = max(inicio, len(saida) - WINDOW)
+        trecho = [parse(line) for line in saida[base:]]
+        bolhas = sum(stall_cycles(trecho + [desvio, ('nop', [])]))
+        for k in range(len(saida) - 1, base - 1, -1):
+            instr = trecho[k - base]
+            if instr[0] == 'nop' or not single_instruction(instr):
+                continue
+            lidos_k, escritos_k = effects(instr)
+            if escritos_k & lidos:
+                continue
+            if desvio[0] == 'jal' and RA in lidos_k | escritos_k:
+                continue    # jal escreve $ra antes do slot executar
+            if not all(independent(instr, outra) for outra in trecho[k - base + 1:]):
+                continue
+            resto = trecho[:k - base] + trecho[k - base + 1:]
+            if sum(stall_cycles(resto + [desvio, instr])) <= bolhas:
+                return k
+        return None
+
+    def report(self):
+        relatorio = dict(self.stats)
+        relatorio['fill_rate'] = self.stats['filled'] / self.stats['slots'] if self.stats['slots'] else 0.0
+        return relatorio
@@ -1,3 +1,6 @@
+import os
+import re
+
 import ply.lex as lex
 
 # Lista de nomes de tokens
@@ -253,40 +256,60 @@ def t_C_STRING(t):
     t.value = t.value[2:-1]
     return t
 
+ESCAPES_STRING = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', '"': '"', '0': '\0'}
+ESCAPE = re.compile(r'\\(.)')
+
+
+def _escape(m):
+    c = m.group(1)
+    return ESCAPES_STRING.get(c, m.group(0))
+
+
+def decodificar_string(texto):
+    # Uma unica passada (um '\\' decodificado nao forma outro escape);
+    # sequencias desconhecidas ficam como estao
+    if '\\' not in texto:
+        return texto
+    return ESCAPE.sub(_escape, texto)
+
+
 def t_STRING(t):
     r'"([^"\\]|\\.)*"'
-    t.value = t.value[1:-1]
-    t.value = t.value.replace('\\n', '\n')
-    t.value = t.value.replace('\\t', '\t')
-    t.value = t.value.replace('\\r', '\r')
-    t.value = t.value.replace('\\\\', '\\')
-    t.value = t.value.replace('\\"', '"')
-    t.value = t.value.replace('\\0', '\0')
+    t.value = decodificar_string(t.value[1:-1])
     return t
 
 # Caracteres
+ESCAPES_CHAR = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', "'": "'", '0': '\0'}
+
+
+def converter_caractere(texto):
+    if len(texto) == 2 and texto[0] == '\\':
+        return ESCAPES_CHAR.get(texto[1], texto[1])
+    return texto
+
+
 def t_CHARACTER(t):
     r"'([^'\\]|\\.)'"
-    t.value = t.value[1:-1]
-    if len(t.value) == 2 and t.value[0] == '\\':
-        escapes = {'n': '\n', 't': '\t', 'r': '\r', '\\': '\\', "'": "'", '0': '\0'}
-        t.value = escapes.get(t.value[1], t.value[1])
+    t.value = converter_caractere(t.value[1:-1])
     return t
 
 # Números
-def t_NUMBER(t):
-    r'0[xX][0-9A-Fa-f_]+|0[bB][01_]+|0[oO][0-7_]+|[0-9][0-9_]*(\.[0-9][0-9_]*)?([eE][+-]?[0-9][0-9_]*)?'
-    raw = t.value.replace('_', '')
+def converter_numero(texto):
+    raw = texto.replace('_', '')
     if raw.startswith(('0x', '0X')):
-        t.value = int(raw, 16)
+        return int(raw, 16)
     elif raw.startswith(('0b', '0B')):
-        t.value = int(raw, 2)
+        return int(raw, 2)
     elif raw.startswith(('0o', '0O')):
-        t.value = int(raw, 8)
+        return int(raw, 8)
     elif '.' in raw or 'e' in raw or 'E' in raw:
-        t.value = float(raw)
-    else:
-        t.value = int(raw)
+        return float(raw)
+    return int(raw)
+
+
+def t_NUMBER(t):
+    r'0[xX][0-9A-Fa-f_]+|0[bB][01_]+|0[oO][0-7_]+|[0-9][0-9_]*(\.[0-9][0-9_]*)?([eE][+-]?[0-9][0-9_]*)?'
+    t.value = converter_numero(t.value)
     return t
 
 # Identificadores e palavras reservadas
@@ -308,14 +331,65 @@ def t_error(t):
     print(f"Caractere ilegal '{t.value[0]}' na linha {t.lexer.lineno}")
     t.lexer.skip(1)
 
-# Construir o lexer
-lexer = lex.lex()
+# Arquivo de exemplo, relativo a este modulo (independe do diretorio atual)
+INPUT_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'input1.zig')
+
+# Backend do analisador lexico: 'ply' (padrao), 'scanner' (ExpressionLanguageScanner)
+# 'buffer' (TokenBuffer, tokens compactos com valores preguicosos) ou 'parallel'
+# (ParallelLex, pedacos analisados em ZIG_LEX_WORKERS processos)
+LEXER_BACKEND = os.environ.get('ZIG_LEXER', 'ply')
+LEXER_BACKENDS = ('ply', 'scanner', 'buffer', 'parallel')
+
+_lexers = {}
+
+
+# Construir o lexer (somente no primeiro uso)
+def build_lexer(backend=None):
+    backend = backend or LEXER_BACKEND
+    if backend == 'ply':
+        return lex.lex()
+    if backend == 'scanner':
+        from ExpressionLanguageScanner import ScannerLexer
+        return ScannerLexer()
+    if backend == 'buffer':
+        from TokenBuffer import BufferLexer
+        return BufferLexer()
+    if backend == 'parallel':
+        from ParallelLex import ParallelLexer
+        return ParallelLexer()
+    raise ValueError(f"Backend lexico desconhecido '{backend}'. Opcoes: {', '.join(LEXER_BACKENDS)}")
+
+
+def get_lexer(backend=None):
+    backend = backend or LEXER_BACKEND
+    if backend not in _lexers:
+        _lexers[backend] = build_lexer(backend)
+    return _lexers[backend]
+
+
+def new_lexer(backend=None):
+    # Lexer com estado proprio (uma sessao de compilacao); o do PLY e clonado
+    # do lexer ja construido, sem refazer a reflexao sobre as regras
+    backend = backend or LEXER_BACKEND
+    if backend == 'ply':
+        lexer = get_lexer('ply').clone()
+        lexer.lineno = 1
+        return lexer
+    return build_lexer(backend)
+
+
+def __getattr__(name):
+    # Mantem compatibilidade com "from ExpressionLanguageLex import lexer"
+    if name == 'lexer':
+        return get_lexer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Código de teste
-f = open("input1.zig", "r")
-code = f.read()
 
 if __name__ == "__main__":
+    with open(INPUT_PADRAO, "r") as f:
+        code = f.read()
+    lexer = get_lexer()
+
     print("\n" + "=" * 100)
     print(" " * 30 + "ANALISADOR LEXICO - LINGUAGEM ZIG")
     print("=" * 100)
@@ -1,11 +1,20 @@
+import copy
+import hashlib
 import logging
+import os
+import sys
+import tempfile
+import threading
 import ply.yacc as yacc
-from ExpressionLanguageLex import tokens, lexer
+from ExpressionLanguageLex import tokens, get_lexer, new_lexer, INPUT_PADRAO
 import SintaxeAbstrata as sa
 
-arquivos_zig = []
-isFine = True
 QUIET_PLY = True
+# Diretorio das tabelas LALR em cache (None = padrao do usuario)
+CACHE_DIR = os.environ.get('ZIG_PARSER_CACHE')
+
+_parser = None
+_parser_lock = threading.Lock()
 
 # Precedência de operadores
 precedence = (
@@ -27,8 +36,10 @@ def p_program(p):
 def p_items(p):
     '''items : items item
              | item'''
+    # Anexa na propria lista: copiar a cada reducao tornaria a analise O(N^2)
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -106,7 +117,8 @@ def p_params(p):
     '''params : params COMMA param
               | param'''
     if len(p) == 4:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -132,7 +144,8 @@ def p_stmts(p):
     '''stmts : stmts stmt
              | stmt'''
     if len(p) == 3:
-        p[0] = p[1] + [p[2]]
+        p[1].append(p[2])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -256,7 +269,8 @@ def p_args(p):
     '''args : args COMMA expression
             | expression'''
     if len(p) == 4:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
     else:
         p[0] = [p[1]]
 
@@ -266,23 +280,107 @@ def p_empty(p):
     p[0] = None
 
 
-def p_error(p):
-    global isFine
+def syntax_error_message(p):
     if p:
-        print(f"Erro sintático próximo a '{p.value}' na linha {p.lineno}")
-    else:
-        print("Erro sintático no fim do arquivo")
-    isFine = False
+        return f"Erro sintático próximo a '{p.value}' na linha {p.lineno}"
+    return "Erro sintático no fim do arquivo"
 
-def build_parser():
+
+def p_error(p):
+    print(syntax_error_message(p))
+
+
+def grammar_hash():
+    # Chave das tabelas: muda sempre que a gramatica ou a precedencia mudam
+    h = hashlib.sha256()
+    h.update(yacc.__tabversion__.encode())
+    h.update(repr(precedence).encode())
+    h.update(' '.join(tokens).encode())
+    for name, func in sorted(globals().items()):
+        if name.startswith('p_') and callable(func):
+            h.update(name.encode())
+            h.update((func.__doc__ or '').encode())
+    return h.hexdigest()[:16]
+
+
+def cache_dir():
+    candidates = [CACHE_DIR] if CACHE_DIR else []
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    candidates.append(os.path.join(base, 'lft-zig'))
+    candidates.append(os.path.join(tempfile.gettempdir(), 'lft-zig'))
+    for path in candidates:
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError:
+            continue
+        if os.access(path, os.W_OK):
+            return path
+    return None
+
+
+def table_path(directory=None):
+    directory = directory or cache_dir()
+    if directory is None:
+        return None
+    return os.path.join(directory, f'parsetab-{grammar_hash()}.pickle')
+
+
+def build_parser(directory=None):
+    # Nunca escreve no diretorio do modulo (funciona em instalacao somente-leitura)
+    options = {'start': 'program', 'debug': False, 'write_tables': False}
     if QUIET_PLY:
-        return yacc.yacc(start='program', errorlog=yacc.NullLogger())
-    return yacc.yacc(start='program')
+        options['errorlog'] = yacc.NullLogger()
+
+    path = table_path(directory)
+    if path is None:
+        return yacc.yacc(**options)
+
+    if os.path.exists(path):
+        try:
+            return yacc.yacc(picklefile=path, **options)
+        except Exception:
+            pass  # Tabela corrompida: gera novamente
+
+    # Gera num arquivo temporario e renomeia, para nao expor tabela incompleta;
+    # o nome e unico por processo e thread (o PLY le o arquivo se ele existir)
+    tmp = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    parser = yacc.yacc(picklefile=tmp, **options)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return parser
+
+
+def get_parser():
+    # Um unico parser por processo; o lock evita que threads (compile_many)
+    # gerem as tabelas ao mesmo tempo
+    global _parser
+    if _parser is None:
+        with _parser_lock:
+            if _parser is None:
+                _parser = build_parser()
+    return _parser
+
+
+def new_parser(errorfunc=None):
+    # Copia do parser do processo: tabelas compartilhadas, estado de parse proprio.
+    # errorfunc substitui p_error (ex.: para coletar diagnosticos por sessao)
+    parser = copy.copy(get_parser())
+    if errorfunc is not None:
+        parser.errorfunc = errorfunc
+    return parser
 
 
 def parse(data):
-    parser = build_parser()
-    return parser.parse(data, lexer=lexer)
+    return get_parser().parse(data, lexer=get_lexer())
+
+
+def parse_file(path):
+    # Analisa o arquivo mapeado em memoria, sem copiar o fonte para uma str
+    from TokenBuffer import TokenBuffer, BufferLexer
+    with TokenBuffer.from_file(path) as buffer:
+        return get_parser().parse(lexer=BufferLexer(buffer))
 
 
 def print_result(result):
@@ -293,24 +391,28 @@ def print_result(result):
         print(result)
 
 
-def main():
-    global isFine
+def main(arquivos=None):
+    arquivos = sys.argv[1:] if arquivos is None else arquivos
     logging.basicConfig(filename='logSintatico.txt', level=logging.INFO, filemode='w')
 
-    if arquivos_zig:
-        for arquivo in arquivos_zig:
-            isFine = True
+    if arquivos:
+        for arquivo in arquivos:
+            erros = []
+
+            def registrar_erro(p):
+                p_error(p)
+                erros.append(syntax_error_message(p))
+
             print(f"-----------Analise Sintatica do arquivo: {arquivo}-----------")
             logging.info(f"-----------Analise Sintatica do arquivo: {arquivo}-----------")
 
             with open(arquivo, 'r', encoding='utf-8') as f:
-                lexer.input(f.read())
-                result = build_parser().parse(debug=0)
+                result = new_parser(registrar_erro).parse(f.read(), lexer=new_lexer(), debug=0)
 
             print_result(result)
             logging.info(result)
 
-            if isFine:
+            if not erros:
                 print("Analise sintatica realizada com sucesso!")
                 logging.info("Analise sintatica realizada com sucesso!")
             else:
@@ -319,8 +421,8 @@ def main():
 
             print("\n")
     else:
-        f = open("input1.zig", "r")
-        result = parse(f.read())
+        with open(INPUT_PADRAO, "r") as f:
+            result = parse(f.read())
         if result is not None:
             print_result(result)
         else:
@@ -0,0 +1,127 @@
+import re
+
+import ExpressionLanguageLex as lx
+
+# Analisador lexico alternativo ao PLY: um unico regex compilado, despacho pelo
+# indice do grupo que casou e classificacao de palavras reservadas por tabela.
+# Produz a mesma sequencia (tipo, valor, linha) que ExpressionLanguageLex.
+
+# Grupos na mesma ordem das regras-funcao do PLY (a primeira alternativa vence)
+(ESPACO, NEWLINE, COMMENT_BLOCK, COMMENT, IDENTIFIER_ESCAPED, C_STRING, STRING,
+ CHARACTER, NUMBER, IDENTIFIER, OPERADOR, ERRO) = range(1, 13)
+
+
+def regras_operadores():
+    # Regras-string do PLY, ordenadas como o PLY ordena (regex mais longo primeiro)
+    regras = [(nome[2:], regex) for nome, regex in vars(lx).items()
+              if nome.startswith('t_') and isinstance(regex, str) and nome != 't_ignore']
+    regras.sort(key=lambda regra: len(regra[1]), reverse=True)
+    return regras
+
+
+def tabela_operadores(regras):
+    # Texto do operador -> tipo; em empate (ex.: '&'), vale a primeira regra
+    tabela = {}
+    for tipo, regex in regras:
+        tabela.setdefault(re.sub(r'\\(.)', r'\1', regex), tipo)
+    return tabela
+
+
+_REGRAS = regras_operadores()
+OPERADORES = tabela_operadores(_REGRAS)
+RESERVADAS = lx.reserved
+
+SCANNER = re.compile('|'.join([
+    r'([ \t]+)',
+    r'(\n+)',
+    r'(/\*[\s\S]*?\*/)',
+    r'(//.*)',
+    r'(@"(?:[^"\\]|\\.)+")',
+    r'(c"(?:[^"\\]|\\.)*")',
+    r'("(?:[^"\\]|\\.)*")',
+    r"('(?:[^'\\]|\\.)')",
+    r'(0[xX][0-9A-Fa-f_]+|0[bB][01_]+|0[oO][0-7_]+|[0-9][0-9_]*(?:\.[0-9][0-9_]*)?(?:[eE][+-]?[0-9][0-9_]*)?)',
+    r'([a-zA-Z_][a-zA-Z_0-9]*)',
+    '(' + '|'.join(regex for _, regex in _REGRAS) + ')',
+    r'([\s\S])',
+]))
+
+def scan(data, lineno=1, posicao=0):
+    # Gera (tipo, valor, linha, posicao) para cada token de data
+    reservadas = RESERVADAS
+    operadores = OPERADORES
+    for m in SCANNER.finditer(data, posicao):
+        grupo = m.lastindex
+        if grupo == IDENTIFIER:
+            texto = m.group(grupo)
+            yield reservadas.get(texto, 'IDENTIFIER'), texto, lineno, m.start()
+        elif grupo == OPERADOR:
+            texto = m.group(grupo)
+            yield operadores[texto], texto, lineno, m.start()
+        elif grupo == ESPACO:
+            continue
+        elif grupo == NEWLINE:
+            lineno += m.end() - m.start()
+        elif grupo == NUMBER:
+            yield 'NUMBER', lx.converter_numero(m.group(grupo)), lineno, m.start()
+        elif grupo == STRING:
+            yield 'STRING', lx.decodificar_string(m.group(grupo)[1:-1]), lineno, m.start()
+        elif grupo == COMMENT:
+            continue
+        elif grupo == COMMENT_BLOCK:
+            lineno += m.group(grupo).count('\n')
+        elif grupo == CHARACTER:
+            yield 'CHARACTER', lx.converter_caractere(m.group(grupo)[1:-1]), lineno, m.start()
+        elif grupo == C_STRING:
+            yield 'C_STRING', m.group(grupo)[2:-1], lineno, m.start()
+        elif grupo == IDENTIFIER_ESCAPED:
+            yield 'IDENTIFIER_ESCAPED', m.group(grupo)[2:-1], lineno, m.start()
+        else:
+            print(f"Caractere ilegal '{m.group(grupo)}' na linha {lineno}")
+
+
+def tokenize(data):
+    # Lista (tipo, valor, linha), o mesmo formato usado para comparar com o PLY
+    return [(tipo, valor, linha) for tipo, valor, linha, _ in scan(data)]
+
+
+class Token:
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+class ScannerLexer:
+    # Interface minima do lexer do PLY usada por yacc: input(), token() e iteracao
+
+    def __init__(self):
+        self.lexdata = ''
+        self.lineno = 1
+        self._tokens = iter(())
+
+    def input(self, data):
+        self.lexdata = data
+        self.lineno = 1
+        self._tokens = scan(data)
+
+    def token(self):
+        for tipo, valor, linha, posicao in self._tokens:
+            self.lineno = linha
+            return Token(tipo, valor, linha, posicao)
+        return None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.token()
+        if tok is None:
+            raise StopIteration
+        return tok
@@ -0,0 +1,412 @@
+import sys
+
+import SintaxeAbstrata as sa
+from ConstantFolding import div_trunc, rem_trunc
+
+# Interpretador da AST (SintaxeAbstrata), para ver o que um programa imprime
+# sem gerar MIPS. Antes de executar, cada funcao e traduzida uma unica vez para
+# uma arvore de closures: cada no vira uma funcao Python que recebe o frame
+# (uma lista) e ja sabe o indice do slot de cada variavel, entao a execucao nao
+# procura nomes em dicionarios. Frames sao listas preallocadas e reaproveitadas
+# entre chamadas (um pool por funcao). Operandos que sao locais ou literais
+# entram direto no codigo da closure do operador (uma fabrica de closures por
+# formato, gerada uma vez e guardada em FABRICAS), e atribuicoes, return, if
+# e while com uma operacao binaria ficam numa closure so.
+#
+# A semantica segue o codigo gerado pelo AssemblyVisitor: inteiros de 32 bits
+# com overflow, divisao truncada, booleanos como 0/1, blocos sem escopo
+# proprio (uma declaracao num ramo vale depois dele) e print com '\n' no fim.
+
+RESULT = 0      # slot do frame com o valor de retorno; parametros comecam em 1
+
+# Cada chamada do programa usa alguns frames do Python (closures aninhadas);
+# run() sobe o limite de recursao para isto enquanto executa
+RECURSION_LIMIT = 1_000_000
+
+BIAS = 0x80000000
+MASK = 0xFFFFFFFF
+
+
+class InterpreterError(Exception):
+    pass
+
+
+def divide(a, b):
+    if a >= 0 and b > 0:
+        return a // b
+    if b == 0:
+        raise InterpreterError("Divisao por zero")
+    return ((div_trunc(a, b) + BIAS) & MASK) - BIAS
+
+
+def remainder(a, b):
+    if a >= 0 and b > 0:
+        return a % b
+    if b == 0:
+        raise InterpreterError("Divisao por zero")
+    return rem_trunc(a, b)
+
+
+def show(value):
+    return value if isinstance(value, str) else str(int(value))
+
+
+class FunctionCode:
+    # Funcao traduzida: corpo (closure), tamanho do frame e frames livres
+
+    __slots__ = ('name', 'params', 'size', 'body', 'pool')
+
+    def __init__(self, name, params):
+        self.name = name
+        self.params = params
+        self.size = params + 1
+        self.body = None
+        self.pool = []
+
+    def frame(self):
+        return self.pool.pop() if self.pool else [0] * self.size
+
+
+class Interpreter:
+
+    def __init__(self, program):
+        self.output = []
+        self.globals = []               # valores dos globais, por indice
+        self.global_slots = {}          # nome -> indice em self.globals
+        self.functions = {}             # nome -> FunctionCode
+        self.initializers = []          # (indice, closure) na ordem do programa
+        self.locals = None              # nome -> slot, na funcao sendo traduzida
+        for item in program.items:
+            if isinstance(item, sa.Function):
+                self.functions[item.name] = FunctionCode(item.name, len(item.params))
+            else:
+                self.global_slots[item.name] = len(self.globals)
+                self.globals.append(0)
+        for item in program.items:
+            if isinstance(item, sa.Function):
+                self.function(item)
+            else:
+                self.locals = {}
+                self.initializers.append((self.global_slots[item.name], self.expression(item.value)))
+
+    def run(self, entry='main'):
+        # Inicializa os globais, executa entry e devolve a saida
+        del self.output[:]
+        main = self.functions.get(entry)
+        if main is None:
+            raise InterpreterError(f"Funcao '{entry}' nao encontrada")
+        frame = [0]
+        limite = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(limite, RECURSION_LIMIT))
+        try:
+            for indice, valor in self.initializers:
+                self.globals[indice] = valor(frame)
+            main.body(main.frame())
+        except RecursionError:
+            raise InterpreterError("Recursao profunda demais") from None
+        finally:
+            sys.setrecursionlimit(limite)
+        return ''.join(self.output)
+
+    # Traducao
+
+    def function(self, function):
+        codigo = self.functions[function.name]
+        self.locals = {param.name: RESULT + 1 + i for i, param in enumerate(function.params)}
+        codigo.body = self.block(function.body)
+        codigo.size = 1 + len(self.locals)
+
+    def slot(self, name):
+        # Slot de um local novo (ou o do mesmo nome, se redeclarado)
+        if name not in self.locals:
+            self.locals[name] = RESULT + 1 + len(self.locals)
+        return self.locals[name]
+
+    def block(self, block):
+        comandos = tuple(self.statement(stmt) for stmt in block.statements)
+        if len(comandos) == 1:
+            return comandos[0]
+        if len(comandos) == 2:
+            primeiro, segundo = comandos
+
+            def executar(f):
+                return primeiro(f) or segundo(f)
+            return executar
+
+        def executar(f):
+            for comando in comandos:
+                if comando(f):
+                    return True
+        return executar
+
+    def statement(self, node):
+        # Comandos devolvem True quando executam um return
+        if isinstance(node, sa.Block):
+            return self.block(node)
+        if isinstance(node, (sa.VarDecl, sa.ConstDecl)):
+            if isinstance(node.value, sa.BinaryExpr):
+                kx, x, ky, y = self.operands(node.value)
+                return factory('store', node.value.op, kx, ky)(x, y, self.slot(node.name))
+            valor = self.expression(node.value)
+            return self.store(self.slot(node.name), None, valor)
+        if isinstance(node, sa.AssignStmt):
+            if isinstance(node.value, sa.BinaryExpr) and node.name in self.locals:
+                return self.binary('store', node.value, self.locals[node.name])
+            valor = self.expression(node.value)
+            if node.name in self.locals:
+                return self.store(self.locals[node.name], None, valor)
+            return self.store(None, self.global_index(node.name), valor)
+        if isinstance(node, sa.ExprStmt):
+            if isinstance(node.expr, sa.FunctionCall) and node.expr.name == 'print':
+                return self.print_call(node.expr)
+            expr = self.expression(node.expr)
+
+            def executar(f):
+                expr(f)
+            return executar
+        if isinstance(node, sa.ReturnStmt):
+            if node.value is None:
+                return lambda f: True
+            if isinstance(node.value, sa.BinaryExpr):
+                return self.binary('return', node.value)
+            valor = self.expression(node.value)
+
+            def executar(f):
+                f[RESULT] = valor(f)
+                return True
+            return executar
+        if isinstance(node, sa.IfStmt):
+            if isinstance(node.condition, sa.BinaryExpr):
+                kx, x, ky, y = self.operands(node.condition)
+                ramos = [self.block(node.then_block)]
+                if node.else_block is not None:
+                    ramos.append(self.block(node.else_block))
+                forma = 'if' if node.else_block is None else 'if_else'
+                return factory(forma, node.condition.op, kx, ky)(x, y, *ramos)
+            condicao = self.expression(node.condition)
+            entao = self.block(node.then_block)
+            if node.else_block is None:
+                def executar(f):
+                    if condicao(f):
+                        return entao(f)
+                return executar
+            senao = self.block(node.else_block)
+
+            def executar(f):
+                if condicao(f):
+                    return entao(f)
+                return senao(f)
+            return executar
+        if isinstance(node, sa.WhileStmt):
+            if isinstance(node.condition, sa.BinaryExpr):
+                kx, x, ky, y = self.operands(node.condition)
+                return factory('while', node.condition.op, kx, ky)(x, y, self.block(node.body))
+            condicao = self.expression(node.condition)
+            corpo = self.block(node.body)
+
+            def executar(f):
+                while condicao(f):
+                    if corpo(f):
+                        return True
+            return executar
+        raise InterpreterError(f"Comando desconhecido: {type(node).__name__}")
+
+    def store(self, local, indice, valor):
+        if local is not None:
+            def executar(f):
+                f[local] = valor(f)
+            return executar
+        g = self.globals
+
+        def executar(f):
+            g[indice] = valor(f)
+        return executar
+
+    def global_index(self, name):
+        if name not in self.global_slots:
+            raise InterpreterError(f"Variavel '{name}' nao declarada")
+        return self.global_slots[name]
+
+    def print_call(self, call):
+        saida = self.output
+        if not call.args:
+            return lambda f: saida.append('\n')
+        valor = self.expression(call.args[0])
+
+        def executar(f):
+            saida.append(show(valor(f)))
+            saida.append('\n')
+        return executar
+
+    def expression(self, node):
+        if isinstance(node, sa.Literal):
+            valor = node.value
+            valor = valor if isinstance(valor, str) else int(valor)
+            return lambda f: valor
+        if isinstance(node, sa.Identifier):
+            if node.name in self.locals:
+                k = self.locals[node.name]
+                return lambda f: f[k]
+            g, k = self.globals, self.global_index(node.name)
+            return lambda f: g[k]
+        if isinstance(node, sa.BinaryExpr):
+            return self.binary('value', node)
+        if isinstance(node, sa.UnaryExpr):
+            expr = self.expression(node.expr)
+            if node.op == '-':
+                return lambda f: ((BIAS - expr(f)) & MASK) - BIAS
+            if node.op == '!':
+                return lambda f: expr(f) ^ 1
+            return expr
+        if isinstance(node, sa.FunctionCall):
+            return self.call(node)
+        raise InterpreterError(f"Expressao desconhecida: {type(node).__name__}")
+
+    def binary(self, form, node, *extra):
+        # Closure da operacao binaria node na forma pedida (FORMS)
+        kx, x, ky, y = self.operands(node)
+        return factory(form, node.op, kx, ky)(x, y, *extra)
+
+    def operands(self, node):
+        return self.operand(node.left) + self.operand(node.right)
+
+    def operand(self, node):
+        if isinstance(node, sa.Identifier) and node.name in self.locals:
+            return 'local', self.locals[node.name]
+        if isinstance(node, sa.Literal) and isinstance(node.value, int):
+            return 'const', int(node.value)
+        return 'expr', self.expression(node)
+
+    def call(self, node):
+        if node.name == 'print':
+            executar = self.print_call(node)
+            return lambda f: executar(f)
+        codigo = self.functions.get(node.name)
+        if codigo is None:
+            raise InterpreterError(f"Funcao '{node.name}' nao declarada")
+        if len(node.args) != codigo.params:
+            raise InterpreterError(f"Funcao '{node.name}' espera {codigo.params} argumento(s)")
+        args = tuple(self.expression(arg) for arg in node.args)
+        pool = codigo.pool
+        if len(args) == 1:
+            a, = args
+
+            def chamar(f):
+                x = a(f)
+                frame = pool.pop() if pool else [0] * codigo.size
+                frame[RESULT] = 0
+                frame[1] = x
+                codigo.body(frame)
+                pool.append(frame)
+                return frame[RESULT]
+            return chamar
+        if len(args) == 2:
+            a, b = args
+
+            def chamar(f):
+                x, y = a(f), b(f)
+                frame = pool.pop() if pool else [0] * codigo.size
+                frame[RESULT] = 0
+                frame[1] = x
+                frame[2] = y
+                codigo.body(frame)
+                pool.append(frame)
+                return frame[RESULT]
+            return chamar
+
+        def chamar(f):
+            valores = [a(f) for a in args]
+            frame = pool.pop() if pool else [0] * codigo.size
+            frame[RESULT] = 0
+            frame[1:1 + len(valores)] = valores
+            codigo.body(frame)
+            pool.append(frame)
+            return frame[RESULT]
+        return chamar
+
+
+# Fabricas de closures. A expressao de cada operador e montada a partir do
+# formato dos operandos (local: f[x], literal: x, outra expressao: x(f)) e
+# inserida na forma pedida (valor, atribuicao a local, return, if ou while).
+# O return grava no slot RESULT (0).
+# Aritmetica volta para 32 bits com sinal; comparacoes devolvem bool (vale 0/1
+# nas contas, como o slt).
+
+OPERATORS = {
+    '+': '(({x} + {y} + 0x80000000) & 0xFFFFFFFF) - 0x80000000',
+    '-': '(({x} - {y} + 0x80000000) & 0xFFFFFFFF) - 0x80000000',
+    '*': '(({x} * {y} + 0x80000000) & 0xFFFFFFFF) - 0x80000000',
+    '/': 'divide({x}, {y})',
+    '%': 'remainder({x}, {y})',
+    '<': '{x} < {y}', '>': '{x} > {y}', '<=': '{x} <= {y}', '>=': '{x} >= {y}',
+    '==': '{x} == {y}', '!=': '{x} != {y}',
+}
+
+OPERANDS = {'local': 'f[{}]', 'const': '{}', 'expr': '{}(f)'}
+
+FORMS = {
+    'value': ("def fabrica(x, y):\n"
+              "    return lambda f: {e}\n"),
+    'store': ("def fabrica(x, y, k):\n"
+              "    def executar(f):\n"
+              "        f[k] = {e}\n"
+              "    return executar\n"),
+    'return': ("def fabrica(x, y):\n"
+               "    def executar(f):\n"
+               "        f[0] = {e}\n"
+               "        return True\n"
+               "    return executar\n"),
+    'if': ("def fabrica(x, y, entao):\n"
+           "    def executar(f):\n"
+           "        if {e}:\n"
+           "            return entao(f)\n"
+           "    return executar\n"),
+    'if_else': ("def fabrica(x, y, entao, senao):\n"
+                "    def executar(f):\n"
+                "        if {e}:\n"
+                "            return entao(f)\n"
+                "        return senao(f)\n"
+                "    return executar\n"),
+    'while': ("def fabrica(x, y, corpo):\n"
+              "    def executar(f):\n"
+              "        while {e}:\n"
+              "            if corpo(f):\n"
+              "                return True\n"
+              "    return executar\n"),
+}
+
+FABRICAS = {}   # (forma, operador, formato de x, formato de y) -> fabrica
+
+
+def factory(form, op, kx, ky):
+    chave = (form, op, kx, ky)
+    fabrica = FABRICAS.get(chave)
+    if fabrica is None:
+        if op not in OPERATORS:
+            raise InterpreterError(f"Operador desconhecido: {op}")
+        expr = OPERATORS[op].format(x=OPERANDS[kx].format('x'), y=OPERANDS[ky].format('y'))
+        namespace = {'divide': divide, 'remainder': remainder}
+        exec(FORMS[form].format(e=expr), namespace)
+        fabrica = FABRICAS[chave] = namespace['fabrica']
+    return fabrica
+
+
+def run(program, entry='main'):
+    # Executa a AST e devolve o que o programa imprime
+    return Interpreter(program).run(entry)
+
+
+def main():
+    import sys
+    from ExpressionLanguageParser import parse, INPUT_PADRAO
+    arquivos = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    with open(arquivos[0] if arquivos else INPUT_PADRAO, "r", encoding="utf-8") as f:
+        result = parse(f.read())
+    if result is not None:
+        print(run(result), end='')
+    else:
+        print("Erro no parsing do codigo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,561 @@
+import re
+import sys
+from array import array
+
+from Scheduler import pipeline_cycles
+
+# Simulador MIPS para o assembly gerado por AssemblyVisitor (formato do MARS).
+# Executa sem interface, captura a saida dos syscalls 1/4/10/11 e conta as
+# instrucoes executadas (cada linha de assembly conta como uma instrucao,
+# inclusive pseudo-instrucoes como li, la, move e blt), por opcode e classe.
+
+TEXT_BASE = 0x00400000
+DATA_BASE = 0x10010000
+STACK_TOP = 0x7FFFEFFC
+STACK_SIZE = 1 << 20
+STACK_BASE = STACK_TOP + 4 - STACK_SIZE
+
+REGISTERS = {
+    '$zero': 0, '$0': 0, '$at': 1, '$v0': 2, '$v1': 3,
+    '$a0': 4, '$a1': 5, '$a2': 6, '$a3': 7,
+    '$t0': 8, '$t1': 9, '$t2': 10, '$t3': 11, '$t4': 12, '$t5': 13, '$t6': 14, '$t7': 15,
+    '$s0': 16, '$s1': 17, '$s2': 18, '$s3': 19, '$s4': 20, '$s5': 21, '$s6': 22, '$s7': 23,
+    '$t8': 24, '$t9': 25, '$k0': 26, '$k1': 27, '$gp': 28, '$sp': 29, '$fp': 30, '$ra': 31,
+}
+SP, FP, RA, V0, A0 = 29, 30, 31, 2, 4
+
+ENDERECO = re.compile(r'^(-?\w*)\((\$\w+)\)$')
+ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '0': '\0', '\\': '\\', '"': '"'}
+
+MASK = 0xFFFFFFFF
+SIGN = 0x80000000
+END = -1    # proximo indice quando o programa termina
+
+# Desvios contados em Simulator.branches (condicionais) e Simulator.jumps (j/b)
+CONDITIONAL_BRANCHES = {'beq', 'bne', 'blt', 'ble', 'bgt', 'bge',
+                        'beqz', 'bnez', 'bltz', 'blez', 'bgtz', 'bgez'}
+JUMPS = {'j', 'b'}
+ZERO_BRANCHES = {'beqz': 'beq', 'bnez': 'bne', 'bltz': 'blt', 'blez': 'ble', 'bgtz': 'bgt', 'bgez': 'bge'}
+COMPARE = {'beq': '==', 'bne': '!=', 'blt': '<', 'ble': '<=', 'bgt': '>', 'bge': '>='}
+
+# Classe de cada opcode suportado, para as estatisticas
+OPCODE_CLASS = {}
+for _classe, _ops in (
+        ('alu', ('add', 'addu', 'sub', 'subu', 'and', 'or', 'xor', 'nor', 'slt', 'sltu',
+                 'sllv', 'srlv', 'srav', 'addi', 'addiu', 'andi', 'ori', 'xori', 'slti',
+                 'sltiu', 'sll', 'srl', 'sra', 'lui')),
+        ('muldiv', ('mul', 'mult', 'div', 'mflo', 'mfhi')),
+        ('move', ('move', 'li', 'la')),
+        ('load', ('lw',)),
+        ('store', ('sw',)),
+        ('branch', tuple(CONDITIONAL_BRANCHES)),
+        ('jump', tuple(JUMPS)),
+        ('call', ('jal', 'jr')),
+        ('syscall', ('syscall',)),
+        ('nop', ('nop',))):
+    for _op in _ops:
+        OPCODE_CLASS[_op] = _classe
+
+# Classes que encerram um bloco basico
+BLOCK_ENDS = {'branch', 'jump', 'call', 'syscall'}
+# Com desvios atrasados, estas executam a instrucao seguinte (delay slot) antes
+DELAYED = {'branch', 'jump', 'call'}
+
+IMMEDIATE_ALU = {'addi': 'add', 'addiu': 'add', 'andi': 'and', 'ori': 'or', 'xori': 'xor',
+                 'slti': 'slt', 'sltiu': 'sltu', 'sll': 'sll', 'srl': 'srl', 'sra': 'sra'}
+
+
+class SimulationError(Exception):
+    pass
+
+
+def to_signed(value):
+    value &= 0xFFFFFFFF
+    return value - 0x100000000 if value & 0x80000000 else value
+
+
+def words(data):
+    # bytes little-endian -> array de palavras com sinal
+    buffer = array('i', bytes(data) + bytes(-len(data) % 4))
+    if sys.byteorder == 'big':
+        buffer.byteswap()
+    return buffer
+
+
+def words_to_bytes(buffer):
+    if sys.byteorder == 'big':
+        buffer = array('i', buffer)
+        buffer.byteswap()
+    return buffer.tobytes()
+
+
+# Expressao Python de cada operacao da ULA sobre inteiros de 32 bits com sinal.
+# and/or/xor/nor de dois valores nesse intervalo ja ficam nele.
+_WRAP = '((({}) + 0x80000000) & 0xFFFFFFFF) - 0x80000000'
+ALU_SOURCE = {
+    'add': _WRAP.format('{x} + {y}'), 'addu': _WRAP.format('{x} + {y}'),
+    'sub': _WRAP.format('{x} - {y}'), 'subu': _WRAP.format('{x} - {y}'),
+    'mul': _WRAP.format('{x} * {y}'),
+    'and': '{x} & {y}', 'or': '{x} | {y}', 'xor': '{x} ^ {y}', 'nor': '~({x} | {y})',
+    'slt': '1 if {x} < {y} else 0',
+    'sltu': '1 if ({x} & 0xFFFFFFFF) < ({y} & 0xFFFFFFFF) else 0',
+    'sll': _WRAP.format('{x} << ({y} & 31)'), 'sllv': _WRAP.format('{x} << ({y} & 31)'),
+    'srl': _WRAP.format('({x} & 0xFFFFFFFF) >> ({y} & 31)'),
+    'srlv': _WRAP.format('({x} & 0xFFFFFFFF) >> ({y} & 31)'),
+    'sra': '{x} >> ({y} & 31)', 'srav': '{x} >> ({y} & 31)',
+}
+
+
+def divide(hilo, x, y):
+    # Divisao truncada (como no MIPS); divisor zero deixa hi/lo como estao
+    if y != 0:
+        q = abs(x) // abs(y)
+        q = q if (x >= 0) == (y >= 0) else -q
+        hilo[0], hilo[1] = to_signed(q), to_signed(x - q * y)
+
+
+def multiply(hilo, x, y):
+    produto = x * y
+    hilo[0], hilo[1] = to_signed(produto), to_signed(produto >> 32)
+
+
+def decode_asciiz(texto):
+    return re.sub(r'\\(.)', lambda m: ESCAPES.get(m.group(1), m.group(1)), texto)
+
+
+class Program:
+    # Resultado da montagem: instrucoes, rotulos e segmento de dados
+
+    def __init__(self, source):
+        self.instructions = []  # (opcode, [operandos], linha original)
+        self.labels = {}        # rotulo -> endereco
+        self.data = bytearray()
+        self._assemble(source)
+
+    def _assemble(self, source):
+        secao = '.text'
+        pendentes = []  # (.word com rotulo) resolvidos ao final
+        for linha in source.splitlines():
+            linha = linha.split('#', 1)[0].strip() if '"' not in linha else linha.strip()
+            if not linha:
+                continue
+            if linha in ('.data', '.text'):
+                secao = linha
+                continue
+            while True:
+                m = re.match(r'^([A-Za-z_][\w.]*):\s*(.*)$', linha)
+                if not m:
+                    break
+                rotulo, linha = m.group(1), m.group(2)
+                if secao == '.data':
+                    self.labels[rotulo] = DATA_BASE + len(self.data)
+                else:
+                    self.labels[rotulo] = TEXT_BASE + 4 * len(self.instructions)
+            if not linha:
+                continue
+            if secao == '.data':
+                self._directive(linha, pendentes)
+                continue
+            partes = linha.split(None, 1)
+            operandos = [o.strip() for o in partes[1].split(',')] if len(partes) > 1 else []
+            self.instructions.append((partes[0], operandos, linha))
+        for posicao, rotulo in pendentes:
+            self.data[posicao:posicao + 4] = (self.labels[rotulo] & 0xFFFFFFFF).to_bytes(4, 'little')
+
+    def _directive(self, linha, pendentes):
+        if linha.startswith('.word'):
+            while len(self.data) % 4:
+                self.data.append(0)
+            for valor in linha[len('.word'):].split(','):
+                valor = valor.strip()
+                if re.match(r'^-?\d+$', valor) or valor.lower().startswith(('0x', '-0x')):
+                    self.data += (int(valor, 0) & 0xFFFFFFFF).to_bytes(4, 'little')
+                else:
+                    pendentes.append((len(self.data), valor))
+                    self.data += bytes(4)
+        elif linha.startswith('.asciiz'):
+            texto = linha[len('.asciiz'):].strip()[1:-1]
+            self.data += decode_asciiz(texto).encode('utf-8') + b'\0'
+        elif linha.startswith('.ascii'):
+            texto = linha[len('.ascii'):].strip()[1:-1]
+            self.data += decode_asciiz(texto).encode('utf-8')
+        elif linha.startswith('.space'):
+            self.data += bytes(int(linha.split()[1], 0))
+        elif linha.startswith('.align'):
+            while len(self.data) % (1 << int(linha.split()[1])):
+                self.data.append(0)
+        else:
+            raise SimulationError(f"Diretiva nao suportada: {linha}")
+
+
+class Simulator:
+    # Traduz cada bloco basico do .text para uma funcao Python (gerada com exec
+    # na primeira vez que o bloco executa) que roda o bloco inteiro e devolve o
+    # indice do proximo. run() so despacha blocos; as contagens por instrucao
+    # saem de quantas vezes cada bloco executou, e desvios tomados sao contados
+    # no proprio desvio.
+
+    def __init__(self, source, max_steps=50_000_000, delayed_branches=False):
+        # delayed_branches: desvios, saltos, jal e jr tem delay slot (como o MARS
+        # com "delayed branching"); o bloco termina no slot
+        self.program = source if isinstance(source, Program) else Program(source)
+        self.max_steps = max_steps
+        self.delayed_branches = delayed_branches
+        self.regs = [0] * 32
+        self.regs[SP] = STACK_TOP
+        self.regs[FP] = STACK_TOP
+        self.hilo = [0, 0]          # lo, hi
+        self.data = words(self.program.data)
+        self.stack = array('i', bytes(STACK_SIZE))
+        self.output = []
+        n = len(self.program.instructions)
+        self.taken = [0] * n        # desvios condicionais tomados por instrucao
+        self.blocks = [None] * n    # indice de inicio -> funcao do bloco (traduzido sob demanda)
+        self.sizes = [0] * n        # indice do lider -> instrucoes no bloco
+        self.counts = [0] * n       # indice do lider -> execucoes do bloco
+        self.namespace = {
+            'r': self.regs, 'stack': self.stack, 'data': self.data, 'hl': self.hilo,
+            'taken': self.taken, 'counts': self.counts, 'load_word': self.load_word,
+            'store_word': self.store_word, 'syscall': self.syscall, 'jr': self.jump_register,
+            'div': divide, 'mult': multiply, 'wrap': to_signed,
+        }
+        self.leader = bytearray(n)
+        for i in self.leaders():
+            self.leader[i] = 1
+        self.hits = [0] * n
+        self.steps = 0
+        self.branches = 0
+        self.jumps = 0
+
+    # Memoria (palavras de 32 bits; lw/sw exigem alinhamento)
+
+    def _locate(self, address):
+        if DATA_BASE <= address < DATA_BASE + 4 * len(self.data):
+            return self.data, address - DATA_BASE
+        if STACK_BASE <= address < STACK_TOP + 4:
+            return self.stack, address - STACK_BASE
+        raise SimulationError(f"Acesso invalido a memoria: {address:#010x}")
+
+    def load_word(self, address):
+        if address % 4:
+            raise SimulationError(f"Endereco desalinhado: {address:#010x}")
+        buffer, i = self._locate(address)
+        return buffer[i >> 2]
+
+    def store_word(self, address, value):
+        if address % 4:
+            raise SimulationError(f"Endereco desalinhado: {address:#010x}")
+        buffer, i = self._locate(address)
+        buffer[i >> 2] = to_signed(value)
+
+    def load_byte(self, address):
+        buffer, i = self._locate(address)
+        return buffer[i >> 2].to_bytes(4, 'little', signed=True)[i & 3]
+
+    def read_string(self, address):
+        buffer, i = self._locate(address)
+        memoria = words_to_bytes(buffer)
+        fim = memoria.index(0, i)
+        return memoria[i:fim].decode('utf-8', 'replace')
+
+    # Operandos
+
+    def reg(self, nome):
+        try:
+            return REGISTERS[nome]
+        except KeyError:
+            raise SimulationError(f"Registrador desconhecido: {nome}") from None
+
+    def imm(self, texto):
+        if texto in self.program.labels:
+            return self.program.labels[texto]
+        try:
+            return int(texto, 0)
+        except ValueError:
+            raise SimulationError(f"Operando invalido: {texto}") from None
+
+    def target(self, rotulo):
+        if rotulo not in self.program.labels:
+            raise SimulationError(f"Rotulo indefinido: {rotulo}")
+        return (self.program.labels[rotulo] - TEXT_BASE) // 4
+
+    def jump_register(self, address):
+        destino = (address - TEXT_BASE) >> 2
+        return destino if 0 <= destino < len(self.blocks) else END
+
+    # Traducao
+
+    def leaders(self):
+        # Inicio de cada bloco basico: entrada, alvos de rotulo e a instrucao
+        # seguinte a qualquer desvio, salto, chamada ou syscall
+        n = len(self.program.instructions)
+        lideres = {0} if n else set()
+        for endereco in self.program.labels.values():
+            i = (endereco - TEXT_BASE) // 4
+            if TEXT_BASE <= endereco and 0 <= i < n:
+                lideres.add(i)
+        for i, (op, _, _) in enumerate(self.program.instructions):
+            classe = OPCODE_CLASS.get(op)
+            if classe in BLOCK_ENDS:
+                seguinte = i + 2 if self.delayed_branches and classe in DELAYED else i + 1
+                if seguinte < n:
+                    lideres.add(seguinte)
+        return lideres
+
+    def delayed(self, i):
+        # A instrucao i tem delay slot
+        return self.delayed_branches and OPCODE_CLASS.get(self.program.instructions[i][0]) in DELAYED
+
+    def _block_at(self, inicio):
+        # Traduz o bloco que comeca em inicio: vai ate o proximo lider ou ate a
+        # instrucao que encerra o bloco. Um inicio fora dos lideres (jr para o
+        # meio de um bloco) tambem funciona, com um bloco proprio.
+        instructions = self.program.instructions
+        fim = inicio + 1
+        while fim < len(instructions) and not self.leader[fim] \
+                and OPCODE_CLASS.get(instructions[fim - 1][0]) not in BLOCK_ENDS:
+            fim += 1
+        if self.delayed(fim - 1):
+            if fim >= len(instructions) or OPCODE_CLASS.get(instructions[fim][0]) in BLOCK_ENDS:
+                raise SimulationError(f"Delay slot invalido depois de: {instructions[fim - 1][2]}")
+            fim += 1    # o slot fica no bloco do desvio, mesmo que seja alvo de rotulo
+        fonte = '\n'.join(self._block_source(inicio, fim))
+        exec(compile(fonte, '<mips>', 'exec'), self.namespace)
+        self.blocks[inicio] = self.namespace.pop(f'b{inicio}')
+        return self.blocks[inicio]
+
+    def _block_source(self, inicio, fim):
+        linhas = [f"def b{inicio}():", f"    counts[{inicio}] += 1"]
+        self.sizes[inicio] = fim - inicio
+        for i in range(inicio, fim):
+            op, a, linha = self.program.instructions[i]
+            try:
+                codigo = self._instruction(i, op, a)
+                if self.delayed(i):
+                    codigo = self._delayed(i, codigo)
+                linhas.extend('    ' + c for c in codigo)
+            except (IndexError, AttributeError):
+                raise SimulationError(f"Operandos invalidos: {linha}") from None
+            if self.delayed(i):
+                return linhas
+        if OPCODE_CLASS.get(self.program.instructions[fim - 1][0]) not in BLOCK_ENDS:
+            linhas.append(f"    return {fim if fim < len(self.program.instructions) else END}")
+        return linhas
+
+    def _instruction(self, i, op, a):
+        # Linhas de Python que executam a instrucao i (r = registradores)
+        classe = OPCODE_CLASS.get(op)
+        if classe is None:
+            raise SimulationError(f"Instrucao nao suportada: {op}")
+        nxt = i + 1
+        if classe == 'branch':
+            s = f"r[{self.reg(a[0])}]"
+            if op in ZERO_BRANCHES:
+                op, y, rotulo = ZERO_BRANCHES[op], '0', a[1]
+            elif a[1].startswith('$'):
+                y, rotulo = f"r[{self.reg(a[1])}]", a[2]
+            else:
+                y, rotulo = str(to_signed(self.imm(a[1]))), a[2]
+            return [f"if {s} {COMPARE[op]} {y}:",
+                    f"    taken[{i}] += 1",
+                    f"    return {self.target(rotulo)}",
+                    f"return {nxt}"]
+        if op in ('j', 'b'):
+            return [f"return {self.target(a[0])}"]
+        if op == 'jal':
+            return [f"r[{RA}] = {TEXT_BASE + 4 * nxt}", f"return {self.target(a[0])}"]
+        if op == 'jr':
+            return [f"return jr(r[{self.reg(a[0])}])"]
+        if op == 'syscall':
+            return [f"return syscall({nxt})"]
+        if op == 'nop':
+            return []
+        if op in ('div', 'mult'):
+            return [f"{op}(hl, r[{self.reg(a[0])}], r[{self.reg(a[1])}])"]
+        if classe in ('load', 'store'):
+            return self._memory(op, a)
+
+        d = self.reg(a[0])
+        if d == 0:
+            return []   # escrita em $zero: sem efeito
+        if op in ('mflo', 'mfhi'):
+            return [f"r[{d}] = hl[{0 if op == 'mflo' else 1}]"]
+        if op == 'li' or (op == 'la' and not ENDERECO.match(a[1])):
+            return [f"r[{d}] = {to_signed(self.imm(a[1]))}"]
+        if op == 'lui':
+            return [f"r[{d}] = {to_signed(self.imm(a[1]) << 16)}"]
+        if op == 'la':
+            b, k = self._base_offset(a[1])
+            return [f"r[{d}] = wrap(r[{b}] + {k})"]
+        s = f"r[{self.reg(a[1])}]"
+        if op == 'move':
+            return [f"r[{d}] = {s}"]
+        if op in IMMEDIATE_ALU:
+            k = self.imm(a[2])
+            op, y = IMMEDIATE_ALU[op], str(k & 0xFFFF if op in ('andi', 'ori', 'xori') else k)
+        elif a[2].startswith('$'):
+            y = f"r[{self.reg(a[2])}]"
+        else:
+            y = str(self.imm(a[2]))
+        return [f"r[{d}] = {ALU_SOURCE[op].format(x=s, y=y)}"]
+
+    def _delayed(self, i, codigo):
+        # Codigo do desvio i seguido do slot i + 1: a condicao (ou o registrador
+        # do jr) e lida antes do slot, e o retorno acontece depois dele
+        op, a, _ = self.program.instructions[i + 1]
+        slot = self._instruction(i + 1, op, a)
+        depois = i + 2 if i + 2 < len(self.blocks) else END
+        classe = OPCODE_CLASS[self.program.instructions[i][0]]
+        if classe == 'branch':
+            condicao = codigo[0][len('if '):-1]
+            return ([f"_c = {condicao}"] + slot + ["if _c:"] + codigo[1:3] + [f"return {depois}"])
+        if codigo[-1].startswith('return jr('):
+            return [f"_d = {codigo[-1][len('return '):]}"] + slot + ["return _d"]
+        if self.program.instructions[i][0] == 'jal':
+            return [f"r[{RA}] = {TEXT_BASE + 4 * (i + 2)}"] + slot + codigo[1:]
+        return slot + codigo
+
+    def _base_offset(self, operando):
+        m = ENDERECO.match(operando)
+        return self.reg(m.group(2)), int(m.group(1), 0) if m.group(1) else 0
+
+    def _memory(self, op, a):
+        d = self.reg(a[0])
+        if not ENDERECO.match(a[1]):
+            # Rotulo (global): endereco fixo
+            endereco = self.imm(a[1])
+            if endereco % 4 == 0 and DATA_BASE <= endereco < DATA_BASE + 4 * len(self.data):
+                k = (endereco - DATA_BASE) >> 2
+                if op == 'sw':
+                    return [f"data[{k}] = r[{d}]"]
+                return [f"r[{d}] = data[{k}]"] if d else []
+            if op == 'sw':
+                return [f"store_word({endereco}, r[{d}])"]
+            return [f"{f'r[{d}] = ' if d else ''}load_word({endereco})"]
+        b, k = self._base_offset(a[1])
+        # _a: deslocamento dentro da pilha; fora dela (ou desalinhado) vai pelo caminho lento
+        linhas = [f"_a = r[{b}] - {STACK_BASE - k}"]
+        if op == 'sw':
+            return linhas + [f"if 0 <= _a < {STACK_SIZE} and not _a & 3: stack[_a >> 2] = r[{d}]",
+                             f"else: store_word(_a + {STACK_BASE}, r[{d}])"]
+        destino = f"r[{d}] = " if d else ''
+        return linhas + [f"{destino}stack[_a >> 2] if 0 <= _a < {STACK_SIZE} and not _a & 3 "
+                         f"else load_word(_a + {STACK_BASE})"]
+
+    # Execucao
+
+    def run(self):
+        blocks = self.blocks
+        sizes = self.sizes
+        restante = self.max_steps
+        pc = 0 if blocks else END
+        while pc >= 0:
+            bloco = blocks[pc]
+            if bloco is None:
+                bloco = self._block_at(pc)
+            restante -= sizes[pc]
+            if restante < 0:
+                self._count()
+                raise SimulationError(f"Limite de {self.max_steps} instrucoes excedido")
+            pc = bloco()
+        self._count()
+        return ''.join(self.output)
+
+    def _count(self):
+        hits = self.hits
+        for inicio, vezes in enumerate(self.counts):
+            if vezes:
+                for i in range(inicio, inicio + self.sizes[inicio]):
+                    hits[i] += vezes
+        self.counts[:] = [0] * len(self.counts)
+        self.steps = sum(hits)
+        opcodes = self.opcodes()
+        self.branches = sum(n for op, n in opcodes.items() if op in CONDITIONAL_BRANCHES)
+        self.jumps = sum(n for op, n in opcodes.items() if op in JUMPS)
+
+    def opcodes(self):
+        # opcode -> instrucoes executadas
+        contagem = {}
+        for (op, _, _), n in zip(self.program.instructions, self.hits):
+            if n:
+                contagem[op] = contagem.get(op, 0) + n
+        return contagem
+
+    def classes(self):
+        # classe (OPCODE_CLASS) -> instrucoes executadas
+        contagem = {}
+        for op, n in self.opcodes().items():
+            classe = OPCODE_CLASS[op]
+            contagem[classe] = contagem.get(classe, 0) + n
+        return contagem
+
+    def statistics(self):
+        classes = self.classes()
+        tomados = sum(self.taken)
+        return {'steps': self.steps, 'classes': classes, 'opcodes': self.opcodes(),
+                'loads': classes.get('load', 0), 'stores': classes.get('store', 0),
+                'branches_taken': tomados, 'branches_not_taken': self.branches - tomados,
+                'jumps': self.jumps}
+
+    def syscall(self, pc):
+        servico = self.regs[V0]
+        if servico == 1:
+            self.output.append(str(self.regs[A0]))
+        elif servico == 4:
+            self.output.append(self.read_string(self.regs[A0]))
+        elif servico == 11:
+            self.output.append(chr(self.regs[A0] & 0xFF))
+        elif servico == 10:
+            return END
+        else:
+            raise SimulationError(f"Syscall nao suportado: {servico}")
+        return pc if pc < len(self.blocks) else END
+
+
+def run(source, max_steps=50_000_000, delayed_branches=False):
+    # Executa o assembly e devolve (saida, instrucoes executadas)
+    simulator = Simulator(source, max_steps, delayed_branches)
+    output = simulator.run()
+    return output, simulator.steps
+
+
+def print_statistics(simulator):
+    stats = simulator.statistics()
+    print(f"# {stats['steps']} instrucoes executadas")
+    for classe, n in sorted(stats['classes'].items(), key=lambda item: -item[1]):
+        print(f"#   {classe:<8} {n:>10}  {n / stats['steps']:>6.1%}")
+    print(f"# loads {stats['loads']}  stores {stats['stores']}")
+    print(f"# desvios tomados {stats['branches_taken']}  nao tomados {stats['branches_not_taken']}"
+          f"  saltos {stats['jumps']}")
+    pipeline = pipeline_cycles(simulator)
+    if pipeline['instructions']:
+        print(f"# pipeline de 5 estagios: {pipeline['stalls']} bolhas, {pipeline['cycles']} ciclos"
+              f" (CPI {pipeline['cycles'] / pipeline['instructions']:.2f})")
+
+
+def main():
+    from Compiler import Compiler
+    from ExpressionLanguageLex import INPUT_PADRAO
+    arquivos = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    arquivo = arquivos[0] if arquivos else INPUT_PADRAO
+    with open(arquivo, 'r', encoding='utf-8') as f:
+        source = f.read()
+    if not arquivo.endswith('.zig'):
+        asm = source
+    else:
+        _, diagnostics, asm = Compiler(verbose=True, register_temps='--registers' in sys.argv,
+                                         schedule='--schedule' in sys.argv,
+                                         delay_slots='--delay-slots' in sys.argv).compile(source)
+        if asm is None:
+            return
+    simulator = Simulator(asm, delayed_branches='--delay-slots' in sys.argv)
+    print(simulator.run(), end='')
+    print()
+    if '--stats' in sys.argv:
+        print_statistics(simulator)
+    else:
+        print(f"# {simulator.steps} instrucoes executadas")
+
+
+if __name__ == "__main__":
+    main()
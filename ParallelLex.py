@@ -0,0 +1,143 @@
+import bisect
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import ExpressionLanguageLex as lx
+import ExpressionLanguageScanner as sc
+
+# Analise lexica em paralelo: o fonte e cortado em newlines seguros (fora de
+# comentarios /* */ e de literais), cada pedaco e analisado num processo e as
+# sequencias sao costuradas de volta com lineno/lexpos corrigidos.
+
+# Regioes em que um newline nao e fronteira segura. Mesmas regras do lexer, na
+# mesma ordem; em qualquer outro ponto os caracteres ' " / iniciam o mesmo token.
+OPACO = re.compile(r'/\*[\s\S]*?\*/|//.*|"(?:[^"\\]|\\.)*"|' + r"'(?:[^'\\]|\\.)'")
+
+# Abaixo deste tamanho o custo do pool supera o ganho
+TAMANHO_MINIMO = 64 * 1024
+
+WORKERS = int(os.environ.get('ZIG_LEX_WORKERS', '0')) or os.cpu_count() or 1
+
+
+def regioes_opacas(data):
+    # Regioes opacas que contem newline, e quantos newlines o lexer deixou de
+    # contar ate o fim de cada uma (newlines dentro de literais nao mudam lineno)
+    inicios = []
+    fins = []
+    ignorados = []
+    total = 0
+    for m in OPACO.finditer(data):
+        texto = m.group()
+        if '\n' in texto:
+            if texto[0] != '/':
+                total += texto.count('\n')
+            inicios.append(m.start())
+            fins.append(m.end())
+            ignorados.append(total)
+    return inicios, fins, ignorados
+
+
+def split_chunks(data, n):
+    # Devolve [(inicio, fim, lineno)] cobrindo data; cada corte fica logo apos
+    # um newline seguro e lineno e a linha do lexer no inicio do pedaco
+    if n <= 1 or not data:
+        return [(0, len(data), 1)]
+    inicios, fins, ignorados = regioes_opacas(data)
+    cortes = [0]
+    for k in range(1, n):
+        alvo = max(cortes[-1], len(data) * k // n)
+        while True:
+            p = data.find('\n', alvo)
+            if p < 0:
+                break
+            i = bisect.bisect_right(inicios, p) - 1
+            if i >= 0 and p < fins[i]:
+                alvo = fins[i]
+                continue
+            break
+        if p < 0:
+            break
+        if p + 1 > cortes[-1] and p + 1 < len(data):
+            cortes.append(p + 1)
+    cortes.append(len(data))
+
+    chunks = []
+    lineno = 1
+    for inicio, fim in zip(cortes, cortes[1:]):
+        i = bisect.bisect_right(fins, inicio) - 1
+        nao_contados = ignorados[i] if i >= 0 else 0
+        chunks.append((inicio, fim, 1 + data.count('\n', 0, inicio) - nao_contados))
+    return chunks
+
+
+_ply_lexer = None
+
+
+def serial_backend():
+    # Backend dos pedacos quando nenhum e pedido: o do lexer serial (ZIG_LEXER),
+    # para a saida ser a mesma dele; com ZIG_LEXER=parallel, o PLY
+    return lx.LEXER_BACKEND if lx.LEXER_BACKEND != 'parallel' else 'ply'
+
+
+def lex_chunk(args):
+    # Executado no processo do pool: (tipo, valor, linha, posicao) do pedaco
+    backend, chunk, lineno, inicio = args
+    if backend == 'ply':
+        global _ply_lexer
+        if _ply_lexer is None:
+            _ply_lexer = lx.build_lexer('ply')
+        _ply_lexer.lineno = lineno
+        _ply_lexer.input(chunk)
+        return [(tok.type, tok.value, tok.lineno, tok.lexpos + inicio) for tok in _ply_lexer]
+    return [(tipo, valor, linha, posicao + inicio)
+            for tipo, valor, linha, posicao in sc.scan(chunk, lineno)]
+
+
+def tokenize_parallel(data, workers=None, backend=None, executor=None):
+    workers = workers or WORKERS
+    backend = backend or serial_backend()
+    if workers <= 1 or len(data) < TAMANHO_MINIMO:
+        return lex_chunk((backend, data, 1, 0))
+
+    tarefas = [(backend, data[inicio:fim], lineno, inicio)
+               for inicio, fim, lineno in split_chunks(data, workers)]
+
+    if executor is not None:
+        partes = executor.map(lex_chunk, tarefas)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partes = list(pool.map(lex_chunk, tarefas))
+    tokens = []
+    for parte in partes:
+        tokens.extend(parte)
+    return tokens
+
+
+class ParallelLexer:
+    # Interface do lexer do PLY (input/token) sobre tokenize_parallel
+
+    def __init__(self, workers=None, backend=None):
+        self.workers = workers or WORKERS
+        self.backend = backend or serial_backend()
+        self.lineno = 1
+        self._tokens = iter(())
+
+    def input(self, data):
+        self.lineno = 1
+        self._tokens = iter(tokenize_parallel(data, self.workers, self.backend))
+
+    def token(self):
+        for tipo, valor, linha, posicao in self._tokens:
+            self.lineno = linha
+            return sc.Token(tipo, valor, linha, posicao)
+        return None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.token()
+        if tok is None:
+            raise StopIteration
+        return tok
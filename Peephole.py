@@ -0,0 +1,267 @@
+import re
+
+# Otimizador peephole sobre as listas de instrucoes do AssemblyVisitor
+# (self.text e self.funcs), antes de get_code() montar o programa final.
+# Cada regra reescreve a lista e devolve quantas reescritas fez; as regras
+# rodam ate nenhuma mudar mais nada.
+
+RULES = ('store_load', 'stack', 'jump_threading', 'jump_next', 'unreachable')
+
+BRANCHES = {'beq', 'bne', 'blt', 'ble', 'bgt', 'bge',
+            'beqz', 'bnez', 'bltz', 'blez', 'bgtz', 'bgez'}
+JUMPS = {'j', 'b'}
+# Instrucoes que encerram a analise local (fluxo de controle ou efeitos externos)
+BARRIERS = BRANCHES | JUMPS | {'jal', 'jr', 'syscall'}
+
+SP_OFFSET = re.compile(r'^(-?\d+)\(\$sp\)$')
+
+
+def parse(line):
+    # (op, [operandos]); None para rotulos, diretivas e linhas vazias
+    if not line.startswith(' '):
+        return None
+    partes = line.split(None, 1)
+    if not partes:
+        return None
+    if len(partes) == 1:
+        return partes[0], []
+    return partes[0], [arg.strip() for arg in partes[1].split(',')]
+
+
+def format_instr(op, args):
+    return f"    {op} {', '.join(args)}" if args else f"    {op}"
+
+
+def label_of(line):
+    # Nome do rotulo definido pela linha, ou None
+    texto = line.strip()
+    if texto.endswith(':') and not line.startswith(' ') and ' ' not in texto:
+        return texto[:-1]
+    return None
+
+
+def sp_adjust(instr):
+    # Valor de `addi $sp, $sp, k`, ou None
+    if instr is not None and instr[0] == 'addi' and instr[1][:2] == ['$sp', '$sp']:
+        return int(instr[1][2])
+    return None
+
+
+def branch_target(instr):
+    if instr is None:
+        return None
+    op, args = instr
+    if op in JUMPS or op in BRANCHES:
+        return args[-1]
+    return None
+
+
+class PeepholeOptimizer:
+
+    def __init__(self, rules=None):
+        self.rules = tuple(RULES if rules is None else rules)
+        for rule in self.rules:
+            if rule not in RULES:
+                raise ValueError(f"Regra de peephole desconhecida: {rule}. Opcoes: {', '.join(RULES)}")
+        self.stats = {rule: 0 for rule in self.rules}
+
+    def optimize(self, *listas):
+        # Otimiza as listas no lugar; rotulos sao resolvidos entre todas elas
+        mudou = True
+        while mudou:
+            mudou = False
+            for rule in self.rules:
+                for lista in listas:
+                    n = getattr(self, rule)(lista, listas)
+                    if n:
+                        self.stats[rule] += n
+                        mudou = True
+        return self.stats
+
+    def report(self):
+        return dict(self.stats)
+
+    # Regras
+
+    def store_load(self, code, listas):
+        # sw R, X / lw R, X  -> sw R, X        sw R, X / lw S, X -> sw R, X / move S, R
+        # lw R, X / sw R, X  -> lw R, X        move R, R         -> (nada)
+        n = 0
+        resultado = []
+        anterior = None
+        for line in code:
+            instr = parse(line)
+            if instr is not None:
+                op, args = instr
+                if op == 'move' and len(args) == 2 and args[0] == args[1]:
+                    n += 1
+                    continue
+                if anterior is not None and len(args) == 2 and len(anterior[1]) == 2 \
+                        and anterior[1][1] == args[1] and anterior[1][0] not in args[1]:
+                    if anterior[0] == 'sw' and op == 'lw':
+                        n += 1
+                        if args[0] == anterior[1][0]:
+                            continue
+                        line = format_instr('move', [args[0], anterior[1][0]])
+                        instr = parse(line)
+                    elif anterior[0] == 'lw' and op == 'sw' and args[0] == anterior[1][0]:
+                        n += 1
+                        continue
+            resultado.append(line)
+            anterior = instr
+        code[:] = resultado
+        return n
+
+    def stack(self, code, listas):
+        # Afunda cada `addi $sp, $sp, k` ate o proximo ajuste de $sp, corrigindo
+        # os deslocamentos k($sp) no caminho, e junta os dois; k = 0 some.
+        # Se o proximo uso de $sp for `move $sp, $fp`, o ajuste e morto.
+        n = 0
+        i = 0
+        while i < len(code):
+            k = sp_adjust(parse(code[i]))
+            if k is None:
+                i += 1
+                continue
+            if k == 0:
+                del code[i]
+                n += 1
+                continue
+            j = i + 1
+            while j < len(code) and self._transparent(parse(code[j])):
+                j += 1
+            fim = parse(code[j]) if j < len(code) else None
+            outro = sp_adjust(fim)
+            morto = fim is not None and fim[0] == 'move' and fim[1] == ['$sp', '$fp']
+            if outro is None and not morto:
+                i += 1
+                continue
+            for t in range(i + 1, j):
+                op, args = parse(code[t])
+                if op in ('lw', 'sw'):
+                    m = SP_OFFSET.match(args[1])
+                    if m:
+                        code[t] = format_instr(op, [args[0], f"{int(m.group(1)) + k}($sp)"])
+            if outro is not None:
+                total = k + outro
+                if total:
+                    code[j] = format_instr('addi', ['$sp', '$sp', str(total)])
+                else:
+                    del code[j]
+            del code[i]
+            n += 1
+        return n
+
+    @staticmethod
+    def _transparent(instr):
+        # Pode trocar de lugar com `addi $sp, $sp, k` (ajustando k($sp))
+        if instr is None:
+            return False
+        op, args = instr
+        if op in BARRIERS or sp_adjust(instr) is not None:
+            return False
+        if op in ('lw', 'sw'):
+            return args[0] != '$sp'
+        return '$sp' not in args
+
+    def _labels(self, listas):
+        # rotulo -> (lista, indice da linha do rotulo)
+        labels = {}
+        for lista in listas:
+            for i, line in enumerate(lista):
+                label = label_of(line)
+                if label is not None:
+                    labels[label] = (lista, i)
+        return labels
+
+    @staticmethod
+    def _first_instr(lista, i):
+        # Primeira instrucao a partir de i, pulando rotulos
+        while i < len(lista):
+            instr = parse(lista[i])
+            if instr is not None:
+                return instr
+            if label_of(lista[i]) is None:
+                return None
+            i += 1
+        return None
+
+    def jump_threading(self, code, listas):
+        # Desvio para um rotulo cuja primeira instrucao e `j M` vai direto para M
+        n = 0
+        labels = self._labels(listas)
+        for i, line in enumerate(code):
+            instr = parse(line)
+            alvo = branch_target(instr)
+            if alvo is None:
+                continue
+            vistos = {alvo}
+            novo = alvo
+            while novo in labels:
+                lista, pos = labels[novo]
+                destino = self._first_instr(lista, pos + 1)
+                if destino is None or destino[0] not in JUMPS or destino[1][0] in vistos:
+                    break
+                novo = destino[1][0]
+                vistos.add(novo)
+            if novo != alvo:
+                op, args = instr
+                code[i] = format_instr(op, args[:-1] + [novo])
+                n += 1
+        return n
+
+    def jump_next(self, code, listas):
+        # Desvio (condicional ou nao) para um rotulo que vem logo em seguida
+        n = 0
+        i = 0
+        while i < len(code):
+            alvo = branch_target(parse(code[i]))
+            if alvo is not None:
+                j = i + 1
+                seguintes = set()
+                while j < len(code) and label_of(code[j]) is not None:
+                    seguintes.add(label_of(code[j]))
+                    j += 1
+                if alvo in seguintes:
+                    del code[i]
+                    n += 1
+                    continue
+            i += 1
+        return n
+
+    def unreachable(self, code, listas):
+        # Instrucoes entre j/b/jr e o proximo rotulo nunca executam
+        n = 0
+        resultado = []
+        morto = False
+        for line in code:
+            instr = parse(line)
+            if instr is None:
+                morto = False
+            elif morto:
+                n += 1
+                continue
+            elif instr[0] in JUMPS or instr[0] == 'jr':
+                morto = True
+            resultado.append(line)
+        code[:] = resultado
+        return n
+
+
+def main():
+    from ExpressionLanguageParser import parse as parse_zig, INPUT_PADRAO
+    from AssemblyVisitor import AssemblyVisitor
+    with open(INPUT_PADRAO, "r") as f:
+        result = parse_zig(f.read())
+    if result is not None:
+        assemblyvisitor = AssemblyVisitor(peephole=True)
+        result.accept(assemblyvisitor)
+        print(assemblyvisitor.get_code())
+        print()
+        print(assemblyvisitor.peephole.report())
+    else:
+        print("Erro no parsing do codigo")
+
+
+if __name__ == "__main__":
+    main()
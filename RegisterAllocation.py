@@ -0,0 +1,151 @@
+import SintaxeAbstrata as sa
+
+# Alocacao de registradores para variaveis locais (linear scan por funcao).
+# Os intervalos de vida sao calculados sobre a AST: cada no recebe uma posicao
+# na ordem em que o AssemblyVisitor emite codigo, o intervalo de uma variavel
+# vai da declaracao ao ultimo uso e um laco que menciona a variavel estende o
+# intervalo ate cobrir o laco inteiro (o desvio de volta a mantem viva).
+
+SAVED_REGS = ['$s0', '$s1', '$s2', '$s3', '$s4', '$s5', '$s6', '$s7']
+
+# Peso de um uso dentro de um laco (por nivel de aninhamento)
+LOOP_WEIGHT = 10
+# Abaixo deste peso o registrador nao compensa (salvar, restaurar, carregar)
+MIN_WEIGHT = 3
+
+
+class LiveIntervals:
+
+    def __init__(self, function, params=True):
+        self.intervals = {}     # nome -> [inicio, fim]
+        self.weights = {}       # nome -> usos ponderados pela profundidade de laco
+        self.position = 0
+        self.depth = 0
+        self.loops = []         # (inicio, fim, nomes mencionados)
+        self.open = []          # nomes mencionados em cada laco aberto
+        self.declared = set()
+        if params:
+            for param in function.params:
+                self.declared.add(param.name)
+                self.occurrence(param.name)
+        self.statement(function.body)
+        for inicio, fim, nomes in self.loops:
+            for name in nomes:
+                intervalo = self.intervals[name]
+                intervalo[0] = min(intervalo[0], inicio)
+                intervalo[1] = max(intervalo[1], fim)
+
+    def tick(self):
+        self.position += 1
+        return self.position
+
+    def occurrence(self, name):
+        # Uso ou definicao de name na posicao atual
+        if name not in self.declared:
+            return      # ainda se refere a um global
+        posicao = self.tick()
+        intervalo = self.intervals.get(name)
+        if intervalo is None:
+            self.intervals[name] = [posicao, posicao]
+        else:
+            intervalo[1] = posicao
+        self.weights[name] = self.weights.get(name, 0) + LOOP_WEIGHT ** self.depth
+        for nomes in self.open:
+            nomes.add(name)
+
+    def statement(self, node):
+        if isinstance(node, sa.Block):
+            for stmt in node.statements:
+                self.statement(stmt)
+        elif isinstance(node, sa.VarDecl):
+            self.expression(node.value)
+            self.declared.add(node.name)
+            self.occurrence(node.name)
+        elif isinstance(node, sa.AssignStmt):
+            self.expression(node.value)
+            self.occurrence(node.name)
+        elif isinstance(node, sa.ExprStmt):
+            self.expression(node.expr)
+        elif isinstance(node, sa.ReturnStmt):
+            if node.value is not None:
+                self.expression(node.value)
+        elif isinstance(node, sa.IfStmt):
+            self.expression(node.condition)
+            self.statement(node.then_block)
+            if node.else_block is not None:
+                self.statement(node.else_block)
+        elif isinstance(node, sa.WhileStmt):
+            inicio = self.tick()
+            self.open.append(set())
+            self.depth += 1
+            self.expression(node.condition)
+            self.statement(node.body)
+            self.depth -= 1
+            self.loops.append((inicio, self.tick(), self.open.pop()))
+        elif isinstance(node, sa.ConstDecl):
+            self.expression(node.value)
+
+    def expression(self, node):
+        if isinstance(node, sa.Identifier):
+            self.occurrence(node.name)
+        else:
+            self.tick()
+            for filho in sa.children(node):
+                self.expression(filho)
+
+
+def linear_scan(intervals, weights, pool):
+    # nome -> registrador; quem fica sem registrador continua no frame.
+    # Sob pressao, sai o intervalo ativo (ou o novo) de menor peso.
+    alocacao = {}
+    livres = list(pool)
+    ativos = []
+    candidatos = [n for n in intervals if weights[n] >= MIN_WEIGHT]
+    for name in sorted(candidatos, key=lambda n: intervals[n][0]):
+        inicio, fim = intervals[name]
+        for outro in [a for a in ativos if intervals[a][1] < inicio]:
+            ativos.remove(outro)
+            livres.append(alocacao[outro])
+            livres.sort(key=pool.index)
+        if livres:
+            alocacao[name] = livres.pop(0)
+            ativos.append(name)
+            continue
+        vitima = min(ativos, key=lambda n: weights[n])
+        if weights[vitima] < weights[name]:
+            alocacao[name] = alocacao.pop(vitima)
+            ativos.remove(vitima)
+            ativos.append(name)
+    return alocacao
+
+
+def allocate(function, pool, params=True):
+    # Registradores para os locais (e parametros, se params) de function
+    vida = LiveIntervals(function, params)
+    return linear_scan(vida.intervals, vida.weights, pool)
+
+
+def color_slots(function, names):
+    # Cor (slot do frame) para cada nome em names. E a coloracao de um grafo de
+    # intervalos: nomes que nunca estao vivos ao mesmo tempo (ex.: locais de
+    # ramos irmaos de um if/else) recebem a mesma cor, e o numero de cores e o
+    # maximo de intervalos sobrepostos.
+    vida = LiveIntervals(function)
+    intervals = vida.intervals
+    cores = {}
+    livres = []
+    ativos = []
+    total = 0
+    for name in sorted((n for n in intervals if n in names), key=lambda n: intervals[n][0]):
+        inicio = intervals[name][0]
+        for outro in [a for a in ativos if intervals[a][1] < inicio]:
+            ativos.remove(outro)
+            livres.append(cores[outro])
+        if livres:
+            livres.sort()
+            cores[name] = livres.pop(0)
+        else:
+            cores[name] = total
+            total += 1
+        ativos.append(name)
+    return cores
@@ -0,0 +1,263 @@
+from Peephole import parse, format_instr, BRANCHES, JUMPS, BARRIERS
+
+# Escalonamento de instrucoes dentro de blocos basicos, para um pipeline MIPS
+# classico de 5 estagios (IF ID EX MEM WB) com adiantamento. O unico atraso
+# que sobra com adiantamento e o de instrucoes cujo resultado sai depois do EX:
+# lw (load-use: 1 ciclo de bolha se o proximo usa o registrador), mul e as
+# operacoes de HI/LO (mflo/mfhi esperam mult/div terminar).
+# Roda depois do peephole, sobre as listas self.text e self.funcs.
+
+# Ciclos entre a emissao do produtor e a do primeiro consumidor sem bolha
+# (1 = pode usar na instrucao seguinte)
+LATENCY = {'lw': 2, 'mul': 2, 'mult': 5, 'div': 12}
+
+HI_LO = 'hilo'
+# Janela maxima do escalonador (blocos maiores sao tratados em pedacos)
+WINDOW = 64
+
+THREE_REG = {'add', 'addu', 'sub', 'subu', 'mul', 'and', 'or', 'xor', 'nor',
+             'slt', 'sltu', 'sllv', 'srlv', 'srav'}
+IMMEDIATE = {'addi', 'addiu', 'andi', 'ori', 'xori', 'slti', 'sltiu', 'sll', 'srl', 'sra'}
+STACK_REGS = {'$sp', '$fp'}
+
+
+def registers(args):
+    return {a for a in args if a.startswith('$') and a not in ('$zero', '$0')}
+
+
+def base_of(operand):
+    # Registrador base de k($r), ou None para um rotulo
+    if operand.endswith(')') and '(' in operand:
+        return operand[operand.index('(') + 1:-1]
+    return None
+
+
+def effects(instr):
+    # (registradores lidos, registradores escritos) de uma instrucao;
+    # None se a instrucao e desconhecida (tratada como barreira)
+    op, args = instr
+    if op in THREE_REG:
+        return registers(args[1:]), registers(args[:1])
+    if op in IMMEDIATE or op == 'move':
+        return registers(args[1:2]), registers(args[:1])
+    if op in ('li', 'lui'):
+        return set(), registers(args[:1])
+    if op == 'la':
+        base = base_of(args[1])
+        return ({base} if base else set()), registers(args[:1])
+    if op == 'lw':
+        base = base_of(args[1])
+        return ({base} if base else set()), registers(args[:1])
+    if op == 'sw':
+        base = base_of(args[1])
+        return registers(args[:1]) | ({base} if base else set()), set()
+    if op in ('div', 'mult'):
+        return registers(args), {HI_LO}
+    if op in ('mflo', 'mfhi'):
+        return {HI_LO}, registers(args[:1])
+    if op == 'nop':
+        return set(), set()
+    if op in BRANCHES or op == 'jr':
+        return registers(args), set()
+    if op in JUMPS:
+        return set(), set()
+    if op == 'jal':
+        return set(), {'$ra'}
+    return None
+
+
+def stall_cycles(instrs):
+    # Bolhas de cada instrucao numa sequencia em linha reta (emissao em ordem)
+    pronto = {}     # registrador -> primeiro ciclo em que pode ser lido
+    ciclo = -1
+    bolhas = []
+    for instr in instrs:
+        efeito = effects(instr)
+        lidos, escritos = efeito if efeito is not None else (set(), set())
+        emissao = max([ciclo + 1] + [pronto.get(r, 0) for r in lidos])
+        bolhas.append(emissao - ciclo - 1)
+        ciclo = emissao
+        for r in escritos:
+            pronto[r] = ciclo + LATENCY.get(instr[0], 1)
+    return bolhas
+
+
+def independent(a, b):
+    # a e b podem trocar de ordem (nenhuma dependencia de registrador ou memoria)
+    lidos_a, escritos_a = effects(a)
+    lidos_b, escritos_b = effects(b)
+    if escritos_a & (lidos_b | escritos_b) or lidos_a & escritos_b:
+        return False
+    if a[0] in ('lw', 'sw') and b[0] in ('lw', 'sw') and 'sw' in (a[0], b[0]):
+        # Uma base lida por a e escrita no meio ja teria criado dependencia
+        return not Window.may_alias(Window.location(a[1][1], {}), Window.location(b[1][1], {}))
+    return True
+
+
+class Window:
+    # Grafo de dependencias de um trecho de bloco basico
+
+    def __init__(self, instrs):
+        self.instrs = instrs
+        n = len(instrs)
+        self.succs = [[] for _ in range(n)]     # (sucessor, atraso)
+        self.preds = [0] * n
+        escritor = {}       # registrador -> ultima instrucao que o escreveu
+        leitores = {}       # registrador -> instrucoes que o leram desde entao
+        versao = {}         # registrador -> quantas escritas ate aqui
+        memoria = []        # (indice, e store?, chave do endereco)
+        for j, instr in enumerate(instrs):
+            lidos, escritos = effects(instr)
+            for r in lidos:
+                if r in escritor:
+                    self.edge(escritor[r], j, LATENCY.get(instrs[escritor[r]][0], 1))
+            for r in escritos:
+                if r in escritor:
+                    self.edge(escritor[r], j, 1)
+                for i in leitores.get(r, ()):
+                    self.edge(i, j, 1)
+            op = instr[0]
+            if op in ('lw', 'sw'):
+                chave = self.location(instr[1][1], versao)
+                for i, store, outra in memoria:
+                    if (store or op == 'sw') and self.may_alias(chave, outra):
+                        self.edge(i, j, 1)
+                memoria.append((j, op == 'sw', chave))
+            if op in BARRIERS:
+                for i in range(j):
+                    self.edge(i, j, 1)
+            for r in lidos:
+                leitores.setdefault(r, []).append(j)
+            for r in escritos:
+                escritor[r] = j
+                leitores[r] = []
+                versao[r] = versao.get(r, 0) + 1
+
+    def edge(self, i, j, atraso):
+        self.succs[i].append((j, atraso))
+        self.preds[j] += 1
+
+    @staticmethod
+    def location(operand, versao):
+        # (base, versao da base, deslocamento) ou ('rotulo', nome)
+        base = base_of(operand)
+        if base is None:
+            return ('label', operand)
+        deslocamento = operand[:operand.index('(')] or '0'
+        return (base, versao.get(base, 0), deslocamento)
+
+    @staticmethod
+    def may_alias(a, b):
+        if a[0] == 'label' or b[0] == 'label':
+            if a[0] == 'label' and b[0] == 'label':
+                return a[1] == b[1]
+            # Globais nao se confundem com a pilha; outro ponteiro pode
+            outra = b if a[0] == 'label' else a
+            return outra[0] not in STACK_REGS
+        if a[:2] == b[:2]:
+            # Mesma base, sem escrita no meio: so o deslocamento decide
+            return a[2] == b[2]
+        return True
+
+    def heights(self):
+        # Caminho mais longo (em ciclos) de cada no ate o fim do trecho
+        n = len(self.instrs)
+        altura = [1] * n
+        for i in range(n - 1, -1, -1):
+            for j, atraso in self.succs[i]:
+                altura[i] = max(altura[i], atraso + altura[j])
+        return altura
+
+    def schedule(self):
+        # List scheduling: a cada ciclo emite a pronta de maior altura (empate:
+        # ordem original); sem nenhuma pronta, o ciclo vira bolha
+        n = len(self.instrs)
+        altura = self.heights()
+        faltam = list(self.preds)
+        cedo = [0] * n
+        prontas = [i for i in range(n) if not faltam[i]]
+        ordem = []
+        ciclo = 0
+        while prontas:
+            disponiveis = [i for i in prontas if cedo[i] <= ciclo]
+            if not disponiveis:
+                ciclo = min(cedo[i] for i in prontas)
+                continue
+            escolhida = max(disponiveis, key=lambda i: (altura[i], -i))
+            prontas.remove(escolhida)
+            ordem.append(escolhida)
+            for j, atraso in self.succs[escolhida]:
+                cedo[j] = max(cedo[j], ciclo + atraso)
+                faltam[j] -= 1
+                if not faltam[j]:
+                    prontas.append(j)
+            ciclo += 1
+        return [self.instrs[i] for i in ordem]
+
+
+def blocks(code):
+    # Trechos [inicio, fim) de instrucoes em linha reta dentro de code
+    inicio = None
+    for i, line in enumerate(code):
+        instr = parse(line)
+        if instr is None or effects(instr) is None:
+            if inicio is not None:
+                yield inicio, i
+            inicio = None
+            continue
+        if inicio is None:
+            inicio = i
+        if instr[0] in BARRIERS or i - inicio + 1 == WINDOW:
+            yield inicio, i + 1
+            inicio = None
+    if inicio is not None:
+        yield inicio, len(code)
+
+
+class InstructionScheduler:
+
+    def __init__(self):
+        self.stats = {'blocks': 0, 'scheduled': 0, 'stalls_before': 0, 'stalls_after': 0}
+
+    def schedule(self, *listas):
+        for lista in listas:
+            self.schedule_list(lista)
+        return self.stats
+
+    def schedule_list(self, code):
+        for inicio, fim in list(blocks(code)):
+            instrs = [parse(line) for line in code[inicio:fim]]
+            antes = sum(stall_cycles(instrs))
+            self.stats['blocks'] += 1
+            self.stats['stalls_before'] += antes
+            depois = antes
+            if antes and len(instrs) > 1:
+                novas = Window(instrs).schedule()
+                depois = sum(stall_cycles(novas))
+                if depois < antes:
+                    code[inicio:fim] = [format_instr(op, args) for op, args in novas]
+                    self.stats['scheduled'] += 1
+                else:
+                    depois = antes
+            self.stats['stalls_after'] += depois
+
+    def report(self):
+        return dict(self.stats)
+
+
+def pipeline_cycles(simulator):
+    # Ciclos de uma execucao ja terminada do MipsSimulator no pipeline de 5
+    # estagios: instrucoes + bolhas (cada instrucao paga as bolhas calculadas
+    # dentro do seu bloco basico, vezes as execucoes) + 4 ciclos de enchimento
+    instructions = simulator.program.instructions
+    bolhas = 0
+    inicio = 0
+    for i in range(1, len(instructions) + 1):
+        if i < len(instructions) and not simulator.leader[i]:
+            continue
+        trecho = [(op, args) for op, args, _ in instructions[inicio:i]]
+        for k, b in enumerate(stall_cycles(trecho)):
+            bolhas += b * simulator.hits[inicio + k]
+        inicio = i
+    return {'instructions': simulator.steps, 'stalls': bolhas,
+            'cycles': simulator.steps + bolhas + 4 if simulator.steps else 0}
@@ -0,0 +1,71 @@
+# Motor das tabelas de simbolos (SymbolTable e AssemblyST)
+# Um unico dicionario nome -> pilha de bindings, mais um log de desfazer por
+# escopo: busca e insercao sao O(1) e sair de um escopo so desfaz o que ele criou.
+
+
+class Scope:
+    __slots__ = ('name', 'names', 'sp')
+
+    def __init__(self, name):
+        self.name = name
+        self.names = []  # log de desfazer: nomes ligados neste escopo
+        self.sp = 0
+
+
+class ScopedTable:
+
+    def __init__(self):
+        self.bindings = {}  # nome -> [(profundidade, bindable), ...]
+        self.scopes = []
+
+    def beginScope(self, nameScope):
+        self.scopes.append(Scope(nameScope))
+
+    def endScope(self):
+        bindings = self.bindings
+        for name in self.scopes.pop().names:
+            stack = bindings[name]
+            stack.pop()
+            if not stack:
+                del bindings[name]
+
+    def bind(self, name, bindable):
+        depth = len(self.scopes) - 1
+        stack = self.bindings.get(name)
+        if stack is None:
+            self.bindings[name] = [(depth, bindable)]
+        elif stack[-1][0] == depth:
+            # Redefinicao no mesmo escopo: substitui, sem nova entrada no log
+            stack[-1] = (depth, bindable)
+            return
+        else:
+            stack.append((depth, bindable))
+        self.scopes[-1].names.append(name)
+
+    def lookup(self, name):
+        stack = self.bindings.get(name)
+        return stack[-1][1] if stack else None
+
+    def lookupCurrent(self, name):
+        # Binding de name no escopo atual (ignora escopos externos)
+        stack = self.bindings.get(name)
+        if stack and stack[-1][0] == len(self.scopes) - 1:
+            return stack[-1][1]
+        return None
+
+    def scopeOf(self, name):
+        stack = self.bindings.get(name)
+        return self.scopes[stack[-1][0]].name if stack else None
+
+    def getCurrentScope(self):
+        if len(self.scopes) > 0:
+            return self.scopes[-1].name
+        return None
+
+    def asDicts(self):
+        # Visao lista-de-dicionarios (formato antigo), usada na depuracao
+        tables = [{'scope': scope.name} for scope in self.scopes]
+        for name, stack in self.bindings.items():
+            for depth, bindable in stack:
+                tables[depth][name] = bindable
+        return tables
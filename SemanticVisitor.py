@@ -19,12 +19,25 @@ def coercion(type1, type2):
 
 
 class SemanticVisitor(AbstractVisitor):
-    def __init__(self):
+    def __init__(self, verbose=True):
         self.printer = Visitor()
         self.n_errors = 0
-        st.beginScope('global')
+        self.verbose = verbose
+        self.diagnostics = []
+        self.symbolTable = st.SymbolTable()
+        self.symbolTable.beginScope('global')
         # Registrar funcoes built-in (nativas)
-        st.addFunction('print', ['value', st.INT], st.VOID)
+        self.symbolTable.addFunction('print', ['value', st.INT], st.VOID)
+
+    def erro(self, *linhas, contexto=None):
+        # Registra o diagnostico; no modo verbose tambem imprime como antes
+        self.n_errors += 1
+        self.diagnostics.append(' '.join(linha.strip() for linha in linhas))
+        if self.verbose:
+            if contexto is not None:
+                contexto.accept(self.printer)
+            for linha in linhas:
+                print(linha)
 
     def visitProgram(self, program):
         for item in program.items:
@@ -37,13 +50,12 @@ class SemanticVisitor(AbstractVisitor):
             declaredType = constDecl.type_spec
             if typeValue is not None and typeValue != declaredType:
                 if coercion(typeValue, declaredType) is None:
-                    self.n_errors += 1
-                    print(f"\n\t[Erro] Tipo incompatível na declaração da constante '{constDecl.name}'.")
-                    print(f"\tTipo declarado: {declaredType}, tipo da expressão: {typeValue}\n")
-            st.addConst(constDecl.name, declaredType)
+                    self.erro(f"\n\t[Erro] Tipo incompatível na declaração da constante '{constDecl.name}'.",
+                              f"\tTipo declarado: {declaredType}, tipo da expressão: {typeValue}\n")
+            self.symbolTable.addConst(constDecl.name, declaredType)
             return declaredType
         else:
-            st.addConst(constDecl.name, typeValue)
+            self.symbolTable.addConst(constDecl.name, typeValue)
             return typeValue
 
     def visitVarDecl(self, varDecl):
@@ -53,13 +65,12 @@ class SemanticVisitor(AbstractVisitor):
             declaredType = varDecl.type_spec
             if typeValue is not None and typeValue != declaredType:
                 if coercion(typeValue, declaredType) is None:
-                    self.n_errors += 1
-                    print(f"\n\t[Erro] Tipo incompatível na declaração da variável '{varDecl.name}'.")
-                    print(f"\tTipo declarado: {declaredType}, tipo da expressão: {typeValue}\n")
-            st.addVar(varDecl.name, declaredType)
+                    self.erro(f"\n\t[Erro] Tipo incompatível na declaração da variável '{varDecl.name}'.",
+                              f"\tTipo declarado: {declaredType}, tipo da expressão: {typeValue}\n")
+            self.symbolTable.addVar(varDecl.name, declaredType)
             return declaredType
         else:
-            st.addVar(varDecl.name, typeValue)
+            self.symbolTable.addVar(varDecl.name, typeValue)
             return typeValue
 
     def visitFunction(self, function):
@@ -69,15 +80,15 @@ class SemanticVisitor(AbstractVisitor):
             params.append(param.type_spec)
         
         returnType = function.return_type if function.return_type else st.VOID
-        st.addFunction(function.name, params, returnType)
+        self.symbolTable.addFunction(function.name, params, returnType)
         
-        st.beginScope(function.name)
+        self.symbolTable.beginScope(function.name)
         
         for i in range(0, len(params), 2):
-            st.addVar(params[i], params[i + 1])
+            self.symbolTable.addVar(params[i], params[i + 1])
         
         function.body.accept(self)
-        st.endScope()
+        self.symbolTable.endScope()
 
     def visitParam(self, param):
         return [param.name, param.type_spec]
@@ -92,23 +103,20 @@ class SemanticVisitor(AbstractVisitor):
     def visitAssignStmt(self, assignStmt):
         typeValue = assignStmt.value.accept(self)
         
-        bindable = st.getBindable(assignStmt.name)
+        bindable = self.symbolTable.getBindable(assignStmt.name)
         if bindable is None:
-            self.n_errors += 1
-            print(f"\n\t[Erro] Variável '{assignStmt.name}' não foi declarada.\n")
+            self.erro(f"\n\t[Erro] Variável '{assignStmt.name}' não foi declarada.\n")
             return None
         
         if bindable[st.BINDABLE] == st.CONSTANT:
-            self.n_errors += 1
-            print(f"\n\t[Erro] Não é possível reatribuir valor à constante '{assignStmt.name}'.\n")
+            self.erro(f"\n\t[Erro] Não é possível reatribuir valor à constante '{assignStmt.name}'.\n")
             return None
         
         varType = bindable[st.TYPE]
         if varType is not None and typeValue is not None:
             if coercion(varType, typeValue) is None:
-                self.n_errors += 1
-                print(f"\n\t[Erro] Tipos incompatíveis na atribuição.")
-                print(f"\tVariável '{assignStmt.name}' é do tipo {varType}, mas recebeu {typeValue}\n")
+                self.erro(f"\n\t[Erro] Tipos incompatíveis na atribuição.",
+                          f"\tVariável '{assignStmt.name}' é do tipo {varType}, mas recebeu {typeValue}\n")
         
         return varType
 
@@ -119,17 +127,15 @@ class SemanticVisitor(AbstractVisitor):
         else:
             typeExp = st.VOID
         
-        scope = st.getCurrentScope()
-        bindable = st.getBindable(scope)
+        scope = self.symbolTable.getCurrentScope()
+        bindable = self.symbolTable.getBindable(scope)
         
         if bindable is not None and bindable[st.BINDABLE] == st.FUNCTION:
             expectedType = bindable[st.TYPE]
             if expectedType != typeExp:
                 if coercion(expectedType, typeExp) is None:
-                    self.n_errors += 1
-                    returnStmt.accept(self.printer)
-                    print(f"\n\t[Erro] O retorno da função '{scope}' é do tipo {expectedType},")
-                    print(f"\tno entanto, o retorno passado foi do tipo {typeExp}\n")
+                    self.erro(f"\n\t[Erro] O retorno da função '{scope}' é do tipo {expectedType},",
+                              f"\tno entanto, o retorno passado foi do tipo {typeExp}\n", contexto=returnStmt)
         
         return typeExp
 
@@ -137,8 +143,7 @@ class SemanticVisitor(AbstractVisitor):
         condType = ifStmt.condition.accept(self)
         
         if condType != st.BOOL:
-            self.n_errors += 1
-            print(f"\n\t[Erro] A condição do 'if' deve ser do tipo bool, mas é do tipo {condType}\n")
+            self.erro(f"\n\t[Erro] A condição do 'if' deve ser do tipo bool, mas é do tipo {condType}\n")
         
         ifStmt.then_block.accept(self)
         
@@ -149,8 +154,7 @@ class SemanticVisitor(AbstractVisitor):
         condType = whileStmt.condition.accept(self)
         
         if condType != st.BOOL:
-            self.n_errors += 1
-            print(f"\n\t[Erro] A condição do 'while' deve ser do tipo bool, mas é do tipo {condType}\n")
+            self.erro(f"\n\t[Erro] A condição do 'while' deve ser do tipo bool, mas é do tipo {condType}\n")
         
         whileStmt.body.accept(self)
 
@@ -162,27 +166,24 @@ class SemanticVisitor(AbstractVisitor):
         if binaryExpr.op in comparison_ops:
             c = coercion(tipoLeft, tipoRight)
             if c is None:
-                self.n_errors += 1
-                print(f"\n\t[Erro] Comparação inválida. Expressão esquerda é do tipo {tipoLeft},")
-                print(f"\tenquanto a expressão direita é do tipo {tipoRight}\n")
+                self.erro(f"\n\t[Erro] Comparação inválida. Expressão esquerda é do tipo {tipoLeft},",
+                          f"\tenquanto a expressão direita é do tipo {tipoRight}\n")
             return st.BOOL
 
         arithmetic_ops = ['+', '-', '*', '/', '%']
         if binaryExpr.op in arithmetic_ops:
             c = coercion(tipoLeft, tipoRight)
             if c is None:
-                self.n_errors += 1
-                print(f"\n\t[Erro] Operação aritmética inválida '{binaryExpr.op}'.")
-                print(f"\tExpressão esquerda é do tipo {tipoLeft},")
-                print(f"\tenquanto a expressão direita é do tipo {tipoRight}\n")
+                self.erro(f"\n\t[Erro] Operação aritmética inválida '{binaryExpr.op}'.",
+                          f"\tExpressão esquerda é do tipo {tipoLeft},",
+                          f"\tenquanto a expressão direita é do tipo {tipoRight}\n")
             return c
 
         logical_ops = ['and', 'or']
         if binaryExpr.op in logical_ops:
             if tipoLeft != st.BOOL or tipoRight != st.BOOL:
-                self.n_errors += 1
-                print(f"\n\t[Erro] Operação lógica '{binaryExpr.op}' requer operandos booleanos.")
-                print(f"\tTipos recebidos: {tipoLeft} e {tipoRight}\n")
+                self.erro(f"\n\t[Erro] Operação lógica '{binaryExpr.op}' requer operandos booleanos.",
+                          f"\tTipos recebidos: {tipoLeft} e {tipoRight}\n")
             return st.BOOL
         
         return coercion(tipoLeft, tipoRight)
@@ -192,14 +193,12 @@ class SemanticVisitor(AbstractVisitor):
         
         if unaryExpr.op == '!':
             if tipoExpr != st.BOOL:
-                self.n_errors += 1
-                print(f"\n\t[Erro] Operador '!' requer operando booleano, mas recebeu {tipoExpr}\n")
+                self.erro(f"\n\t[Erro] Operador '!' requer operando booleano, mas recebeu {tipoExpr}\n")
             return st.BOOL
 
         if unaryExpr.op in ['-', '+']:
             if tipoExpr not in st.Number:
-                self.n_errors += 1
-                print(f"\n\t[Erro] Operador '{unaryExpr.op}' requer operando numérico, mas recebeu {tipoExpr}\n")
+                self.erro(f"\n\t[Erro] Operador '{unaryExpr.op}' requer operando numérico, mas recebeu {tipoExpr}\n")
             return tipoExpr
         
         return tipoExpr
@@ -219,33 +218,29 @@ class SemanticVisitor(AbstractVisitor):
         return None
 
     def visitIdentifier(self, identifier):
-        bindable = st.getBindable(identifier.name)
+        bindable = self.symbolTable.getBindable(identifier.name)
         
         if bindable is not None:
             return bindable[st.TYPE]
         
-        self.n_errors += 1
-        print(f"\n\t[Erro] Identificador '{identifier.name}' não foi declarado.\n")
+        self.erro(f"\n\t[Erro] Identificador '{identifier.name}' não foi declarado.\n")
         return None
 
     def visitFunctionCall(self, functionCall):
-        bindable = st.getBindable(functionCall.name)
+        bindable = self.symbolTable.getBindable(functionCall.name)
         
         if bindable is None:
-            self.n_errors += 1
-            print(f"\n\t[Erro] Função '{functionCall.name}' não foi declarada.\n")
+            self.erro(f"\n\t[Erro] Função '{functionCall.name}' não foi declarada.\n")
             return None
         
         if bindable[st.BINDABLE] != st.FUNCTION:
-            self.n_errors += 1
-            print(f"\n\t[Erro] '{functionCall.name}' não é uma função.\n")
+            self.erro(f"\n\t[Erro] '{functionCall.name}' não é uma função.\n")
             return None
         
         # Função print aceita (int, string)
         if functionCall.name == 'print':
             if len(functionCall.args) != 1:
-                self.n_errors += 1
-                print(f"\n\t[Erro] 'print' espera exatamente 1 argumento, recebeu {len(functionCall.args)}\n")
+                self.erro(f"\n\t[Erro] 'print' espera exatamente 1 argumento, recebeu {len(functionCall.args)}\n")
             else:
                 functionCall.args[0].accept(self)
             return st.VOID
@@ -256,9 +251,8 @@ class SemanticVisitor(AbstractVisitor):
         actualCount = len(functionCall.args)
         
         if expectedCount != actualCount:
-            self.n_errors += 1
-            print(f"\n\t[Erro] Chamada da função '{functionCall.name}' com número incorreto de argumentos.")
-            print(f"\tEsperado: {expectedCount}, recebido: {actualCount}\n")
+            self.erro(f"\n\t[Erro] Chamada da função '{functionCall.name}' com número incorreto de argumentos.",
+                      f"\tEsperado: {expectedCount}, recebido: {actualCount}\n")
             return bindable[st.TYPE]
         
         # Verificar tipos dos parâmetros
@@ -270,10 +264,9 @@ class SemanticVisitor(AbstractVisitor):
         for i, (expected, actual) in enumerate(zip(expectedTypes, actualTypes)):
             if actual is not None and expected != actual:
                 if coercion(expected, actual) is None:
-                    self.n_errors += 1
                     paramName = paramsList[i * 2]
-                    print(f"\n\t[Erro] Tipo incompatível no argumento '{paramName}' da função '{functionCall.name}'.")
-                    print(f"\tEsperado: {expected}, recebido: {actual}\n")
+                    self.erro(f"\n\t[Erro] Tipo incompatível no argumento '{paramName}' da função '{functionCall.name}'.",
+                              f"\tEsperado: {expected}, recebido: {actual}\n")
         
         return bindable[st.TYPE]
 
@@ -282,11 +275,11 @@ class SemanticVisitor(AbstractVisitor):
 
 
 def main():
-    from ExpressionLanguageParser import parse
+    from ExpressionLanguageParser import parse, INPUT_PADRAO
     print("# Análise Semântica #")
     print("=" * 50)
-    f = open("input1.zig", "r")
-    result = parse(f.read())
+    with open(INPUT_PADRAO, "r") as f:
+        result = parse(f.read())
     
     if result is not None:
         svisitor = SemanticVisitor()
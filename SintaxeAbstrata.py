@@ -5,37 +5,36 @@ from dataclasses import dataclass
 from typing import List, Optional, Union
 
 
-nivel = 0
-
-
-def _indent() -> str:
+def _indent(nivel: int) -> str:
     return " " * nivel
 
-@dataclass
+@dataclass(slots=True)
 class Program:
     items: List[Item]
 
     def accept(self, visitor):
         return visitor.visitProgram(self)
 
-    def print(self):
+    def print(self, nivel: int = 0):
         for i, item in enumerate(self.items):
-            item.print()
+            item.print(nivel)
             if i < len(self.items) - 1:
                 print()
 
 
 class Item(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor):
         pass
 
     @abstractmethod
-    def print(self):
+    def print(self, nivel: int = 0):
         pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ConstDecl(Item):
     name: str
     type_spec: Optional[str]
@@ -44,14 +43,14 @@ class ConstDecl(Item):
     def accept(self, visitor):
         return visitor.visitConstDecl(self)
 
-    def print(self):
+    def print(self, nivel: int = 0):
         type_part = f": {self.type_spec}" if self.type_spec else ""
-        print(f"{_indent()}const {self.name}{type_part} = ", end="")
+        print(f"{_indent(nivel)}const {self.name}{type_part} = ", end="")
         self.value.print()
         print(";", end="")
 
 
-@dataclass
+@dataclass(slots=True)
 class VarDecl(Item):
     name: str
     type_spec: Optional[str]
@@ -60,14 +59,14 @@ class VarDecl(Item):
     def accept(self, visitor):
         return visitor.visitVarDecl(self)
 
-    def print(self):
+    def print(self, nivel: int = 0):
         type_part = f": {self.type_spec}" if self.type_spec else ""
-        print(f"{_indent()}var {self.name}{type_part} = ", end="")
+        print(f"{_indent(nivel)}var {self.name}{type_part} = ", end="")
         self.value.print()
         print(";", end="")
 
 
-@dataclass
+@dataclass(slots=True)
 class Function(Item):
     name: str
     params: List[Param]
@@ -78,15 +77,15 @@ class Function(Item):
     def accept(self, visitor):
         return visitor.visitFunction(self)
 
-    def print(self):
+    def print(self, nivel: int = 0):
         vis = "pub " if self.visibility else ""
         params_txt = ", ".join([p.format() for p in self.params])
         ret = f" {self.return_type}" if self.return_type else ""
-        print(f"{_indent()}{vis}fn {self.name}({params_txt}){ret} ", end="")
-        self.body.print()
+        print(f"{_indent(nivel)}{vis}fn {self.name}({params_txt}){ret} ", end="")
+        self.body.print(nivel)
 
 
-@dataclass
+@dataclass(slots=True)
 class Param:
     name: str
     type_spec: str
@@ -97,49 +96,48 @@ class Param:
     def format(self) -> str:
         return f"{self.name}: {self.type_spec}"
 
-@dataclass
+@dataclass(slots=True)
 class Block:
     statements: List[Statement]
 
     def accept(self, visitor):
         return visitor.visitBlock(self)
 
-    def print(self):
-        global nivel
+    def print(self, nivel: int = 0):
         print("{")
-        nivel += 4
         for i, stmt in enumerate(self.statements):
-            print(_indent(), end="")
-            stmt.print()
+            print(_indent(nivel + 4), end="")
+            stmt.print(nivel + 4)
             if i < len(self.statements) - 1:
                 print()
-        nivel -= 4
-        print(f"\n{_indent()}}}", end="")
+        print(f"\n{_indent(nivel)}}}", end="")
 
 
 class Statement(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor):
         pass
 
     @abstractmethod
-    def print(self):
+    def print(self, nivel: int = 0):
         pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ExprStmt(Statement):
     expr: Expression
 
     def accept(self, visitor):
         return visitor.visitExprStmt(self)
 
-    def print(self):
+    def print(self, nivel: int = 0):
         self.expr.print()
         print(";", end="")
 
 
-@dataclass
+@dataclass(slots=True)
 class AssignStmt(Statement):
     name: str
     value: Expression
@@ -147,20 +145,20 @@ class AssignStmt(Statement):
     def accept(self, visitor):
         return visitor.visitAssignStmt(self)
 
-    def print(self):
+    def print(self, nivel: int = 0):
         print(f"{self.name} = ", end="")
         self.value.print()
         print(";", end="")
 
 
-@dataclass
+@dataclass(slots=True)
 class ReturnStmt(Statement):
     value: Optional[Expression]
 
     def accept(self, visitor):
         return visitor.visitReturnStmt(self)
 
-    def print(self):
+    def print(self, nivel: int = 0):
         if self.value is None:
             print("return;", end="")
         else:
@@ -169,7 +167,7 @@ class ReturnStmt(Statement):
             print(";", end="")
 
 
-@dataclass
+@dataclass(slots=True)
 class IfStmt(Statement):
     condition: Expression
     then_block: Block
@@ -178,17 +176,17 @@ class IfStmt(Statement):
     def accept(self, visitor):
         return visitor.visitIfStmt(self)
 
-    def print(self):
+    def print(self, nivel: int = 0):
         print("if (", end="")
         self.condition.print()
         print(") ", end="")
-        self.then_block.print()
+        self.then_block.print(nivel)
         if self.else_block:
             print(" else ", end="")
-            self.else_block.print()
+            self.else_block.print(nivel)
 
 
-@dataclass
+@dataclass(slots=True)
 class WhileStmt(Statement):
     condition: Expression
     body: Block
@@ -196,13 +194,15 @@ class WhileStmt(Statement):
     def accept(self, visitor):
         return visitor.visitWhileStmt(self)
 
-    def print(self):
+    def print(self, nivel: int = 0):
         print("while (", end="")
         self.condition.print()
         print(") ", end="")
-        self.body.print()
+        self.body.print(nivel)
 
 class Expression(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor):
         pass
@@ -212,7 +212,7 @@ class Expression(ABC):
         pass
 
 
-@dataclass
+@dataclass(slots=True)
 class BinaryExpr(Expression):
     op: str
     left: Expression
@@ -229,7 +229,7 @@ class BinaryExpr(Expression):
         print(")", end="")
 
 
-@dataclass
+@dataclass(slots=True)
 class UnaryExpr(Expression):
     op: str
     expr: Expression
@@ -242,7 +242,7 @@ class UnaryExpr(Expression):
         self.expr.print()
 
 
-@dataclass
+@dataclass(slots=True)
 class Literal(Expression):
     value: Union[int, float, bool, str]
 
@@ -256,7 +256,7 @@ class Literal(Expression):
             print(self.value, end="")
 
 
-@dataclass
+@dataclass(slots=True)
 class Identifier(Expression):
     name: str
 
@@ -267,7 +267,7 @@ class Identifier(Expression):
         print(self.name, end="")
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionCall(Expression):
     name: str
     args: List[Expression]
@@ -281,4 +281,46 @@ class FunctionCall(Expression):
             arg.print()
             if i < len(self.args) - 1:
                 print(", ", end="")
-        print(")", end="")
\ No newline at end of file
+        print(")", end="")
+
+
+# Percurso generico da AST
+
+def children(node):
+    if isinstance(node, BinaryExpr):
+        return [node.left, node.right]
+    if isinstance(node, (Identifier, Literal, Param)):
+        return []
+    if isinstance(node, FunctionCall):
+        return node.args
+    if isinstance(node, UnaryExpr):
+        return [node.expr]
+    if isinstance(node, ExprStmt):
+        return [node.expr]
+    if isinstance(node, (AssignStmt, ConstDecl, VarDecl)):
+        return [node.value]
+    if isinstance(node, ReturnStmt):
+        return [node.value] if node.value is not None else []
+    if isinstance(node, IfStmt):
+        filhos = [node.condition, node.then_block]
+        if node.else_block is not None:
+            filhos.append(node.else_block)
+        return filhos
+    if isinstance(node, WhileStmt):
+        return [node.condition, node.body]
+    if isinstance(node, Block):
+        return node.statements
+    if isinstance(node, Function):
+        return node.params + [node.body]
+    if isinstance(node, Program):
+        return node.items
+    raise TypeError(f"No desconhecido: {type(node).__name__}")
+
+
+def walk(node):
+    # Todos os nos a partir de node (pre-ordem, iterativo)
+    pilha = [node]
+    while pilha:
+        atual = pilha.pop()
+        yield atual
+        pilha.extend(reversed(children(atual)))
@@ -0,0 +1,80 @@
+# Pool de literais string da secao .data. Cada texto distinto recebe um unico
+# rotulo str_N (na ordem em que aparece), por mais vezes que seja usado.
+# Com merge_suffixes, um texto que e sufixo de outro nao ocupa espaco proprio:
+# o rotulo dele aponta para o meio do texto maior, que e emitido em pedacos
+#   str_0: .ascii "Resultado da "
+#   str_1: .asciiz "soma:"
+
+
+def escape(texto):
+    return texto.replace('\n', '\\n').replace('\t', '\\t')
+
+
+def size(texto):
+    # Bytes ocupados no .data (UTF-8 mais o terminador)
+    return len(texto.encode('utf-8')) + 1
+
+
+class StringPool:
+
+    def __init__(self, merge_suffixes=False):
+        self.merge_suffixes = merge_suffixes
+        self.labels = {}        # texto -> rotulo
+        self.literals = 0       # literais pedidos (com repeticao)
+        self.requested = 0      # bytes que os literais ocupariam sem o pool
+
+    def __len__(self):
+        return len(self.labels)
+
+    def intern(self, texto):
+        # Rotulo do texto, criado no primeiro uso
+        self.literals += 1
+        self.requested += size(texto)
+        label = self.labels.get(texto)
+        if label is None:
+            label = f"str_{len(self.labels)}"
+            self.labels[texto] = label
+        return label
+
+    def hosts(self):
+        # texto -> texto maior que o contem como sufixo (so com merge_suffixes).
+        # Ordenados pelo texto invertido, um sufixo vem logo antes de quem o
+        # contem; percorrendo de tras para frente cada um herda a raiz do vizinho.
+        if not self.merge_suffixes:
+            return {}
+        ordem = sorted(self.labels, key=lambda t: t[::-1])
+        raiz = {}
+        for i in range(len(ordem) - 2, -1, -1):
+            texto, seguinte = ordem[i], ordem[i + 1]
+            if seguinte.endswith(texto):
+                raiz[texto] = raiz.get(seguinte, seguinte)
+        return raiz
+
+    def directives(self):
+        # Linhas da secao .data, na ordem dos rotulos
+        raiz = self.hosts()
+        sufixos = {}
+        for texto, host in raiz.items():
+            sufixos.setdefault(host, []).append(texto)
+        linhas = []
+        for texto, label in self.labels.items():
+            if texto in raiz:
+                continue
+            cortes = sorted((len(texto) - len(s), self.labels[s]) for s in sufixos.get(texto, ()))
+            inicio = 0
+            for corte, outro in cortes:
+                linhas.append(f'    {label}: .ascii "{escape(texto[inicio:corte])}"')
+                inicio, label = corte, outro
+            linhas.append(f'    {label}: .asciiz "{escape(texto[inicio:])}"')
+        return linhas
+
+    def emitted(self):
+        # Bytes realmente emitidos no .data
+        raiz = self.hosts()
+        return sum(size(texto) for texto in self.labels if texto not in raiz)
+
+    def report(self):
+        emitidos = self.emitted()
+        return {'literals': self.literals, 'strings': len(self.labels),
+                'merged': len(self.hosts()), 'bytes': emitidos,
+                'saved': self.requested - emitidos}
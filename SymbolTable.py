@@ -1,4 +1,6 @@
-symbolTable = []
+from ScopedTable import ScopedTable
+
+# Se DEBUG = -1, imprime conteudo da tabela de simbolos apos cada mudanca
 DEBUG = 0
 
 # Tipos da linguagem
@@ -23,89 +25,66 @@ SP = 'sp'
 # Conjuntos de tipos
 Number = [INT, FLOAT]
 
-def printTable():
-    global DEBUG
-    if DEBUG == -1:
-        print('Tabela:', symbolTable)
-
-
-def beginScope(nameScope):
-    global symbolTable
-    symbolTable.append({})
-    symbolTable[-1][SCOPE] = nameScope
-    printTable()
-
-
-def endScope():
-    global symbolTable
-    symbolTable = symbolTable[0:-1]
-    printTable()
-
-
-def addVar(name, type, offset=None):
-    global symbolTable
-    symbolTable[-1][name] = {BINDABLE: VARIABLE, TYPE: type, OFFSET: offset}
-    printTable()
-
+class SymbolTable(ScopedTable):
 
-def addConst(name, type, offset=None):
-    global symbolTable
-    symbolTable[-1][name] = {BINDABLE: CONSTANT, TYPE: type, OFFSET: offset}
-    printTable()
+    def __init__(self):
+        super().__init__()
+        self.debug = DEBUG
 
+    def printTable(self):
+        if self.debug == -1:
+            print('Tabela:', self.asDicts())
 
-def addFunction(name, params, returnType):
-    global symbolTable
-    symbolTable[-1][name] = {BINDABLE: FUNCTION, PARAMS: params, TYPE: returnType}
-    printTable()
+    def beginScope(self, nameScope):
+        super().beginScope(nameScope)
+        self.printTable()
 
+    def endScope(self):
+        super().endScope()
+        self.printTable()
 
-def getBindable(bindableName):
-    global symbolTable
-    for i in reversed(range(len(symbolTable))):
-        if bindableName in symbolTable[i].keys():
-            return symbolTable[i][bindableName]
-    return None
+    def addVar(self, name, type, offset=None):
+        self.bind(name, {BINDABLE: VARIABLE, TYPE: type, OFFSET: offset})
+        self.printTable()
 
+    def addConst(self, name, type, offset=None):
+        self.bind(name, {BINDABLE: CONSTANT, TYPE: type, OFFSET: offset})
+        self.printTable()
 
-def getScope(bindableName):
-    global symbolTable
-    for i in reversed(range(len(symbolTable))):
-        if bindableName in symbolTable[i].keys():
-            return symbolTable[i][SCOPE]
-    return None
+    def addFunction(self, name, params, returnType):
+        self.bind(name, {BINDABLE: FUNCTION, PARAMS: params, TYPE: returnType})
+        self.printTable()
 
+    def getBindable(self, bindableName):
+        return self.lookup(bindableName)
 
-def getCurrentScope():
-    global symbolTable
-    if len(symbolTable) > 0:
-        return symbolTable[-1][SCOPE]
-    return None
+    def getScope(self, bindableName):
+        return self.scopeOf(bindableName)
 
 
 def main():
-    global DEBUG
-    DEBUG = -1
+    table = SymbolTable()
+    table.debug = -1
     print('\n# Criando escopo global')
-    beginScope('global')
+    table.beginScope('global')
     print('\n# Adicionando funcao add')
-    addFunction('add', ['a', INT, 'b', INT], INT)
+    table.addFunction('add', ['a', INT, 'b', INT], INT)
     print('\n# Criando escopo add')
-    beginScope('add')
+    table.beginScope('add')
     print('\n# Adicionando var a do tipo int')
-    addVar('a', INT)
+    table.addVar('a', INT)
     print('\n# Pegar escopo de var a')
-    print(getScope('a'))
+    print(table.getScope('a'))
     print('\n# Adicionando var b do tipo int')
-    addVar('b', INT)
+    table.addVar('b', INT)
     print('\n# Adicionando const c do tipo int')
-    addConst('c', INT)
+    table.addConst('c', INT)
     print('\n# Consultando bindable inexistente')
-    print(str(getBindable('naoexiste')))
+    print(str(table.getBindable('naoexiste')))
     print('\n# Consultando bindable add')
-    print(str(getBindable('add')))
+    print(str(table.getBindable('add')))
     print('\n# Removendo escopo add')
-    endScope()
+    table.endScope()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,203 @@
+import mmap
+import re
+from array import array
+
+import ExpressionLanguageLex as lx
+import ExpressionLanguageScanner as sc
+
+# Tokens compactos sobre o fonte mapeado em memoria: cada token e uma linha
+# (tipo, inicio, fim, linha) em arrays paralelos. O texto so e decodificado
+# quando alguem pede o valor (identificadores e literais usados pelo parser).
+
+TYPE_NAMES = list(lx.tokens)
+TYPE_IDS = {nome: i for i, nome in enumerate(TYPE_NAMES)}
+
+# Codigos negativos: grupos que nao viram token
+IGNORAR, NEWLINE, COMMENT_BLOCK, ERRO = -1, -2, -3, -4
+
+
+def _montar_scanner():
+    # Mesma ordem de ExpressionLanguageScanner, mas um grupo por palavra
+    # reservada e por operador: o indice do grupo ja e o tipo, sem fatiar texto
+    grupos = [
+        (r'[ \t]+', IGNORAR),
+        (r'\n+', NEWLINE),
+        (r'/\*[\s\S]*?\*/', COMMENT_BLOCK),
+        (r'//.*', IGNORAR),
+        (r'@"(?:[^"\\]|\\.)+"', TYPE_IDS['IDENTIFIER_ESCAPED']),
+        (r'c"(?:[^"\\]|\\.)*"', TYPE_IDS['C_STRING']),
+        (r'"(?:[^"\\]|\\.)*"', TYPE_IDS['STRING']),
+        (r"'(?:[^'\\]|\\.)'", TYPE_IDS['CHARACTER']),
+        (r'0[xX][0-9A-Fa-f_]+|0[bB][01_]+|0[oO][0-7_]+|[0-9][0-9_]*(?:\.[0-9][0-9_]*)?(?:[eE][+-]?[0-9][0-9_]*)?',
+         TYPE_IDS['NUMBER']),
+    ]
+    for palavra, tipo in lx.reserved.items():
+        grupos.append((re.escape(palavra) + r'(?![a-zA-Z_0-9])', TYPE_IDS[tipo]))
+    grupos.append((r'[a-zA-Z_][a-zA-Z_0-9]*', TYPE_IDS['IDENTIFIER']))
+    vistos = set()
+    for tipo, regex in sc.regras_operadores():
+        texto = re.sub(r'\\(.)', r'\1', regex)
+        if texto not in vistos:
+            vistos.add(texto)
+            grupos.append((regex, TYPE_IDS[sc.OPERADORES[texto]]))
+    # Um caractere UTF-8 completo, para a mensagem de erro
+    grupos.append((r'[\x00-\x7f]|[\xc0-\xff][\x80-\xbf]*', ERRO))
+
+    padrao = re.compile('|'.join(f'({regex})' for regex, _ in grupos).encode('latin-1'))
+    return padrao, array('b' if len(TYPE_NAMES) < 128 else 'h', [0] + [codigo for _, codigo in grupos])
+
+
+SCANNER, TIPO_DO_GRUPO = _montar_scanner()
+
+
+class TokenBuffer:
+    # Struct-of-arrays: tipos[i], inicios[i], fins[i], linhas[i] descrevem o token i
+
+    def __init__(self, data, arquivo=None, mapa=None):
+        self.data = data
+        self.arquivo = arquivo
+        self.mapa = mapa
+        self.tipos = array('B')
+        self.inicios = array('I')
+        self.fins = array('I')
+        self.linhas = array('I')
+        self._scan()
+
+    @classmethod
+    def from_file(cls, path):
+        arquivo = open(path, 'rb')
+        try:
+            mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Arquivo vazio nao pode ser mapeado
+            return cls(b'', arquivo)
+        return cls(mapa, arquivo, mapa)
+
+    @classmethod
+    def from_string(cls, code):
+        return cls(code.encode('utf-8'))
+
+    def _scan(self):
+        data = self.data
+        tipo_do_grupo = TIPO_DO_GRUPO
+        tipos_append = self.tipos.append
+        inicios_append = self.inicios.append
+        fins_append = self.fins.append
+        linhas_append = self.linhas.append
+        linha = 1
+        for m in SCANNER.finditer(data):
+            tipo = tipo_do_grupo[m.lastindex]
+            if tipo >= 0:
+                inicio, fim = m.span()
+                tipos_append(tipo)
+                inicios_append(inicio)
+                fins_append(fim)
+                linhas_append(linha)
+            elif tipo == NEWLINE:
+                inicio, fim = m.span()
+                linha += fim - inicio
+            elif tipo == COMMENT_BLOCK:
+                linha += m.group().count(b'\n')
+            elif tipo == ERRO:
+                print(f"Caractere ilegal '{m.group().decode('utf-8', 'replace')}' na linha {linha}")
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def type(self, i):
+        return TYPE_NAMES[self.tipos[i]]
+
+    def text(self, i):
+        return self.data[self.inicios[i]:self.fins[i]].decode('utf-8')
+
+    def value(self, i):
+        # Materializa o valor do token i com as mesmas conversoes do PLY
+        tipo = TYPE_NAMES[self.tipos[i]]
+        texto = self.text(i)
+        if tipo == 'NUMBER':
+            return lx.converter_numero(texto)
+        if tipo == 'STRING':
+            return lx.decodificar_string(texto[1:-1])
+        if tipo == 'CHARACTER':
+            return lx.converter_caractere(texto[1:-1])
+        if tipo in ('C_STRING', 'IDENTIFIER_ESCAPED'):
+            return texto[2:-1]
+        return texto
+
+    def tokens(self):
+        # (tipo, valor, linha), para comparar com os outros backends
+        return [(self.type(i), self.value(i), self.linhas[i]) for i in range(len(self))]
+
+    def close(self):
+        if self.mapa is not None:
+            self.mapa.close()
+            self.mapa = None
+        if self.arquivo is not None:
+            self.arquivo.close()
+            self.arquivo = None
+        self.data = b''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TokenRef:
+    # Token do PLY que aponta para uma linha do TokenBuffer; value e preguicoso
+    __slots__ = ('buffer', 'index', 'lexer')
+
+    def __init__(self, buffer, index):
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def type(self):
+        return TYPE_NAMES[self.buffer.tipos[self.index]]
+
+    @property
+    def value(self):
+        return self.buffer.value(self.index)
+
+    @property
+    def lineno(self):
+        return self.buffer.linhas[self.index]
+
+    @property
+    def lexpos(self):
+        # Deslocamento em bytes no arquivo
+        return self.buffer.inicios[self.index]
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+class BufferLexer:
+    # Interface do lexer do PLY (input/token) sobre um TokenBuffer
+
+    def __init__(self, buffer=None):
+        self.buffer = buffer
+        self.lineno = 1
+        self._proximo = 0
+
+    def input(self, data):
+        self.buffer = TokenBuffer.from_string(data)
+        self._proximo = 0
+
+    def token(self):
+        i = self._proximo
+        if self.buffer is None or i >= len(self.buffer.tipos):
+            return None
+        self._proximo = i + 1
+        self.lineno = self.buffer.linhas[i]
+        return TokenRef(self.buffer, i)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        tok = self.token()
+        if tok is None:
+            raise StopIteration
+        return tok
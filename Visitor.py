@@ -1,16 +1,12 @@
 from AbstractVisitor import AbstractVisitor
-from ExpressionLanguageParser import parse
 
-tab = 0
-
-def blank():
-    p = ''
-    for x in range(tab):
-        p = p + ' '
-    return p
+class Visitor(AbstractVisitor):
 
+    def __init__(self):
+        self.tab = 0
 
-class Visitor(AbstractVisitor):
+    def blank(self):
+        return ' ' * self.tab
 
     def visitProgram(self, program):
         for item in program.items:
@@ -19,37 +15,35 @@ class Visitor(AbstractVisitor):
 
     def visitConstDecl(self, constDecl):
         type_part = f": {constDecl.type_spec}" if constDecl.type_spec else ""
-        print(f"{blank()}const {constDecl.name}{type_part} = ", end="")
+        print(f"{self.blank()}const {constDecl.name}{type_part} = ", end="")
         constDecl.value.accept(self)
         print(";")
 
     def visitVarDecl(self, varDecl):
         type_part = f": {varDecl.type_spec}" if varDecl.type_spec else ""
-        print(f"{blank()}var {varDecl.name}{type_part} = ", end="")
+        print(f"{self.blank()}var {varDecl.name}{type_part} = ", end="")
         varDecl.value.accept(self)
         print(";")
 
     def visitFunction(self, function):
-        global tab
         vis = "pub " if function.visibility else ""
         params_txt = ", ".join([p.format() for p in function.params])
         ret = f" {function.return_type}" if function.return_type else ""
-        print(f"{blank()}{vis}fn {function.name}({params_txt}){ret} ", end="")
+        print(f"{self.blank()}{vis}fn {function.name}({params_txt}){ret} ", end="")
         function.body.accept(self)
 
     def visitParam(self, param):
         print(f"{param.name}: {param.type_spec}", end="")
 
     def visitBlock(self, block):
-        global tab
         print("{")
-        tab += 4
+        self.tab += 4
         for stmt in block.statements:
-            print(blank(), end="")
+            print(self.blank(), end="")
             stmt.accept(self)
             print()
-        tab -= 4
-        print(f"{blank()}}}", end="")
+        self.tab -= 4
+        print(f"{self.blank()}}}", end="")
 
     def visitExprStmt(self, exprStmt):
         exprStmt.expr.accept(self)
@@ -69,7 +63,6 @@ class Visitor(AbstractVisitor):
             print(";", end="")
 
     def visitIfStmt(self, ifStmt):
-        global tab
         print("if (", end="")
         ifStmt.condition.accept(self)
         print(") ", end="")
@@ -114,8 +107,9 @@ class Visitor(AbstractVisitor):
 
 
 def main():
-    f = open("input1.zig", "r")
-    result = parse(f.read())
+    from ExpressionLanguageParser import parse, INPUT_PADRAO
+    with open(INPUT_PADRAO, "r") as f:
+        result = parse(f.read())
     if result is None:
         print("Erro: programa nao foi reconhecido pelo parser.")
         return